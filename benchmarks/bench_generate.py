@@ -0,0 +1,214 @@
+"""Generation benchmarks with a tracked baseline.
+
+Usage:
+    python benchmarks/bench_generate.py              # run and print timings
+    python benchmarks/bench_generate.py --save       # record benchmarks/baseline.json
+    python benchmarks/bench_generate.py --compare    # exit 1 on regressions
+
+Each benchmark reports the median of several runs in seconds. ``--compare``
+flags benchmarks that are slower than the baseline by more than
+``--threshold`` (default: 25%). Timings are machine-specific: record the
+baseline on the machine that runs the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+
+from argparse_ps1 import clear_project_cache, generate_ps1_wrapper
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+BASELINE_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.25
+
+# Timings below this are dominated by noise and never flagged
+_MIN_SECONDS = 0.002
+
+PYPROJECT = """\
+[project]
+name = "bench"
+version = "0.0.0"
+
+[project.scripts]
+bench = "bench:main"
+"""
+
+
+def make_parser(size: int) -> argparse.ArgumentParser:
+    """Return a parser with ``size`` actions of mixed kinds."""
+    parser = argparse.ArgumentParser(prog="bench", description="Benchmark parser")
+    for i in range(size):
+        kind = i % 5
+        if kind == 0:
+            parser.add_argument(f"--count-{i}", type=int, default=i, help="A count")
+        elif kind == 1:
+            parser.add_argument(f"--flag-{i}", action="store_true", help="A flag")
+        elif kind == 2:
+            parser.add_argument(f"--path-{i}", type=Path, help="A path")
+        elif kind == 3:
+            parser.add_argument(f"--mode-{i}", choices=["fast", "safe"], default="fast")
+        else:
+            parser.add_argument(f"--name-{i}", help="A name (default: %(default)s)")
+    return parser
+
+
+def make_choices_parser(arguments: int, choices: int) -> argparse.ArgumentParser:
+    """Return a parser whose arguments each have ``choices`` values."""
+    parser = argparse.ArgumentParser(prog="bench")
+    values = [f"value-{i}" for i in range(choices)]
+    for i in range(arguments):
+        parser.add_argument(f"--choice-{i}", choices=values)
+    return parser
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of ``repeat`` calls after one warm-up call."""
+    function()
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = 5, only: str | None = None
+) -> dict[str, float]:
+    """Run every benchmark whose name contains ``only`` and return its timing."""
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+        script_path = root / "bench.py"
+        output_path = root / "Bench.ps1"
+
+        def generate(
+            parser: argparse.ArgumentParser, **options: object
+        ) -> Callable[[], object]:
+            return lambda: generate_ps1_wrapper(
+                parser, script_path=script_path, output_path=output_path, **options
+            )
+
+        benchmarks: list[tuple[str, Callable[[], object]]] = []
+        for size in sizes:
+            parser = make_parser(size)
+            benchmarks += [
+                (f"generate[script,{size}]", generate(parser)),
+                (f"generate[project,{size}]", generate(parser, command_name="bench")),
+            ]
+        benchmarks += [
+            ("generate[choices,1x10000]", generate(make_choices_parser(1, 10000))),
+            ("generate[choices,100x100]", generate(make_choices_parser(100, 100))),
+        ]
+
+        for name, function in benchmarks:
+            if only is None or only in name:
+                results[name] = measure(function, repeat)
+        clear_project_cache()
+
+    if only is None or only in "import":
+        results["import"] = measure_import(repeat)
+    return results
+
+
+def measure_import(repeat: int) -> float:
+    """Return the median time ``import argparse_ps1`` adds to a fresh interpreter."""
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+        return time.perf_counter() - start
+
+    timings = [run("import argparse_ps1") - run("pass") for _ in range(repeat)]
+    return max(statistics.median(timings), 0.0)
+
+
+def compare(
+    baseline: dict[str, float], results: dict[str, float], threshold: float
+) -> list[str]:
+    """Return a message for every benchmark slower than baseline by ``threshold``."""
+    regressions: list[str] = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference is None or max(seconds, reference) < _MIN_SECONDS:
+            continue
+        if seconds > reference * (1 + threshold):
+            regressions.append(
+                f"{name}: {seconds * 1000:.1f}ms vs baseline {reference * 1000:.1f}ms "
+                f"(+{(seconds / reference - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Error: unsupported baseline version in {path}")
+    return {name: float(seconds) for name, seconds in data["results"].items()}
+
+
+def save_baseline(path: Path, results: dict[str, float]) -> None:
+    data = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {name: round(seconds, 6) for name, seconds in results.items()},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the generation benchmarks")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--save", action="store_true", help="Write the baseline")
+    action.add_argument(
+        "--compare", action="store_true", help="Exit 1 if slower than the baseline"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (default: 0.25)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Parser sizes to benchmark (default: 10 100 1000 10000)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    parser.add_argument("--only", default=None, help="Only run matching benchmarks")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.only)
+    for name, seconds in results.items():
+        print(f"{name:32} {seconds * 1000:10.2f} ms")
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline: {args.baseline}")
+    elif args.compare:
+        regressions = compare(load_baseline(args.baseline), results, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,9 +9,8 @@ This example demonstrates:
 
 import argparse
 import sys
-from pathlib import Path
 
-from argparse_ps1 import generate_ps1_wrapper
+from argparse_ps1 import install
 
 
 def main() -> int:
@@ -30,24 +29,11 @@ def main() -> int:
         help="Say goodbye",
     )
 
-    parser.add_argument(
-        "--make-ps1",
-        action="store_true",
-        help="Generate PowerShell wrapper script",
-    )
+    # --make-ps1 generates the wrapper; the generator is imported only then
+    install(parser)
 
     args = parser.parse_args()
 
-    if args.make_ps1:
-        # Generate PowerShell wrapper script
-        output = generate_ps1_wrapper(
-            parser,
-            script_path=Path(__file__).resolve(),
-            skip_dests={"make_ps1"},  # Skip the --make-ps1 argument itself
-        )
-        print(f"Generated PowerShell wrapper: {output}")
-        return 0
-
     # Handle greetings
     if args.hello:
         print("Hello World")
@@ -8,9 +8,13 @@ This example demonstrates:
 
 import argparse
 import sys
-from pathlib import Path
 
-from argparse_ps1 import generate_ps1_wrapper
+from argparse_ps1 import install
+
+# Python the wrapper runs the script with. Other runner options:
+#   "python"                   System Python
+#   "C:/Python312/python.exe"  Custom absolute path (example)
+RUNNER = ".venv/Scripts/python.exe"  # Relative path to venv
 
 
 def main() -> int:
@@ -24,46 +28,17 @@ def main() -> int:
         help="String option argument",
     )
 
-    parser.add_argument(
-        "--runner-type",
-        choices=["venv", "system", "custom"],
-        default="venv",
-        help="Python runner type to demonstrate",
-    )
-
-    parser.add_argument(
-        "--make-ps1",
-        action="store_true",
-        help="Generate PowerShell wrapper script",
-    )
+    # Generate PowerShell wrapper script using RUNNER on --make-ps1
+    install(parser, runner=RUNNER)
 
     args = parser.parse_args()
 
-    if args.make_ps1:
-        # Generate PowerShell wrapper script with different runner options
-        runner_configs = {
-            "venv": ".venv/Scripts/python.exe",  # Relative path to venv
-            "system": "python",  # System Python
-            "custom": "C:/Python312/python.exe",  # Custom absolute path (example)
-        }
-
-        runner = runner_configs[args.runner_type]
-
-        output = generate_ps1_wrapper(
-            parser,
-            script_path=Path(__file__).resolve(),
-            skip_dests={"make_ps1"},
-            runner=runner,
-        )
-        print(f"Generated PowerShell wrapper with runner '{runner}': {output}")
-        return 0
-
     # Handle the option
     if args.option:
-        print(f"Custom runner ({args.runner_type}) - Option value: {args.option}")
+        print(f"Custom runner ({RUNNER}) - Option value: {args.option}")
     else:
         print(
-            f"Custom runner ({args.runner_type}) - No option provided. Use --option <value> to set a value."
+            f"Custom runner ({RUNNER}) - No option provided. Use --option <value> to set a value."
         )
 
     return 0
@@ -8,9 +8,8 @@ This example demonstrates:
 
 import argparse
 import sys
-from pathlib import Path
 
-from argparse_ps1 import generate_ps1_wrapper
+from argparse_ps1 import install
 
 
 def main() -> int:
@@ -34,26 +33,12 @@ def main() -> int:
         help="String option argument",
     )
 
-    parser.add_argument(
-        "--make-ps1",
-        action="store_true",
-        help="Generate PowerShell wrapper script",
-    )
+    # Generate PowerShell wrapper script using uv run --project on --make-ps1
+    # This requires a pyproject.toml with [project.scripts] entry
+    install(parser, command_name="example-uv-project")  # Matches [project.scripts]
 
     args = parser.parse_args()
 
-    if args.make_ps1:
-        # Generate PowerShell wrapper script using uv run --project
-        # This requires a pyproject.toml with [project.scripts] entry
-        output = generate_ps1_wrapper(
-            parser,
-            script_path=Path(__file__).resolve(),
-            skip_dests={"make_ps1"},
-            command_name="example-uv-project",  # Matches [project.scripts]
-        )
-        print(f"Generated PowerShell wrapper: {output}")
-        return 0
-
     # Handle the option
     if args.option:
         print(f"Project mode - Option value: {args.option}")
@@ -9,7 +9,71 @@ invoking the Python script with uv (or direct Python execution).
 
 from __future__ import annotations
 
-from .argparse_ps1 import generate_ps1_wrapper
+from .hook import install
 
-__all__ = ["generate_ps1_wrapper"]
-__version__ = "0.1.5"
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .argparse_ps1 import (
+        clear_project_cache,
+        generate_ps1_wrapper,
+        render_ps1_wrapper,
+    )
+    from .batch import WrapperJob, WrapperResult, generate_ps1_wrappers
+    from .module import generate_ps1_module
+    from .output import emit
+    from .pipeline import pipeline_items
+    from .spec import WrapperSpec, dump_spec, extract_spec, load_spec
+    from .trace import trace_timing
+
+# The generator pulls in tomllib, gzip, concurrent.futures, ...; import it on
+# first use so scripts calling install() pay nothing for it on a normal run.
+_LAZY_ATTRIBUTES = {
+    "WrapperJob": "batch",
+    "WrapperResult": "batch",
+    "WrapperSpec": "spec",
+    "clear_project_cache": "argparse_ps1",
+    "dump_spec": "spec",
+    "emit": "output",
+    "extract_spec": "spec",
+    "generate_ps1_module": "module",
+    "generate_ps1_wrapper": "argparse_ps1",
+    "generate_ps1_wrappers": "batch",
+    "load_spec": "spec",
+    "pipeline_items": "pipeline",
+    "render_ps1_wrapper": "argparse_ps1",
+    "trace_timing": "trace",
+}
+
+__all__ = [
+    "WrapperJob",
+    "WrapperResult",
+    "WrapperSpec",
+    "clear_project_cache",
+    "dump_spec",
+    "emit",
+    "extract_spec",
+    "generate_ps1_module",
+    "generate_ps1_wrapper",
+    "generate_ps1_wrappers",
+    "install",
+    "load_spec",
+    "pipeline_items",
+    "render_ps1_wrapper",
+    "trace_timing",
+]
+__version__ = "0.1.7"
+
+
+def __getattr__(name: str) -> object:
+    submodule = _LAZY_ATTRIBUTES.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module  # noqa: PLC0415 - deferred
+
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,53 @@
+"""Subprocess entry point used by :mod:`argparse_ps1.scan`.
+
+Usage: python -m argparse_ps1._scan_worker [--spec] ENTRY_POINT COMMAND
+       OUTPUT_PATH PROJECT_ROOT [SKIP_DEST ...]
+
+With ``--spec`` the captured parser is saved as a JSON wrapper spec (see
+:mod:`argparse_ps1.hatch`) to OUTPUT_PATH instead of being rendered.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from .argparse_ps1 import generate_ps1_wrapper
+from .capture import capture_parser, load_entry_point
+from .spec import dump_spec, extract_spec
+
+
+def main(argv: list[str]) -> int:
+    spec_only = argv[:1] == ["--spec"]
+    if spec_only:
+        argv = argv[1:]
+    entry_point, command_name, output_path, project_root, *skip_dests = argv
+    root = Path(project_root)
+
+    func = load_entry_point(entry_point)
+    parser = capture_parser(func, prog=command_name)
+    if spec_only:
+        dump_spec(extract_spec(parser), Path(output_path))
+        return 0
+
+    # Project mode only consults the script's parent directory to locate
+    # pyproject.toml; fall back to the project root when the entry point
+    # module lives outside the project (e.g. a non-editable install).
+    module = sys.modules.get(getattr(func, "__module__", ""))
+    module_file = getattr(module, "__file__", None)
+    script_path = Path(module_file).resolve() if module_file else None
+    if script_path is None or not script_path.is_relative_to(root):
+        script_path = root / "pyproject.toml"
+
+    generate_ps1_wrapper(
+        parser,
+        script_path=script_path,
+        output_path=Path(output_path),
+        skip_dests=skip_dests,
+        command_name=command_name,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
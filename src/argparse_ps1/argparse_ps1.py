@@ -1,10 +1,31 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import contextlib
+import gzip
 import os
+import re
+import sys
+import threading
 import tomllib
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Any
+
+from .output import OUTPUT_ENV, RECORD_MARKER
+from .pipeline import PIPELINE_ENV
+from .spec import ArgumentSpec, WrapperSpec, callable_reference, extract_spec
+from .trace import TRACE_ENV
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# Completion values for an argument, or a function returning them for a prefix
+CompletionHint = Iterable[str] | Callable[[str], Iterable[Any]]
 
 
 def _ps_single_quoted_string(value: str) -> str:
@@ -13,7 +34,7 @@ def _ps_single_quoted_string(value: str) -> str:
 
 
 def generate_ps1_wrapper(
-    parser: argparse.ArgumentParser,
+    parser: argparse.ArgumentParser | WrapperSpec,
     *,
     script_path: Path,
     output_path: Path | None = None,
@@ -21,11 +42,26 @@ def generate_ps1_wrapper(
     skip_dests: Iterable[str] | None = None,
     runner: str = "uv",
     command_name: str | None = None,
+    cache_interpreter: bool = False,
+    embed_help: bool = False,
+    compress_help: bool = False,
+    validate_arguments: bool = False,
+    worker: bool = False,
+    completion_hints: Mapping[str, CompletionHint] | None = None,
+    completion_ttl: float = 300.0,
+    completion_cache_size: int = 256,
+    console_script: bool = False,
+    pipeline_input: str | None = None,
+    parallel_input: str | None = None,
+    as_object: bool = False,
+    trace_timing: bool = False,
+    lock_file: bool = False,
 ) -> Path:
     """Generate a PowerShell wrapper script for the provided :mod:`argparse` parser.
 
     Args:
-        parser: ArgumentParser instance to generate wrapper for
+        parser: ArgumentParser instance to generate wrapper for, or a
+                :class:`~argparse_ps1.spec.WrapperSpec` extracted from one
         script_path: Path to the Python script (absolute)
         output_path: Output path for the .ps1 file (optional)
         output_dir: Directory where .ps1 will be placed (default: script's directory)
@@ -33,31 +69,354 @@ def generate_ps1_wrapper(
         runner: Command to run Python (default: "uv")
         command_name: Command name registered in [project.scripts]. If specified,
                      automatically searches for pyproject.toml and uses --project mode.
+        cache_interpreter: Project mode only. The wrapper resolves the project's
+                           interpreter through uv once, caches it next to the
+                           wrapper with a hash of uv.lock, and then runs Python
+                           directly until uv.lock changes.
+        embed_help: Embed ``parser.format_help()`` and comment-based help
+                    (``.SYNOPSIS``/``.PARAMETER``) so ``-Help`` and ``Get-Help``
+                    never start Python
+        compress_help: Store the embedded help gzip-compressed and base64-encoded
+        validate_arguments: Mirror argparse checks in PowerShell parameter
+                            metadata (Mandatory, parameter sets for mutually
+                            exclusive groups, ValidateRange/ValidateScript) so
+                            bad invocations fail before Python starts
+        worker: Send the arguments to a persistent ``argparse_ps1.worker``
+                process when one is listening (state file
+                ``.<wrapper name>.worker.json`` next to the wrapper), and start
+                Python as usual otherwise
+        completion_hints: Tab-completion values per argument dest, compiled
+                          into the wrapper so completion never starts Python.
+                          For ``Path``/``FileType`` arguments the values are
+                          file globs (e.g. ``["*.csv"]``). A callable (or an
+                          argument's ``completer`` attribute) is instead
+                          imported from its module and called through Python
+                          at completion time, so it cannot be defined in the
+                          wrapped script itself; see :mod:`argparse_ps1.complete`.
+        completion_ttl: Seconds a completion callable's results are served from
+                        the on-disk cache
+        completion_cache_size: Number of cached completion results kept; the
+                               oldest are evicted first
+        console_script: Run the console script ``command_name`` installed
+                        in the wrapper's own directory (as pip/uv install
+                        ``[project.scripts]`` into Scripts/bin) instead of
+                        the Python script; for wrappers shipped in a wheel
+                        (see :mod:`argparse_ps1.hatch`). pyproject.toml is
+                        not consulted.
+        pipeline_input: Dest of a list argument (``nargs="*"``, or an
+                        optional ``nargs``/``append``/``extend`` argument)
+                        that accepts pipeline input. ``Get-ChildItem *.csv |
+                        My-Tool`` then starts Python once and streams the
+                        items to its stdin, one per line, as they arrive;
+                        the script reads them with
+                        :func:`argparse_ps1.pipeline_items`.
+        parallel_input: Dest of a positional argument that takes one value.
+                        The wrapper accepts a list for it and, given more
+                        than one value, runs one Python process per value,
+                        at most ``-ThrottleLimit`` (default: the number of
+                        processors) at a time. Each run's output is emitted
+                        in the order of the values, and the wrapper exits
+                        with the first non-zero exit code.
+        as_object: Add an ``-AsObject`` switch that converts each line the
+                   script writes with :func:`argparse_ps1.emit` into a
+                   ``PSCustomObject`` as it arrives
+        trace_timing: Add a ``-TraceTiming`` switch that prints the time
+                      spent in each phase of the invocation to stderr:
+                      PowerShell startup, argument conversion, the launch
+                      until the parser is built and ``parse_args`` (reported
+                      by :func:`argparse_ps1.trace_timing`), and the script
+        lock_file: Hold an exclusive lock on ``<output>.lock`` while comparing
+                   and replacing the wrapper, so concurrent generators of the
+                   same file take turns instead of racing. The lock file is
+                   left in place.
+
+    The file is written to a temporary file next to it and renamed over the
+    old one, so readers and concurrent generators never see a partial wrapper.
+    Use :func:`render_ps1_wrapper` to get the text without touching the disk.
     """
 
-    skip = {"help"}
-    if skip_dests:
-        skip.update(skip_dests)
+    output_path = _resolve_output_path(script_path, output_path, output_dir)
+    content = render_ps1_wrapper(
+        parser,
+        script_path=script_path,
+        output_path=output_path,
+        skip_dests=skip_dests,
+        runner=runner,
+        command_name=command_name,
+        cache_interpreter=cache_interpreter,
+        embed_help=embed_help,
+        compress_help=compress_help,
+        validate_arguments=validate_arguments,
+        worker=worker,
+        completion_hints=completion_hints,
+        completion_ttl=completion_ttl,
+        completion_cache_size=completion_cache_size,
+        console_script=console_script,
+        pipeline_input=pipeline_input,
+        parallel_input=parallel_input,
+        as_object=as_object,
+        trace_timing=trace_timing,
+    )
+    _write_wrapper(output_path, content, lock_file=lock_file)
+    return output_path
 
-    regular_actions: list[argparse.Action] = []
 
-    for action in parser._actions:
-        if action.dest in skip:
-            continue
-        regular_actions.append(action)
-
-    # Generate PowerShell-style filename: Kebab-Case.ps1
-    if output_path is None:
-        ps1_name = _to_powershell_filename(script_path.stem)
-        if output_dir is None:
-            # Default output directory is current working directory
-            output_path = Path.cwd() / f"{ps1_name}.ps1"
+def render_ps1_wrapper(
+    parser: argparse.ArgumentParser | WrapperSpec,
+    *,
+    script_path: Path,
+    output_path: Path | None = None,
+    output_dir: Path | None = None,
+    skip_dests: Iterable[str] | None = None,
+    runner: str = "uv",
+    command_name: str | None = None,
+    cache_interpreter: bool = False,
+    embed_help: bool = False,
+    compress_help: bool = False,
+    validate_arguments: bool = False,
+    worker: bool = False,
+    completion_hints: Mapping[str, CompletionHint] | None = None,
+    completion_ttl: float = 300.0,
+    completion_cache_size: int = 256,
+    console_script: bool = False,
+    pipeline_input: str | None = None,
+    parallel_input: str | None = None,
+    as_object: bool = False,
+    trace_timing: bool = False,
+) -> str:
+    """Return the wrapper :func:`generate_ps1_wrapper` would write, without writing it.
+
+    Takes the same arguments as :func:`generate_ps1_wrapper` (except
+    ``lock_file``). The output location is still needed because the wrapper
+    finds the script relative to itself; nothing is written there.
+
+    Returns:
+        The wrapper text with ``\\n`` line endings. Write it with
+        ``encoding="utf-8-sig"`` so Windows PowerShell 5.1 reads it as UTF-8.
+    """
+
+    output_path = _resolve_output_path(script_path, output_path, output_dir)
+    project_root = (
+        None
+        if console_script
+        else _resolve_project_root(
+            script_path, runner=runner, command_name=command_name
+        )
+    )
+    return _render_wrapper(
+        parser,
+        script_path=script_path,
+        output_path=output_path,
+        skip_dests=skip_dests,
+        runner=runner,
+        command_name=command_name,
+        project_root=project_root,
+        cache_interpreter=cache_interpreter,
+        embed_help=embed_help,
+        compress_help=compress_help,
+        validate_arguments=validate_arguments,
+        worker=worker,
+        completion_hints=completion_hints,
+        completion_ttl=completion_ttl,
+        completion_cache_size=completion_cache_size,
+        console_script=console_script,
+        pipeline_input=pipeline_input,
+        parallel_input=parallel_input,
+        as_object=as_object,
+        trace_timing=trace_timing,
+    )
+
+
+def _write_wrapper(output_path: Path, content: str, *, lock_file: bool = False) -> bool:
+    """Write ``content`` as UTF-8 with BOM unless the file already holds it.
+
+    Leaving identical files untouched keeps their mtimes stable for build
+    caches and file syncs. New content goes to a temporary file in the same
+    directory that is then renamed over ``output_path``, so the wrapper is
+    replaced atomically. With ``lock_file`` the comparison and the rename
+    happen under an exclusive lock on ``<output_path>.lock``.
+
+    Returns:
+        ``True`` if the file was written, ``False`` if it was already current.
+    """
+    data = content.replace("\n", os.linesep).encode("utf-8-sig")
+    lock = (
+        _exclusive_lock(output_path.with_name(f"{output_path.name}.lock"))
+        if lock_file
+        else contextlib.nullcontext()
+    )
+    with lock:
+        try:
+            if (
+                output_path.stat().st_size == len(data)
+                and output_path.read_bytes() == data
+            ):
+                return False
+        except FileNotFoundError:
+            pass
+        # Unique per process and thread, so concurrent writers never share one
+        temp_path = output_path.with_name(
+            f"{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            temp_path.write_bytes(data)
+            temp_path.replace(output_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    return True
+
+
+@contextlib.contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive OS lock on ``lock_path`` (created if missing)."""
+    with lock_path.open("a+b") as f:
+        if sys.platform == "win32":
+            # LK_LOCK retries for about 10 seconds before raising OSError
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
         else:
-            output_path = output_dir / f"{ps1_name}.ps1"
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Keyword options that only affect rendering, with their defaults. Batch
+# generation and the regeneration manifest forward/fingerprint these as-is.
+_RENDER_OPTION_DEFAULTS: dict[str, Any] = {
+    "cache_interpreter": False,
+    "embed_help": False,
+    "compress_help": False,
+    "validate_arguments": False,
+    "worker": False,
+    "completion_hints": None,
+    "completion_ttl": 300.0,
+    "completion_cache_size": 256,
+    "console_script": False,
+    "pipeline_input": None,
+    "parallel_input": None,
+    "as_object": False,
+    "trace_timing": False,
+}
+
+
+def _resolve_output_path(
+    script_path: Path, output_path: Path | None, output_dir: Path | None
+) -> Path:
+    """Return the .ps1 path, deriving a Kebab-Case.ps1 name when not given."""
+    if output_path is not None:
+        return output_path
+
+    ps1_name = _to_powershell_filename(script_path.stem)
+    if output_dir is None:
+        # Default output directory is current working directory
+        return Path.cwd() / f"{ps1_name}.ps1"
+    return output_dir / f"{ps1_name}.ps1"
+
+
+# Process-wide cache of project discovery results. Roots are keyed by the
+# directory the search started from; ``[project.scripts]`` tables are keyed by
+# pyproject.toml path and validated against its mtime and size on every hit.
+_project_cache_lock = threading.Lock()
+_project_roots: dict[Path, Path] = {}
+_project_scripts: dict[Path, tuple[int, int, dict[str, str]]] = {}
+
+
+def clear_project_cache(path: Path | None = None) -> None:
+    """Invalidate cached pyproject.toml discovery and ``[project.scripts]`` tables.
+
+    Cached entries are revalidated against pyproject.toml's mtime and size
+    automatically; call this after creating, moving or deleting a
+    pyproject.toml so the directory walk is redone.
+
+    Args:
+        path: Project root or pyproject.toml to forget (default: everything)
+    """
+    with _project_cache_lock:
+        if path is None:
+            _project_roots.clear()
+            _project_scripts.clear()
+            return
+
+        root = path.parent if path.name == "pyproject.toml" else path
+        _project_scripts.pop(root / "pyproject.toml", None)
+        for start in [
+            start for start, cached in _project_roots.items() if cached == root
+        ]:
+            del _project_roots[start]
+
+
+def _find_project_root(start: Path) -> Path | None:
+    """Walk up from ``start`` to the nearest directory containing pyproject.toml."""
+    with _project_cache_lock:
+        cached = _project_roots.get(start)
+    if cached is not None:
+        if (cached / "pyproject.toml").is_file():
+            return cached
+        clear_project_cache(cached)
+
+    visited: list[Path] = []
+    current = start
+    root: Path | None = None
+    while current != current.parent:
+        with _project_cache_lock:
+            cached = _project_roots.get(current)
+        if cached is not None:
+            root = cached
+            break
+        visited.append(current)
+        if (current / "pyproject.toml").exists():
+            root = current
+            break
+        current = current.parent
+
+    # Only successful searches are cached, so a pyproject.toml created later
+    # is still found without explicit invalidation.
+    if root is not None:
+        with _project_cache_lock:
+            for directory in visited:
+                _project_roots[directory] = root
+    return root
+
+
+def _read_project_scripts(pyproject_path: Path) -> dict[str, str]:
+    """Return ``[project.scripts]``, parsing pyproject.toml only when it changed."""
+    try:
+        stat = pyproject_path.stat()
+    except OSError:
+        # Let _load_project_scripts produce the detailed error message
+        return _load_project_scripts(pyproject_path)
+
+    with _project_cache_lock:
+        cached = _project_scripts.get(pyproject_path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return dict(cached[2])
+
+    scripts = _load_project_scripts(pyproject_path)
+    with _project_cache_lock:
+        _project_scripts[pyproject_path] = (stat.st_mtime_ns, stat.st_size, scripts)
+    return dict(scripts)
+
+
+def _resolve_project_root(
+    script_path: Path,
+    *,
+    runner: str,
+    command_name: str | None,
+) -> Path | None:
+    """Validate the runner/command_name combination and locate the project.
 
-    # Determine execution mode based on runner and command_name
-    use_project_mode = False
-    project_root = None
+    Returns:
+        The directory containing pyproject.toml when project mode applies,
+        otherwise ``None`` (direct script mode).
+    """
 
     # Validate runner and command_name combination
     if command_name is not None and runner != "uv":
@@ -72,118 +431,226 @@ def generate_ps1_wrapper(
             f"  2. Remove command_name to run the script directly with {runner}"
         )
 
-    if runner == "uv":
-        if command_name is not None:
-            # uv + command_name -> project mode (must validate)
-            # Find pyproject.toml by walking up from script_path
-            current = script_path.parent
-            while current != current.parent:
-                if (current / "pyproject.toml").exists():
-                    project_root = current
-                    break
-                current = current.parent
-
-            if project_root is None:
-                error_msg = (
-                    f"Error: command_name '{command_name}' was specified but pyproject.toml was not found.\n"
-                    f"\n"
-                    f"  Script path: {script_path}\n"
-                    f"  Search started from: {script_path.parent}\n"
-                    f"\n"
-                    f"Possible solutions:\n"
-                    f"  1. Ensure the script is located within a uv project directory\n"
-                    f"  2. Create pyproject.toml in the project root directory\n"
-                    f"  3. Verify the directory structure and move the script if needed"
-                )
-                raise ValueError(error_msg)
+    if command_name is None:
+        # uv without command_name -> direct script mode with relative path
+        return None
 
-            # Validate that command_name exists in [project.scripts]
-            pyproject_path = project_root / "pyproject.toml"
-            try:
-                with pyproject_path.open("rb") as f:
-                    data = tomllib.load(f)
-            except tomllib.TOMLDecodeError as e:
-                error_msg = (
-                    f"Error: Failed to read pyproject.toml (invalid TOML format)\n"
-                    f"\n"
-                    f"  File path: {pyproject_path}\n"
-                    f"  Error details: {e}\n"
-                    f"\n"
-                    f"Possible solutions:\n"
-                    f"  1. Check the syntax of pyproject.toml\n"
-                    f"  2. Validate with an online TOML validator\n"
-                    f"  3. Review recent changes and fix if necessary"
-                )
-                raise ValueError(error_msg) from e
-            except Exception as e:
-                error_msg = (
-                    f"Error: Unexpected error occurred while reading pyproject.toml\n"
-                    f"\n"
-                    f"  File path: {pyproject_path}\n"
-                    f"  Error type: {type(e).__name__}\n"
-                    f"  Error details: {e}\n"
-                    f"\n"
-                    f"Possible solutions:\n"
-                    f"  1. Check file read permissions\n"
-                    f"  2. Verify the file is not corrupted\n"
-                    f"  3. Ensure the file encoding is UTF-8"
-                )
-                raise ValueError(error_msg) from e
-
-            scripts = data.get("project", {}).get("scripts", {})
-            if not scripts:
-                error_msg = (
-                    f"Error: [project.scripts] section not found in pyproject.toml\n"
-                    f"\n"
-                    f"  File path: {pyproject_path}\n"
-                    f"  Specified command name: {command_name}\n"
-                    f"\n"
-                    f"Possible solutions:\n"
-                    f"  1. Add the [project.scripts] section to pyproject.toml:\n"
-                    f"\n"
-                    f"     [project.scripts]\n"
-                    f'     {command_name} = "your_module:main"\n'
-                    f"\n"
-                    f"  2. Ensure the command entry point is correctly defined"
-                )
-                raise ValueError(error_msg)
+    # uv + command_name -> project mode (must validate)
+    # Find pyproject.toml by walking up from script_path
+    project_root = _find_project_root(script_path.parent)
+    if project_root is None:
+        error_msg = (
+            f"Error: command_name '{command_name}' was specified but pyproject.toml was not found.\n"
+            f"\n"
+            f"  Script path: {script_path}\n"
+            f"  Search started from: {script_path.parent}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Ensure the script is located within a uv project directory\n"
+            f"  2. Create pyproject.toml in the project root directory\n"
+            f"  3. Verify the directory structure and move the script if needed"
+        )
+        raise ValueError(error_msg)
 
-            if command_name not in scripts:
-                available_commands = ", ".join(
-                    f"'{cmd}'" for cmd in sorted(scripts.keys())
-                )
-                error_msg = (
-                    f"Error: command_name '{command_name}' not found in [project.scripts]\n"
-                    f"\n"
-                    f"  File path: {pyproject_path}\n"
-                    f"  Specified command name: {command_name}\n"
-                    f"  Available commands: {available_commands if scripts else '(none)'}\n"
-                    f"\n"
-                    f"Possible solutions:\n"
-                    f"  1. Use one of the existing command names listed above\n"
-                    f"  2. Verify there are no spelling errors in the command name\n"
-                    f"  3. Add the command to pyproject.toml:\n"
-                    f"\n"
-                    f"     [project.scripts]\n"
-                    f'     {command_name} = "your_module:main"'
-                )
-                raise ValueError(error_msg)
+    pyproject_path = project_root / "pyproject.toml"
+    scripts = _read_project_scripts(pyproject_path)
+    _validate_command_name(scripts, pyproject_path, command_name)
+    return project_root
+
+
+def _load_project_scripts(pyproject_path: Path) -> dict[str, str]:
+    """Read the ``[project.scripts]`` table from a pyproject.toml file."""
+    try:
+        with pyproject_path.open("rb") as f:
+            data = tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        error_msg = (
+            f"Error: Failed to read pyproject.toml (invalid TOML format)\n"
+            f"\n"
+            f"  File path: {pyproject_path}\n"
+            f"  Error details: {e}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Check the syntax of pyproject.toml\n"
+            f"  2. Validate with an online TOML validator\n"
+            f"  3. Review recent changes and fix if necessary"
+        )
+        raise ValueError(error_msg) from e
+    except Exception as e:
+        error_msg = (
+            f"Error: Unexpected error occurred while reading pyproject.toml\n"
+            f"\n"
+            f"  File path: {pyproject_path}\n"
+            f"  Error type: {type(e).__name__}\n"
+            f"  Error details: {e}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Check file read permissions\n"
+            f"  2. Verify the file is not corrupted\n"
+            f"  3. Ensure the file encoding is UTF-8"
+        )
+        raise ValueError(error_msg) from e
+
+    return data.get("project", {}).get("scripts", {})
+
+
+def _validate_command_name(
+    scripts: dict[str, str], pyproject_path: Path, command_name: str
+) -> None:
+    """Ensure ``command_name`` is registered in ``[project.scripts]``."""
+    if not scripts:
+        error_msg = (
+            f"Error: [project.scripts] section not found in pyproject.toml\n"
+            f"\n"
+            f"  File path: {pyproject_path}\n"
+            f"  Specified command name: {command_name}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Add the [project.scripts] section to pyproject.toml:\n"
+            f"\n"
+            f"     [project.scripts]\n"
+            f'     {command_name} = "your_module:main"\n'
+            f"\n"
+            f"  2. Ensure the command entry point is correctly defined"
+        )
+        raise ValueError(error_msg)
+
+    if command_name not in scripts:
+        available_commands = ", ".join(f"'{cmd}'" for cmd in sorted(scripts.keys()))
+        error_msg = (
+            f"Error: command_name '{command_name}' not found in [project.scripts]\n"
+            f"\n"
+            f"  File path: {pyproject_path}\n"
+            f"  Specified command name: {command_name}\n"
+            f"  Available commands: {available_commands if scripts else '(none)'}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Use one of the existing command names listed above\n"
+            f"  2. Verify there are no spelling errors in the command name\n"
+            f"  3. Add the command to pyproject.toml:\n"
+            f"\n"
+            f"     [project.scripts]\n"
+            f'     {command_name} = "your_module:main"'
+        )
+        raise ValueError(error_msg)
+
+
+def _render_wrapper(
+    parser: argparse.ArgumentParser | WrapperSpec,
+    *,
+    script_path: Path,
+    output_path: Path,
+    skip_dests: Iterable[str] | None,
+    runner: str,
+    command_name: str | None,
+    project_root: Path | None,
+    cache_interpreter: bool = False,
+    embed_help: bool = False,
+    compress_help: bool = False,
+    validate_arguments: bool = False,
+    worker: bool = False,
+    completion_hints: Mapping[str, CompletionHint] | None = None,
+    completion_ttl: float = 300.0,
+    completion_cache_size: int = 256,
+    console_script: bool = False,
+    pipeline_input: str | None = None,
+    parallel_input: str | None = None,
+    as_object: bool = False,
+    trace_timing: bool = False,
+    function_name: str | None = None,
+) -> str:
+    """Render the full .ps1 wrapper text.
+
+    A parser is first reduced to a :class:`WrapperSpec`; everything below
+    reads the spec only. ``project_root`` must come from :func:`_resolve_project_root`; when it is
+    set the wrapper uses ``uv run --project`` mode.
+
+    With ``function_name`` the wrapper is rendered as a function for a
+    PowerShell module (see :mod:`argparse_ps1.module`). The function returns
+    instead of calling ``exit``, resolves paths from ``$PSScriptRoot`` and
+    leaves encoding setup and the unknown-args check to the module's shared
+    helpers.
+
+    With ``console_script`` the wrapper runs the installed console script
+    ``command_name`` next to it; ``project_root`` must then be ``None``.
+
+    With ``pipeline_input`` the wrapper is split into ``begin``/``process``/
+    ``end`` blocks (see :func:`_render_pipeline_blocks`). With
+    ``parallel_input`` the named positional becomes an array whose values are
+    run concurrently (see :data:`_PARALLEL_FUNCTION`). With ``as_object``
+    the wrapper gains ``-AsObject`` (see :func:`_render_object_launch`), and
+    with ``trace_timing`` ``-TraceTiming`` (see :data:`_TIMING_FUNCTION`).
+    """
 
-            use_project_mode = True
-        # else: uv without command_name -> direct script mode with relative path
+    function_mode = function_name is not None
+    if console_script:
+        if project_root is not None or function_mode:
+            raise RuntimeError("Internal error: console_script with project/module")
+        if command_name is None or cache_interpreter:
+            raise ValueError(
+                "Error: console_script needs command_name and no cache_interpreter.\n"
+                "\n"
+                "  The wrapper runs the console script named command_name that is\n"
+                "  installed next to it, without uv or a project interpreter.\n"
+                "\n"
+                "Possible solutions:\n"
+                "  1. Pass command_name for a command in [project.scripts]\n"
+                "  2. Remove cache_interpreter"
+            )
+    spec = (
+        parser
+        if isinstance(parser, WrapperSpec)
+        # The help text is only needed when it is embedded
+        else extract_spec(parser, format_help=embed_help)
+    )
 
     # Filter actions, excluding help and specified skip_dests
-    regular_actions = [
-        action
-        for action in parser._actions
-        if action.dest != "help"
-        and (skip_dests is None or action.dest not in skip_dests)
-    ]
+    skip = {"help"}
+    if skip_dests:
+        skip.update(skip_dests)
+    parameters = _parameters(spec.arguments, skip)
+
+    subparsers_parameter = next(
+        (p for p in parameters if p.argument.action == "parsers"),
+        None,
+    )
+    pipeline_parameter = (
+        None
+        if pipeline_input is None
+        else _pipeline_parameter(parameters, pipeline_input)
+    )
+    parallel_parameter = None
+    if parallel_input is not None:
+        parallel_parameter = _parallel_parameter(parameters, parallel_input)
+        # One value per run, but the wrapper takes a list of them
+        parameters[parameters.index(parallel_parameter)] = parallel_parameter = replace(
+            parallel_parameter, type_hint=f"{parallel_parameter.type_hint}[]"
+        )
 
     # Generate PowerShell code components
-    param_block = _render_param_block(regular_actions)
-    argument_conversion = _render_argument_conversion(regular_actions)
-
+    validation = (
+        _ParameterValidation(
+            spec,
+            parameters,
+            checks=validate_arguments,
+            subcommands=subparsers_parameter is not None,
+            pipeline=pipeline_parameter is not None,
+        )
+        if validate_arguments
+        or subparsers_parameter is not None
+        or pipeline_parameter is not None
+        else None
+    )
+    subcommands = None
+    if subparsers_parameter is not None and validation is not None:
+        positionals = [p for p in parameters if p.option is None]
+        subcommands = _Subcommands(
+            subparsers_parameter,
+            skip=skip,
+            static_names={"Help", *(p.name for p in parameters)},
+            position=positionals.index(subparsers_parameter),
+            validation=validation,
+        )
     # Handle runner path resolution
     if "/" in runner or "\\" in runner:
         # Path specified - normalize using Path
@@ -194,100 +661,1278 @@ def generate_ps1_wrapper(
         # Simple command name
         runner_literal = runner
 
-    if use_project_mode:
+    completers = _render_argument_completers(
+        parameters,
+        completion_hints,
+        validation,
+        _CompletionLaunch(
+            command=output_path.stem,
+            location=(
+                ""
+                if console_script
+                else (
+                    _calculate_project_relative_path(project_root, output_path)
+                    if project_root is not None
+                    else _calculate_script_relative_path(script_path, output_path)
+                )
+            ),
+            python=(
+                None
+                if console_script
+                else (
+                    f'"{runner_literal}" run --project $ProjectRoot python'
+                    if project_root is not None
+                    else (
+                        # The environment `uv run $ScriptPath` runs the script in
+                        _uv_script_python(runner_literal, script_path)
+                        if runner_literal == "uv"
+                        else f'"{runner_literal}"'
+                    )
+                )
+            ),
+            script_mode=project_root is None,
+            ttl=completion_ttl,
+            cache_size=completion_cache_size,
+        ),
+    )
+    for switch, option, enabled in (
+        (_AS_OBJECT, "as_object", as_object),
+        (_TRACE_TIMING, "trace_timing", trace_timing),
+    ):
+        clash = next((p for p in parameters if p.name == switch), None)
+        if enabled and clash is not None:
+            raise ValueError(
+                f"Error: argument '{clash.argument.dest}' maps to -{switch}, which "
+                f"{option} adds.\n"
+                f"\n"
+                f"Possible solutions:\n"
+                f"  1. Rename the argument's dest\n"
+                f"  2. Exclude it with skip_dests\n"
+                f"  3. Remove {option}"
+            )
+    param_block, argument_conversion = _render_parameters(
+        parameters,
+        validation,
+        completers,
+        pipeline_parameter,
+        parallel_parameter,
+        as_object=as_object,
+        trace_timing=trace_timing,
+    )
+    if subcommands is not None:
+        argument_conversion = "\n".join(
+            filter(None, [argument_conversion, subcommands.render_conversion()])
+        )
+    comment_help = None
+    embedded_help = None
+    if embed_help:
+        comment_help = _render_comment_help(spec, parameters)
+        embedded_help = _render_embedded_help(spec.help_text, compress_help)
+
+    if function_mode:
+        header: list[str] = []
+        powershell_encoding: list[str] = []
+        python_encoding: list[str] = []
+        script_dir = "$ScriptDir = $PSScriptRoot"
+    else:
+        header = ["#!/usr/bin/env pwsh", ""]
+        powershell_encoding = [
+            "# Set PowerShell output encoding to UTF-8",
+            "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8",
+            "$OutputEncoding = [System.Text.Encoding]::UTF8",
+            "",
+        ]
+        python_encoding = [
+            "# Set Python output encoding to UTF-8",
+            '$env:PYTHONIOENCODING = "utf-8"',
+            "",
+        ]
+        script_dir = "$ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path"
+
+    if console_script and command_name is not None:
+        unknown_args_check = _render_unknown_args_check(
+            runner="$Runner",
+            use_project_mode=False,
+            embedded_help=embedded_help,
+            validation=validation,
+            subcommand=subcommands.name if subcommands else None,
+            console_script=True,
+        )
+        preamble = [
+            *header,
+            f"# Console script mode: Execute command '{command_name}' installed next to this wrapper",
+            "",
+            *([comment_help] if comment_help else []),
+            param_block,
+        ]
+        body = [
+            "",
+            script_dir,
+            f"$Runner = Join-Path $ScriptDir {_ps_single_quoted_string(command_name)}",
+            "# pip and uv install console scripts as .exe launchers on Windows",
+            'if ($env:OS -eq "Windows_NT") { $Runner += ".exe" }',
+            "",
+            unknown_args_check,
+            *powershell_encoding,
+            *python_encoding,
+            "$Arguments = @()",
+            *(["$ArgumentOffset = $Arguments.Count"] if worker else []),
+            argument_conversion,
+        ]
+        runner_expression = "$Runner"
+    elif project_root is not None:
         # --project mode: use registered command
-        if project_root is None:
-            raise RuntimeError("Internal error: project_root is None in project mode")
         if command_name is None:
             raise RuntimeError("Internal error: command_name is None in project mode")
         project_relative_path = _calculate_project_relative_path(
             project_root, output_path
         )
         unknown_args_check = _render_unknown_args_check(
-            runner=runner_literal, use_project_mode=True, command_name=command_name
+            runner=runner_literal,
+            use_project_mode=True,
+            command_name=command_name,
+            embedded_help=embedded_help,
+            validation=validation,
+            function_mode=function_mode,
+            subcommand=subcommands.name if subcommands else None,
         )
-        lines: list[str] = [
-            "#!/usr/bin/env pwsh",
-            "",
+        preamble: list[str] = [
+            *header,
             f"# uv run --project mode: Execute command '{command_name}' registered in [project.scripts]",
             "",
+            *([comment_help] if comment_help else []),
             param_block,
-            unknown_args_check,
-            "# Set PowerShell output encoding to UTF-8",
-            "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8",
-            "$OutputEncoding = [System.Text.Encoding]::UTF8",
+        ]
+        body = [
             "",
-            "$ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path",
+            script_dir,
             project_relative_path,
             "",
-            "# Set Python output encoding to UTF-8",
-            '$env:PYTHONIOENCODING = "utf-8"',
-            "",
-            "# Execute registered command with uv run --project",
-            f'$Arguments = @("run", "--project", $ProjectRoot, "{command_name}")',
+            unknown_args_check,
+            *powershell_encoding,
+            *python_encoding,
+            *(
+                _render_cached_interpreter_launch(
+                    runner=runner_literal,
+                    command_name=command_name,
+                    entry_point=_read_project_scripts(project_root / "pyproject.toml")[
+                        command_name
+                    ],
+                    cache_name=f".{output_path.stem}.interpreter.json",
+                )
+                if cache_interpreter
+                else [
+                    "# Execute registered command with uv run --project",
+                    f'$Arguments = @("run", "--project", $ProjectRoot, "{command_name}")',
+                ]
+            ),
+            *(["$ArgumentOffset = $Arguments.Count"] if worker else []),
             argument_conversion,
-            f'& "{runner_literal}" @Arguments',
-            "exit $LASTEXITCODE",
-            "",
         ]
+        runner_expression = "$Runner" if cache_interpreter else f'"{runner_literal}"'
     else:
+        if cache_interpreter:
+            raise ValueError(
+                "Error: cache_interpreter requires project mode.\n"
+                "\n"
+                "  The interpreter is resolved from the uv project that registers\n"
+                "  the command, so command_name must be specified.\n"
+                "\n"
+                "Possible solutions:\n"
+                "  1. Pass command_name for a command in [project.scripts]\n"
+                "  2. Remove cache_interpreter to run the script with uv run"
+            )
         # Direct script mode: run Python file directly
         unknown_args_check = _render_unknown_args_check(
-            runner=runner_literal, use_project_mode=False, script_path=script_path
+            runner=runner_literal,
+            use_project_mode=False,
+            script_path=script_path,
+            embedded_help=embedded_help,
+            validation=validation,
+            function_mode=function_mode,
+            subcommand=subcommands.name if subcommands else None,
         )
         # Calculate relative path from output directory to script
         script_relative_path = _calculate_script_relative_path(script_path, output_path)
 
-        lines = [
-            "#!/usr/bin/env pwsh",
-            "",
+        preamble = [
+            *header,
             "# Direct script mode: Execute Python file directly",
             "",
+            *([comment_help] if comment_help else []),
             param_block,
+        ]
+        body = [
             "",
             "# Set script path",
-            "$ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path",
+            script_dir,
             script_relative_path,
             "",
             unknown_args_check,
-            "# Set PowerShell output encoding to UTF-8",
-            "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8",
-            "$OutputEncoding = [System.Text.Encoding]::UTF8",
-            "",
-            "# Set Python output encoding to UTF-8",
-            '$env:PYTHONIOENCODING = "utf-8"',
-            "",
+            *powershell_encoding,
+            *python_encoding,
             (
                 '$Arguments = @("run", $ScriptPath)'
                 if runner_literal == "uv"
                 else "$Arguments = @($ScriptPath)"
             ),
+            *(["$ArgumentOffset = $Arguments.Count"] if worker else []),
             argument_conversion,
-            f'& "{runner_literal}" @Arguments',
-            "exit $LASTEXITCODE",
+        ]
+        runner_expression = f'"{runner_literal}"'
+
+    launch = _render_launch(runner_expression, function_mode)
+    if worker:
+        launch = [*_render_worker_dispatch(output_path.stem, function_mode), *launch]
+    if parallel_parameter is not None:
+        launch = [
+            *_render_parallel_dispatch(
+                parallel_parameter, runner_expression, function_mode
+            ),
+            *launch,
+        ]
+    if as_object:
+        launch = [
+            *_render_object_launch(
+                runner_expression, function_mode, parallel_parameter
+            ),
+            *launch,
+        ]
+    if parallel_parameter is not None and not function_mode:
+        # Module functions share the helper defined once in the module
+        launch = [_PARALLEL_FUNCTION, *launch]
+    if pipeline_parameter is not None:
+        launch = [*_render_pipeline_end(function_mode), *launch]
+    if trace_timing:
+        body = [
+            body[0],
+            "# Wrapper start, for -TraceTiming",
+            "$TraceStart = [DateTime]::UtcNow",
             "",
+            *body[1:],
+            *_render_trace_start(),
         ]
+        launch = _render_traced_launch(launch, function_mode)
 
-    content = "\n".join(lines)
-    output_path.write_text(content, encoding="utf-8-sig")
-    return output_path
+    if pipeline_parameter is not None:
+        blocks = _render_pipeline_blocks(
+            body, launch, pipeline_parameter, runner_expression, function_mode
+        )
+    elif subcommands is not None:
+        # A script with DynamicParam must put its statements in named blocks
+        blocks = ["end {", _indent_block([*body, *launch]).strip("\n"), "}", ""]
+    else:
+        blocks = None
+    if blocks is None:
+        lines = [*preamble, *body, *launch, ""]
+    else:
+        lines = [
+            *preamble,
+            *([subcommands.render_dynamic_param()] if subcommands else []),
+            *blocks,
+        ]
 
+    if function_mode:
+        return f"function {function_name} {{\n{_indent_block(lines)}}}\n"
+    return "\n".join(lines)
 
-def _render_param_block(actions: Sequence[argparse.Action]) -> str:
-    lines: list[str] = ["param("]
 
-    # Add -Help parameter first
-    lines.append("    [switch]$Help,")
+# Helpers defined once per module by :mod:`argparse_ps1.module` and called
+# from every function rendered with ``function_name``.
+_MODULE_INVOKE_HELPER = "Invoke-ArgparsePs1Command"
+_MODULE_UNKNOWN_ARGS_HELPER = "Test-ArgparsePs1UnknownArgs"
+_WORKER_CLIENT_HELPER = "Invoke-ArgparsePs1Worker"
+_PARALLEL_HELPER = "Invoke-ArgparsePs1Parallel"
+
+# Wrapper parameter limiting the concurrent runs of ``parallel_input``
+_THROTTLE_LIMIT = "ThrottleLimit"
+# Wrapper switches added by ``as_object`` and ``trace_timing``
+_AS_OBJECT = "AsObject"
+_TRACE_TIMING = "TraceTiming"
+_TIMING_HELPER = "Write-ArgparsePs1Timing"
+
+# PowerShell client for :mod:`argparse_ps1.worker`, mirroring
+# :func:`argparse_ps1.worker.call`. ``$Handled`` stays false when no worker
+# accepted the request, in which case nothing ran.
+_WORKER_CLIENT_FUNCTION = f"""function {_WORKER_CLIENT_HELPER} {{
+    param([string]$StatePath, [object[]]$Arguments, [ref]$Handled)
+
+    if (-not (Test-Path -LiteralPath $StatePath)) {{ return }}
+    try {{
+        $Worker = Get-Content -LiteralPath $StatePath -Raw | ConvertFrom-Json
+        $Client = [System.Net.Sockets.TcpClient]::new()
+        $Client.Connect("127.0.0.1", [int]$Worker.port)
+    }} catch {{
+        return
+    }}
+    try {{
+        $Stream = $Client.GetStream()
+        $Encoding = [System.Text.UTF8Encoding]::new($false)
+        $Writer = [System.IO.StreamWriter]::new($Stream, $Encoding)
+        $Request = @{{
+            token = $Worker.token
+            argv = @($Arguments | ForEach-Object {{ [string]$_ }})
+            cwd = (Get-Location).ProviderPath
+        }}
+        $Writer.WriteLine(($Request | ConvertTo-Json -Compress))
+        $Writer.Flush()
+        $Reader = [System.IO.StreamReader]::new($Stream, $Encoding)
+        $Pending = ""
+        while ($null -ne ($Line = $Reader.ReadLine())) {{
+            $Handled.Value = $true
+            $Frame = $Line | ConvertFrom-Json
+            if ($null -ne $Frame.exit) {{
+                if ($Pending) {{ Write-Output $Pending }}
+                $global:LASTEXITCODE = [int]$Frame.exit
+                return
+            }}
+            if ($Frame.stream -eq "stderr") {{
+                [Console]::Error.Write($Frame.data)
+                continue
+            }}
+            # Emit complete lines to the pipeline, like a native command
+            $Lines = ($Pending + $Frame.data) -split "\\r?\\n"
+            $Pending = $Lines[-1]
+            if ($Lines.Count -gt 1) {{ $Lines[0..($Lines.Count - 2)] }}
+        }}
+        if ($Handled.Value) {{
+            if ($Pending) {{ Write-Output $Pending }}
+            Write-Error "Worker connection closed before the command finished"
+            $global:LASTEXITCODE = 1
+        }}
+    }} finally {{
+        $Client.Dispose()
+    }}
+}}
+"""
+
+
+# Runs ``$Count`` commands that differ in the values at ``$Index`` of
+# ``$Arguments`` on a runspace pool of ``$ThrottleLimit`` runspaces, which
+# Windows PowerShell 5.1 has as well (ForEach-Object -Parallel needs 7). Output
+# is buffered per run and emitted in order as the runs finish; native stderr
+# lines go to stderr. ``$LASTEXITCODE`` is the first non-zero exit code.
+_PARALLEL_FUNCTION = f"""function {_PARALLEL_HELPER} {{
+    param([string]$Runner, [object[]]$Arguments, [int]$Index, [int]$Count, [int]$ThrottleLimit)
+
+    # As {_MODULE_INVOKE_HELPER} does for module functions
+    [Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+    $env:PYTHONIOENCODING = "utf-8"
+
+    $Script = {{
+        param([string]$Runner, [object[]]$Arguments, [string]$Location)
+        # Pooled runspaces are reused and start in the process directory
+        $global:LASTEXITCODE = $null
+        Set-Location -LiteralPath $Location
+        $Output = & $Runner @Arguments 2>&1
+        [pscustomobject]@{{ Output = $Output; ExitCode = $LASTEXITCODE }}
+    }}.ToString()
+    $Before = @($Arguments | Select-Object -First $Index)
+    $After = @($Arguments | Select-Object -Skip ($Index + $Count))
+    $Location = (Get-Location).ProviderPath
+    $Pool = [runspacefactory]::CreateRunspacePool(1, $ThrottleLimit)
+    $Pool.Open()
+    try {{
+        $Runs = foreach ($Value in $Arguments[$Index..($Index + $Count - 1)]) {{
+            $PowerShell = [powershell]::Create()
+            $PowerShell.RunspacePool = $Pool
+            [void]$PowerShell.AddScript($Script).AddArgument($Runner).AddArgument(@($Before + $Value + $After)).AddArgument($Location)
+            @{{ PowerShell = $PowerShell; Handle = $PowerShell.BeginInvoke() }}
+        }}
+        $ExitCode = 0
+        foreach ($Run in $Runs) {{
+            $Result = @($Run.PowerShell.EndInvoke($Run.Handle))
+            foreach ($Record in $Run.PowerShell.Streams.Error) {{ Write-Error -ErrorRecord $Record }}
+            $Code = 1
+            if ($Result.Count -gt 0) {{
+                foreach ($Line in $Result[-1].Output) {{
+                    if ($Line -is [System.Management.Automation.ErrorRecord]) {{
+                        [Console]::Error.WriteLine($Line.ToString())
+                    }} else {{
+                        $Line
+                    }}
+                }}
+                if ($null -ne $Result[-1].ExitCode) {{ $Code = [int]$Result[-1].ExitCode }}
+            }}
+            if ($ExitCode -eq 0) {{ $ExitCode = $Code }}
+            $Run.PowerShell.Dispose()
+        }}
+        $global:LASTEXITCODE = $ExitCode
+    }} finally {{
+        $Pool.Dispose()
+    }}
+}}
+"""
+
+
+# Prints the ``-TraceTiming`` report. Each phase ends at a timestamp: the
+# wrapper's start (so the first phase is PowerShell startup and parameter
+# binding, which only means something for a fresh ``pwsh -File`` process),
+# the launch, the events :func:`argparse_ps1.trace.trace_timing` recorded
+# (the first of each, should parallel runs record several), and the exit.
+_TIMING_FUNCTION = f"""function {_TIMING_HELPER} {{
+    param([datetime]$Start, [datetime]$Launch, [string]$TraceFile, [string]$ScriptName)
+
+    $End = [DateTime]::UtcNow
+    $env:{TRACE_ENV} = $null
+    $Epoch = [DateTime]::new(1970, 1, 1, 0, 0, 0, [DateTimeKind]::Utc)
+    $Python = @{{}}
+    if ($TraceFile -and (Test-Path -LiteralPath $TraceFile)) {{
+        foreach ($Line in Get-Content -LiteralPath $TraceFile) {{
+            $Record = $Line | ConvertFrom-Json
+            if (-not $Python.ContainsKey($Record.event)) {{
+                $Python[$Record.event] = $Epoch.AddTicks([long]($Record.time * 1e7))
+            }}
+        }}
+        Remove-Item -LiteralPath $TraceFile
+    }}
+    $Marks = [System.Collections.Generic.List[object]]::new()
+    # Startup is only part of the invocation in a process started to run this
+    # wrapper (pwsh -File Tool.ps1); an interactive shell started long before
+    $Previous = $Start
+    if ($ScriptName -and @([Environment]::GetCommandLineArgs() | Select-Object -Skip 1 | Where-Object {{ $_.IndexOf($ScriptName, [StringComparison]::OrdinalIgnoreCase) -ge 0 }}).Count -gt 0) {{
+        $Previous = [System.Diagnostics.Process]::GetCurrentProcess().StartTime.ToUniversalTime()
+        $Marks.Add(@("PowerShell startup and binding", $Start))
+    }}
+    $Marks.Add(@("Argument conversion", $Launch))
+    if ($Python.parser) {{ $Marks.Add(@("uv, interpreter and imports", $Python.parser)) }}
+    if ($Python.parse_args) {{ $Marks.Add(@("parse_args", $Python.parse_args)) }}
+    if ($Python.Count -gt 0) {{
+        $Marks.Add(@("Script", $End))
+    }} else {{
+        $Marks.Add(@("Python (no argparse_ps1 trace hook)", $End))
+    }}
+
+    [Console]::Error.WriteLine("TraceTiming (ms):")
+    foreach ($Mark in $Marks) {{
+        [Console]::Error.WriteLine(("  {{0,-36}} {{1,10:N1}}" -f $Mark[0], ($Mark[1] - $Previous).TotalMilliseconds))
+        $Previous = $Mark[1]
+    }}
+    [Console]::Error.WriteLine(("  {{0,-36}} {{1,10:N1}}" -f "Total from wrapper start", ($End - $Start).TotalMilliseconds))
+}}
+"""
 
-    for index, action in enumerate(actions):
-        rendered = _render_param_line(action)
 
-        if index < len(actions) - 1:
-            rendered += ","
-        lines.append(f"    {rendered}")
+def _render_launch(runner_expression: str, function_mode: bool) -> list[str]:
+    """Render the Python invocation that ends the wrapper."""
+    if function_mode:
+        return [f"{_MODULE_INVOKE_HELPER} {runner_expression} $Arguments"]
+    return [f"& {runner_expression} @Arguments", "exit $LASTEXITCODE"]
 
+
+def _render_worker_dispatch(stem: str, function_mode: bool) -> list[str]:
+    """Render the hand-off to a running :mod:`argparse_ps1.worker`.
+
+    Arguments added after ``$ArgumentOffset`` (i.e. without the runner and
+    script prefix) are sent to the worker. The wrapper continues with its
+    normal launch when no worker answers.
+    """
+    return [
+        # Module functions share the helper defined once in the module
+        *([] if function_mode else [_WORKER_CLIENT_FUNCTION]),
+        "# Run in the persistent worker (python -m argparse_ps1.worker) if one is listening",
+        f'$WorkerState = Join-Path $ScriptDir ".{stem}.worker.json"',
+        "$WorkerHandled = $false",
+        f"{_WORKER_CLIENT_HELPER} $WorkerState @($Arguments | Select-Object -Skip $ArgumentOffset) ([ref]$WorkerHandled)",
+        f"if ($WorkerHandled) {{ {'return' if function_mode else 'exit $LASTEXITCODE'} }}",
+        "",
+    ]
+
+
+def _pipeline_parameter(
+    parameters: Sequence[_Parameter], pipeline_input: str
+) -> _Parameter:
+    """Return the parameter named by ``pipeline_input``, checking it can be empty.
+
+    Piped items reach Python on stdin, so argparse must accept the argument
+    being absent from the command line.
+    """
+    parameter = next((p for p in parameters if p.argument.dest == pipeline_input), None)
+    if parameter is None:
+        problem = "is not a parameter of the wrapper"
+    elif not parameter.is_array or parameter.argument.action == "parsers":
+        problem = "does not take a list of values"
+    elif (
+        parameter.option is None
+        and parameter.argument.nargs not in (argparse.ZERO_OR_MORE, argparse.REMAINDER)
+    ) or (parameter.option is not None and parameter.argument.required):
+        problem = "is required on the command line"
+    else:
+        return parameter
+    raise ValueError(
+        f"Error: pipeline_input '{pipeline_input}' {problem}.\n"
+        f"\n"
+        f"  Piped items are streamed to the script's stdin, so the argument\n"
+        f"  must collect a list that argparse accepts being empty.\n"
+        f"\n"
+        f"Possible solutions:\n"
+        f'  1. Use nargs="*" for a positional argument\n'
+        f"  2. Use an optional argument with nargs, append or extend\n"
+        f"  3. Check that the dest is not excluded with skip_dests"
+    )
+
+
+def _render_pipeline_blocks(
+    setup: Sequence[str],
+    launch: Sequence[str],
+    parameter: _Parameter,
+    runner_expression: str,
+    function_mode: bool,
+) -> list[str]:
+    """Render ``begin``/``process``/``end`` blocks that stream pipeline input.
+
+    ``begin`` builds the arguments as usual. A piped parameter is not bound
+    yet at that point, so it is left out; with piped input one Python process
+    is then started as a steppable pipeline, and ``process`` writes every
+    item to its stdin as it arrives, while its output flows on down the
+    pipeline. ``launch`` goes into ``end`` and must start with
+    :func:`_render_pipeline_end`; without piped input it launches Python as
+    usual.
+    """
+    items = f"${parameter.name}"
+    if parameter.option is not None and parameter.argument.type == "path":
+        # As in _render_option_assignment; positionals are passed as-is
+        items = f"(Resolve-Path {items}).Path"
+    # In a function, the return of -Help or a failed check only leaves begin
+    guard = ["if ($Finished) { return }"] if function_mode else []
+    begin = [
+        *(["$Finished = $true"] if function_mode else []),
+        *setup,
+        *(["$Finished = $false"] if function_mode else []),
+        "",
+        "# Stream piped items to one Python process, one per line (see argparse_ps1.pipeline_items)",
+        "$PipelineInput = $null",
+        "if ($MyInvocation.ExpectingInput) {",
+        f"    $PreviousPipelineEnv = $env:{PIPELINE_ENV}",
+        f'    $env:{PIPELINE_ENV} = "1"',
+        *(['    $env:PYTHONIOENCODING = "utf-8"'] if function_mode else []),
+        "    # UTF-8 without a byte order mark before the first item",
+        "    $OutputEncoding = [System.Text.UTF8Encoding]::new($false)",
+        f"    $PipelineInput = {{ & {runner_expression} @Arguments }}.GetSteppablePipeline($MyInvocation.CommandOrigin)",
+        "    $PipelineInput.Begin($PSCmdlet)",
+        "}",
+    ]
+    process = [
+        *guard,
+        "if (-not $PipelineInput) { return }",
+        "# Files and directories are passed by full path",
+        f"$Items = if ($_ -is [System.IO.FileSystemInfo]) {{ $_.FullName }} else {{ {items} }}",
+        "foreach ($Item in $Items) { $PipelineInput.Process($Item) }",
+    ]
+    end = [*guard, *launch]
+    lines: list[str] = []
+    for name, block in (("begin", begin), ("process", process), ("end", end)):
+        lines += [f"{name} {{", _indent_block(block).strip("\n"), "}", ""]
+    return lines
+
+
+def _parallel_parameter(
+    parameters: Sequence[_Parameter], parallel_input: str
+) -> _Parameter:
+    """Return the parameter named by ``parallel_input``, checking it takes one value."""
+    parameter = next((p for p in parameters if p.argument.dest == parallel_input), None)
+    if parameter is None:
+        problem = "is not a parameter of the wrapper"
+    elif (
+        parameter.option is not None
+        or parameter.is_array
+        or parameter.argument.nargs is not None
+        or parameter.argument.action == "parsers"
+    ):
+        problem = "is not a positional argument taking one value"
+    elif any(p.name == _THROTTLE_LIMIT for p in parameters):
+        problem = f"cannot be used, as another argument maps to -{_THROTTLE_LIMIT}"
+    else:
+        return parameter
+    raise ValueError(
+        f"Error: parallel_input '{parallel_input}' {problem}.\n"
+        f"\n"
+        f"  Every run of the script gets one of the values given for it.\n"
+        f"\n"
+        f"Possible solutions:\n"
+        f"  1. Name a positional argument without nargs\n"
+        f"  2. Check that the dest is not excluded with skip_dests"
+    )
+
+
+def _render_parallel_dispatch(
+    parameter: _Parameter, runner_expression: str, function_mode: bool
+) -> list[str]:
+    """Render the fan-out taken when the parallel parameter has several values.
+
+    :data:`_PARALLEL_FUNCTION` must be defined before these lines.
+    """
+    condition, call = _render_parallel_call(parameter, runner_expression)
+    return [
+        f"# Run one process per value of -{parameter.name}, at most -{_THROTTLE_LIMIT} at a time",
+        f"if ({condition}) {{",
+        f"    {call}",
+        f"    {'return' if function_mode else 'exit $LASTEXITCODE'}",
+        "}",
+        "",
+    ]
+
+
+def _render_parallel_call(
+    parameter: _Parameter, runner_expression: str
+) -> tuple[str, str]:
+    """Return the condition for a fan-out and the call that runs it."""
+    values = f"@(${parameter.name}).Count"
+    return (
+        f"{values} -gt 1",
+        f"{_PARALLEL_HELPER} {runner_expression} $Arguments $ParallelIndex {values} ${_THROTTLE_LIMIT}",
+    )
+
+
+def _render_object_launch(
+    runner_expression: str, function_mode: bool, parallel: _Parameter | None
+) -> list[str]:
+    """Render the launch taken with ``-AsObject``.
+
+    Every line :func:`argparse_ps1.emit` marked as a record (see
+    :data:`argparse_ps1.output.RECORD_MARKER`) is converted as it arrives, so
+    results flow down the pipeline without being collected first. Other lines,
+    and marked lines that are not valid JSON, pass through as text. The worker
+    is bypassed, as it does not see the environment variable that asks for
+    JSON.
+    """
+    command = _render_launch(runner_expression, function_mode)[0]
+    if parallel is not None:
+        condition, call = _render_parallel_call(parallel, runner_expression)
+        command = f"& {{ if ({condition}) {{ {call} }} else {{ {command} }} }}"
+    return [
+        "# argparse_ps1.emit marks each JSON record with a leading U+001E; convert each as it arrives",
+        "if ($AsObject) {",
+        f"    $PreviousOutputEnv = $env:{OUTPUT_ENV}",
+        f'    $env:{OUTPUT_ENV} = "json"',
+        "    try {",
+        f"        {command} | ForEach-Object {{",
+        f"            if (-not $_ -or $_[0] -ne [char]0x{ord(RECORD_MARKER):02X}) {{ return $_ }}",
+        "            $Record = $_.Substring(1)",
+        "            try { ConvertFrom-Json -InputObject $Record -ErrorAction Stop } catch { $Record }",
+        "        }",
+        "    } finally {",
+        f"        $env:{OUTPUT_ENV} = $PreviousOutputEnv",
+        "    }",
+        f"    {'return' if function_mode else 'exit $LASTEXITCODE'}",
+        "}",
+        "",
+    ]
+
+
+def _render_pipeline_end(function_mode: bool) -> list[str]:
+    """Render the end of the run started for piped input."""
+    return [
+        "if ($PipelineInput) {",
+        "    $PipelineInput.End()",
+        f"    $env:{PIPELINE_ENV} = $PreviousPipelineEnv",
+        f"    {'return' if function_mode else 'exit $LASTEXITCODE'}",
+        "}",
+        "",
+    ]
+
+
+def _render_trace_start() -> list[str]:
+    """Render the ``-TraceTiming`` setup that ends the argument conversion."""
+    return [
+        "",
+        "if ($TraceTiming) {",
+        "    # Python adds its timestamps to this file (argparse_ps1.trace_timing)",
+        "    $TraceFile = [System.IO.Path]::GetTempFileName()",
+        f"    $env:{TRACE_ENV} = $TraceFile",
+        "    $TraceLaunch = [DateTime]::UtcNow",
+        "}",
+        "",
+    ]
+
+
+def _render_traced_launch(launch: Sequence[str], function_mode: bool) -> list[str]:
+    """Wrap ``launch`` so the ``-TraceTiming`` report follows every way out of it.
+
+    ``finally`` also runs for ``exit`` and ``return``, after their exit code
+    has been taken. Scripts pass their file name, so that the report can tell
+    whether the PowerShell process was started to run them.
+    """
+    script_name = "" if function_mode else " $MyInvocation.MyCommand.Name"
+    return [
+        # Module functions share the helper defined once in the module
+        *([] if function_mode else [_TIMING_FUNCTION]),
+        "try {",
+        _indent_block(launch).rstrip("\n"),
+        "} finally {",
+        f"    if ($TraceTiming) {{ {_TIMING_HELPER} $TraceStart $TraceLaunch $TraceFile{script_name} }}",
+        "}",
+    ]
+
+
+def _render_exit(code: int, function_mode: bool) -> str:
+    """Render ``exit <code>``; inside a module function ``exit`` would end the session."""
+    if not function_mode:
+        return f"exit {code}"
+    if code == 0:
+        return "return"
+    return f"$global:LASTEXITCODE = {code}; return"
+
+
+def _indent_block(lines: Sequence[str]) -> str:
+    """Indent rendered lines by four spaces, leaving here-string bodies as-is.
+
+    A here-string's closing ``'@`` must start its line, so neither the body
+    nor the terminator may be indented.
+    """
+    indented: list[str] = []
+    in_here_string = False
+    for line in "\n".join(lines).split("\n"):
+        if in_here_string:
+            indented.append(line)
+            in_here_string = not line.startswith(("'@", '"@'))
+        else:
+            indented.append(f"    {line}" if line else "")
+            in_here_string = line.endswith(("@'", '@"'))
+    return "\n".join(indented)
+
+
+def _render_cached_interpreter_launch(
+    runner: str, command_name: str, entry_point: str, cache_name: str
+) -> list[str]:
+    """Render the launch prelude for ``cache_interpreter`` mode.
+
+    The project's interpreter is resolved through ``uv run`` once and cached
+    next to the wrapper together with the SHA256 of uv.lock. Later calls run
+    the entry point with that interpreter directly and only go back through
+    ``uv run`` when uv.lock changes or the cached interpreter disappears.
+    """
+    # Entry points look like "pkg.module:func" or "pkg.module:obj.method [extra]"
+    module, _, attrs = entry_point.split("[", 1)[0].strip().partition(":")
+    attrs = attrs.strip()
+    bootstrap = (
+        f"import sys; sys.argv[0] = {command_name!r}; "
+        f"from {module.strip()} import {attrs.split('.')[0]}; sys.exit({attrs}())"
+    )
+
+    return [
+        "# Resolve the project interpreter once; re-resolve when uv.lock changes",
+        f'$InterpreterCache = Join-Path $ScriptDir "{cache_name}"',
+        '$LockFile = Join-Path $ProjectRoot "uv.lock"',
+        "$LockHash = if (Test-Path -LiteralPath $LockFile) { (Get-FileHash -LiteralPath $LockFile -Algorithm SHA256).Hash } else { '' }",
+        "$Python = $null",
+        "if (Test-Path -LiteralPath $InterpreterCache) {",
+        "    $Cached = Get-Content -LiteralPath $InterpreterCache -Raw | ConvertFrom-Json",
+        "    if ($Cached.LockHash -eq $LockHash -and $Cached.Python -and (Test-Path -LiteralPath $Cached.Python)) {",
+        "        $Python = $Cached.Python",
+        "    }",
+        "}",
+        "if (-not $Python) {",
+        f'    $Resolved = & "{runner}" run --project $ProjectRoot python -c "import sys; print(sys.executable)"',
+        "    if ($LASTEXITCODE -eq 0 -and $Resolved) {",
+        "        $Python = ([string]($Resolved | Select-Object -Last 1)).Trim()",
+        "        @{ LockHash = $LockHash; Python = $Python } | ConvertTo-Json | Set-Content -LiteralPath $InterpreterCache -Encoding UTF8",
+        "    }",
+        "}",
+        "",
+        "if ($Python) {",
+        "    # Run the entry point with the cached interpreter directly",
+        "    $Runner = $Python",
+        f'    $Arguments = @("-c", {_ps_single_quoted_string(bootstrap)})',
+        "} else {",
+        "    # Interpreter could not be resolved: execute with uv run --project",
+        f'    $Runner = "{runner}"',
+        f'    $Arguments = @("run", "--project", $ProjectRoot, "{command_name}")',
+        "}",
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class _Parameter:
+    """An argument with the PowerShell values every renderer needs.
+
+    Records are built once per wrapper (:func:`_parameters`) so that names,
+    option strings and literals are not recomputed by each rendered section.
+    """
+
+    argument: ArgumentSpec
+    name: str
+    option: str | None
+    type_hint: str
+    default_literal: str | None
+
+    @property
+    def is_array(self) -> bool:
+        """Whether argparse collects a list (``nargs``, ``append``, ``extend``)."""
+        return self.type_hint.endswith("[]")
+
+
+def _parameters(arguments: Iterable[ArgumentSpec], skip: set[str]) -> list[_Parameter]:
+    """Return records for ``arguments`` whose dest is not in ``skip``."""
+    parameters: list[_Parameter] = []
+    for argument in arguments:
+        if argument.dest in skip:
+            continue
+        type_hint, default_literal = _determine_param_type_and_default(argument)
+        parameters.append(
+            _Parameter(
+                argument=argument,
+                name=_action_name(argument),
+                option=(
+                    _select_option_string(argument.option_strings)
+                    if argument.option_strings
+                    else None
+                ),
+                type_hint=type_hint,
+                default_literal=default_literal,
+            )
+        )
+    return parameters
+
+
+def _render_parameters(
+    parameters: Sequence[_Parameter],
+    validation: _ParameterValidation | None = None,
+    completers: Mapping[str, str] | None = None,
+    pipeline: _Parameter | None = None,
+    parallel: _Parameter | None = None,
+    *,
+    as_object: bool = False,
+    trace_timing: bool = False,
+) -> tuple[str, str]:
+    """Render the ``param()`` block and the argument conversion in one pass."""
+    lines: list[str] = []
+    number_positionals = False
+    if validation is not None and validation.advanced:
+        binding: list[str] = []
+        if validation.uses_sets:
+            binding.append(f'DefaultParameterSetName = "{validation.default_set}"')
+        if not validation.positional_binding:
+            binding.append("PositionalBinding = $false")
+            number_positionals = True
+        lines.append(f"[CmdletBinding({', '.join(binding)})]")
+    lines.append("param(")
+
+    # Add -Help parameter first
+    params = [
+        (
+            '[Parameter(ParameterSetName = "Help")]\n    [switch]$Help'
+            if validation is not None and validation.uses_sets
+            else "[switch]$Help"
+        )
+    ]
+    conversion: list[str] = []
+    completers = completers or {}
+    position = 0
+    for parameter in parameters:
+        common_switch = validation is not None and validation.is_common_switch(
+            parameter
+        )
+        if parameter.option is None:
+            declared_position = position if number_positionals else None
+            position += 1
+        else:
+            declared_position = None
+        if not common_switch:
+            params.append(
+                _render_param_line(
+                    parameter,
+                    validation,
+                    declared_position,
+                    completers.get(parameter.argument.dest),
+                    pipeline=parameter is pipeline,
+                )
+            )
+        if parameter is parallel:
+            # Where each run's value goes (_render_parallel_dispatch)
+            conversion.append("$ParallelIndex = $Arguments.Count")
+        if parameter.argument.action != "parsers":
+            # Subcommands are passed last, with their arguments (_Subcommands)
+            conversion.append(_render_conversion_line(parameter, common_switch))
+
+    if parallel is not None:
+        params.append(
+            "[ValidateRange(1, 2147483647)]\n"
+            f"    [int]${_THROTTLE_LIMIT} = [Environment]::ProcessorCount"
+        )
+    if as_object:
+        params.append(f"[switch]${_AS_OBJECT}")
+    if trace_timing:
+        params.append(f"[switch]${_TRACE_TIMING}")
+    lines.append(",\n".join(f"    {param}" for param in params))
     lines.append(")\n")
-    return "\n".join(lines)
+    return "\n".join(lines), "\n".join(conversion)
+
+
+# Parameters (and aliases) PowerShell adds to every advanced script
+_COMMON_PARAMETERS = frozenset(
+    name.lower()
+    for name in (
+        "Verbose",
+        "vb",
+        "Debug",
+        "db",
+        "ErrorAction",
+        "ea",
+        "WarningAction",
+        "wa",
+        "InformationAction",
+        "infa",
+        "ProgressAction",
+        "proga",
+        "ErrorVariable",
+        "ev",
+        "WarningVariable",
+        "wv",
+        "InformationVariable",
+        "iv",
+        "OutVariable",
+        "ov",
+        "OutBuffer",
+        "ob",
+        "PipelineVariable",
+        "pv",
+    )
+)
+
+# Beyond this many parameter sets mutually exclusive groups are checked at
+# run time instead (PowerShell limits the number of sets per command).
+_MAX_PARAMETER_SETS = 32
+
+
+class _ParameterValidation:
+    """PowerShell parameter metadata mirroring argparse's own checks.
+
+    * ``required`` options and positionals become ``[Parameter(Mandatory)]``
+    * mutually exclusive groups become parameter sets (one per combination)
+    * integer ``range`` choices become ``[ValidateRange()]``
+    * ``nargs=N`` and ``nargs='+'`` arrays get a ``[ValidateCount()]``
+    * readable :class:`argparse.FileType` arguments get a ``[ValidateScript()]``
+      that the file exists
+
+    Any ``[Parameter()]`` attribute turns the wrapper into an advanced script,
+    which gains common parameters such as ``-Verbose``; ``store_true`` actions
+    with those names are bound through the common parameter, other clashes
+    are rejected.
+
+    Wrappers with subcommands or pipeline input are always advanced (see
+    :class:`_Subcommands` and :func:`_render_pipeline_blocks`). For them this
+    class is also used with ``checks=False``, which keeps the common
+    parameter handling but adds none of the checks above.
+    """
+
+    def __init__(
+        self,
+        spec: WrapperSpec,
+        parameters: Sequence[_Parameter],
+        *,
+        checks: bool = True,
+        subcommands: bool = False,
+        pipeline: bool = False,
+    ) -> None:
+        self.checks = checks
+        by_argument = {id(p.argument): p for p in parameters}
+        self.groups: list[tuple[list[_Parameter], bool]] = []
+        for group in spec.groups if checks else ():
+            # Switches bound through common parameters (-Verbose/-Debug) cannot
+            # join a parameter set; argparse still enforces exclusivity for them.
+            members = [
+                p
+                for p in (by_argument.get(id(spec.arguments[i])) for i in group.members)
+                if p is not None and not self._is_common_switch_name(p)
+            ]
+            if len(members) > 1 or (members and group.required):
+                self.groups.append((members, group.required))
+
+        # Whether the group of each grouped parameter is required, by id()
+        self.grouped: dict[int, bool] = {
+            id(p): required for members, required in self.groups for p in members
+        }
+        self.mandatory = {
+            id(p)
+            for p in parameters
+            if p.argument.required
+            and id(p) not in self.grouped
+            and not p.argument.is_switch
+            and checks
+        }
+        # Parameter sets are only declared for mandatory and grouped arguments
+        self.uses_sets = bool(self.mandatory or self.groups)
+        self.advanced = self.uses_sets or subcommands or pipeline
+        # Subcommand wrappers bind positionals by explicit Position only
+        self.positional_binding = not subcommands
+
+        # Every combination of one member (or none, for optional groups) per group
+        combinations: list[tuple[_Parameter | None, ...]] = [()]
+        for members, required in self.groups:
+            options: list[_Parameter | None] = list(members)
+            if not required:
+                options.append(None)
+            combinations = [
+                (*combo, option) for combo in combinations for option in options
+            ]
+        self.runtime_groups = len(combinations) > _MAX_PARAMETER_SETS
+        if self.runtime_groups:
+            combinations = [()]
+
+        self.sets: list[str] = []
+        # Names of the sets each grouped parameter belongs to, by id()
+        self.member_sets: dict[int, list[str]] = {}
+        default_set: str | None = None
+        for combo in combinations:
+            chosen = [p for p in combo if p is not None]
+            name = "_".join(p.name for p in chosen) or "Run"
+            self.sets.append(name)
+            for p in chosen:
+                self.member_sets.setdefault(id(p), []).append(name)
+            if not chosen:
+                default_set = name
+        self.default_set = default_set or self.sets[0]
+
+        if self.advanced:
+            for parameter in parameters:
+                name = parameter.name
+                if name.lower() in _COMMON_PARAMETERS and not self.is_common_switch(
+                    parameter
+                ):
+                    raise ValueError(
+                        f"Error: argument '{parameter.argument.dest}' maps to -{name}, which "
+                        f"clashes with a PowerShell common parameter.\n"
+                        f"\n"
+                        f"  Required arguments, mutually exclusive groups, subcommands and\n"
+                        f"  pipeline input make the wrapper an advanced script, which\n"
+                        f"  reserves common parameters.\n"
+                        f"\n"
+                        f"Possible solutions:\n"
+                        f"  1. Rename the argument's dest\n"
+                        f"  2. Exclude it with skip_dests"
+                        + (
+                            "\n  3. Disable validate_arguments"
+                            if self.uses_sets
+                            else ""
+                        )
+                    )
+
+    def is_common_switch(self, parameter: _Parameter) -> bool:
+        return self.advanced and self._is_common_switch_name(parameter)
+
+    @staticmethod
+    def _is_common_switch_name(parameter: _Parameter) -> bool:
+        return parameter.argument.is_switch and parameter.name in ("Verbose", "Debug")
+
+    def attributes(self, parameter: _Parameter) -> list[str]:
+        attributes: list[str] = []
+        if not self.checks:
+            return attributes
+        action = parameter.argument
+        if self.advanced:
+            grouped_required = self.grouped.get(id(parameter))
+            if grouped_required is not None and not self.runtime_groups:
+                mandatory = ", Mandatory" if grouped_required else ""
+                attributes += [
+                    f'[Parameter(ParameterSetName = "{name}"{mandatory})]'
+                    for name in self.member_sets.get(id(parameter), ())
+                ]
+            elif id(parameter) in self.mandatory:
+                attributes += [
+                    f'[Parameter(Mandatory, ParameterSetName = "{name}")]'
+                    for name in self.sets
+                ]
+
+        value_range = _choices_range(action)
+        if value_range is not None:
+            attributes.append(f"[ValidateRange({value_range[0]}, {value_range[1]})]")
+
+        value_count = _nargs_count(action)
+        if value_count is not None:
+            attributes.append(f"[ValidateCount({value_count[0]}, {value_count[1]})]")
+
+        if action.type == "file" and "r" in (action.file_mode or ""):
+            attributes.append(
+                "[ValidateScript({ $_ -eq '-' -or (Test-Path -LiteralPath $_ -PathType Leaf) })]"
+            )
+        return attributes
+
+    def validate_set(self, action: ArgumentSpec) -> str | None:
+        if self.checks and _choices_range(action) is not None:
+            return None
+        return _render_validate_set(action)
+
+    def render_runtime_checks(self, function_mode: bool = False) -> str:
+        """Checks for groups too large to express as parameter sets."""
+        if not self.runtime_groups:
+            return ""
+        fail = _render_exit(2, function_mode)
+        lines = ["# Check mutually exclusive arguments"]
+        for members, required in self.groups:
+            names = ", ".join(f'"{p.name}"' for p in members)
+            options = "/".join(
+                (
+                    p.argument.option_strings[0]
+                    if p.argument.option_strings
+                    else p.argument.dest
+                )
+                for p in members
+            )
+            count = f"@($PSBoundParameters.Keys | Where-Object {{ $_ -in @({names}) }}).Count"
+            lines.append(
+                f'if ({count} -gt 1) {{ Write-Error "Only one of {options} may be given"; {fail} }}'
+            )
+            if required:
+                lines.append(
+                    f'if (-not $Help -and {count} -eq 0) {{ Write-Error "One of {options} is required"; {fail} }}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _choices_range(action: ArgumentSpec) -> tuple[int, int] | None:
+    """Return ``(min, max)`` when ``choices`` is a contiguous integer range."""
+    choices = action.choices
+    if isinstance(choices, range) and choices.step == 1 and len(choices) > 0:
+        return choices.start, choices.stop - 1
+    return None
+
+
+class _Subcommands:
+    """Per-subcommand arguments of an ``add_subparsers()`` action.
+
+    The subcommand itself is a static parameter (``-Command`` unless the
+    action has a ``dest``). Each subcommand's arguments are declared in a
+    ``DynamicParam`` block that only runs the branch of the given subcommand,
+    so parsing and binding cost stays flat as subcommands are added. The
+    dynamic parameters form a parameter set named after their subcommand,
+    unless the static parameters already use parameter sets for validation.
+    """
+
+    def __init__(
+        self,
+        parameter: _Parameter,
+        *,
+        skip: set[str],
+        static_names: set[str],
+        position: int,
+        validation: _ParameterValidation,
+    ) -> None:
+        self.name = parameter.name
+        self.position = position
+        self.checks = validation.checks
+        self.parameter_sets = not validation.uses_sets
+
+        reserved = {name.lower() for name in static_names} | _COMMON_PARAMETERS
+        self.commands: list[tuple[Sequence[str], list[_Parameter]]] = []
+        for subcommand in parameter.argument.subcommands:
+            names = subcommand.names
+            parameters = _parameters(subcommand.arguments, skip)
+            for sub_parameter in parameters:
+                self._check_parameter(names[0], sub_parameter, reserved)
+            self.commands.append((names, parameters))
+
+    @staticmethod
+    def _check_parameter(
+        command: str, parameter: _Parameter, reserved: set[str]
+    ) -> None:
+        action = parameter.argument
+        if action.action == "parsers":
+            raise ValueError(
+                f"Error: subcommand '{command}' has its own subcommands.\n"
+                f"\n"
+                f"  Only one level of subcommands is supported.\n"
+                f"\n"
+                f"Possible solutions:\n"
+                f"  1. Generate a separate wrapper for the nested parser\n"
+                f"  2. Exclude the nested subcommands with skip_dests"
+            )
+        name = parameter.name
+        if name.lower() not in reserved or _ParameterValidation._is_common_switch_name(
+            parameter
+        ):
+            return
+        raise ValueError(
+            f"Error: argument '{action.dest}' of subcommand '{command}' maps to "
+            f"-{name}, which clashes with a wrapper or common parameter.\n"
+            f"\n"
+            f"  Subcommand arguments share PowerShell's parameter names with the\n"
+            f"  top-level arguments, -Help and the common parameters.\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Rename the argument's dest\n"
+            f"  2. Exclude it with skip_dests"
+        )
+
+    def _case_label(self, names: Sequence[str]) -> str:
+        if len(names) == 1:
+            return f'"{names[0]}"'
+        return "{ $_ -cin " + ", ".join(f'"{name}"' for name in names) + " }"
+
+    def render_dynamic_param(self) -> str:
+        """Render the ``DynamicParam`` block declaring the subcommand's arguments."""
+        lines = [
+            "DynamicParam {",
+            "    $Parameters = [System.Management.Automation.RuntimeDefinedParameterDictionary]::new()",
+            "    # -Help must not prompt for mandatory arguments",
+            '    $HelpRequested = $PSBoundParameters.ContainsKey("Help")',
+            "    function Add-DynamicParameter {",
+            "        param([string]$Name, [type]$Type, [string]$SetName, [int]$Position = -1, [string[]]$ValidValues, [switch]$Mandatory)",
+            "        $Attribute = [System.Management.Automation.ParameterAttribute]::new()",
+            "        if ($SetName) { $Attribute.ParameterSetName = $SetName }",
+            "        if ($Position -ge 0) { $Attribute.Position = $Position }",
+            "        $Attribute.Mandatory = $Mandatory.IsPresent -and -not $HelpRequested",
+            "        $Attributes = [System.Collections.ObjectModel.Collection[System.Attribute]]::new()",
+            "        $Attributes.Add($Attribute)",
+            "        if ($ValidValues) { $Attributes.Add([System.Management.Automation.ValidateSetAttribute]::new($ValidValues)) }",
+            "        $Parameters.Add($Name, [System.Management.Automation.RuntimeDefinedParameter]::new($Name, $Type, $Attributes))",
+            "    }",
+            "",
+            "    # Only the given subcommand's arguments are declared",
+            f'    switch -CaseSensitive ($PSBoundParameters["{self.name}"]) {{',
+        ]
+        for names, parameters in self.commands:
+            lines.append(f"        {self._case_label(names)} {{")
+            position = self.position + 1
+            for parameter in parameters:
+                if _ParameterValidation._is_common_switch_name(parameter):
+                    # Bound through the common parameter of the same name
+                    continue
+                action = parameter.argument
+                call = (
+                    f'Add-DynamicParameter "{parameter.name}" ([{parameter.type_hint}])'
+                )
+                if self.parameter_sets:
+                    call += f' -SetName "{names[0]}"'
+                if parameter.option is None:
+                    call += f" -Position {position}"
+                    position += 1
+                if action.choices:
+                    call += " -ValidValues " + ", ".join(
+                        _ps_single_quoted_string(str(choice))
+                        for choice in action.choices
+                    )
+                if self.checks and action.required and not action.is_switch:
+                    call += " -Mandatory"
+                lines.append(f"            {call}")
+            lines.append("        }")
+        lines += ["    }", "    $Parameters", "}", ""]
+        return "\n".join(lines)
+
+    def render_conversion(self) -> str:
+        """Render the arguments for the subcommand and its bound parameters."""
+        lines = [
+            f"if (${self.name}) {{",
+            f"    $Arguments += ${self.name}",
+            f"    switch -CaseSensitive (${self.name}) {{",
+        ]
+        for names, parameters in self.commands:
+            lines.append(f"        {self._case_label(names)} {{")
+            for parameter in parameters:
+                name = parameter.name
+                option = parameter.option
+                value = f'$PSBoundParameters["{name}"]'
+                bound = f'$PSBoundParameters.ContainsKey("{name}")'
+                if option is None:
+                    statement = f"if ({bound}) {{ $Arguments += {value} }}"
+                elif parameter.argument.is_switch:
+                    statement = f'if ({value}) {{ $Arguments += "{option}" }}'
+                else:
+                    statement = f"if ({bound}) {{ {_render_option_assignment(parameter, value)} }}"
+                lines.append(f"            {statement}")
+            lines.append("        }")
+        lines += ["    }", "}"]
+        return "\n".join(lines)
 
 
 def _render_unknown_args_check(
@@ -295,9 +1940,56 @@ def _render_unknown_args_check(
     use_project_mode: bool,
     command_name: str | None = None,
     script_path: Path | None = None,
+    *,
+    embedded_help: str | None = None,
+    validation: _ParameterValidation | None = None,
+    function_mode: bool = False,
+    subcommand: str | None = None,
+    console_script: bool = False,
 ) -> str:
-    """Render unknown arguments check and help handling."""
-    if use_project_mode:
+    """Render unknown arguments check and help handling.
+
+    ``embedded_help`` (from :func:`_render_embedded_help`) replaces the call
+    to ``<runner> ... --help`` so that ``-Help`` never starts Python.
+    Advanced scripts (see :class:`_ParameterValidation`) reject unknown
+    parameters during binding, so they get no ``$args`` check.
+    ``function_mode`` renders the variant used inside module functions.
+    ``subcommand`` names the subcommand parameter, whose value is passed
+    before ``--help`` so that ``<tool> <subcommand> -Help`` shows its help.
+    """
+    if function_mode:
+        unknown_check = f"""
+# Check for unknown parameters
+if ({_MODULE_UNKNOWN_ARGS_HELPER} $args) {{ $Help = $true }}
+"""
+    else:
+        unknown_check = """
+# Check for unknown parameters
+if ($args.Count -gt 0) {
+    Write-Error "Unknown parameter(s): $($args -join ', ')"
+    $Help = $true
+}
+"""
+    runtime_checks = ""
+    if validation is not None:
+        if validation.advanced:
+            unknown_check = ""
+        runtime_checks = validation.render_runtime_checks(function_mode)
+    help_exit = _render_exit(0, function_mode)
+
+    if embedded_help is not None:
+        return f"""{unknown_check}
+# Display help (embedded at generation time)
+if ($Help) {{
+    [Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+{embedded_help}
+    {help_exit}
+}}
+{runtime_checks}"""
+
+    if console_script:
+        help_command = '$HelpArgs = @("--help")'
+    elif use_project_mode:
         if command_name is None:
             raise RuntimeError("Internal error: command_name is None in project mode")
         help_command = f'$HelpArgs = @("run", "--project", $ProjectRoot, "{command_name}", "--help")'
@@ -308,111 +2000,462 @@ def _render_unknown_args_check(
             help_command = '$HelpArgs = @("run", $ScriptPath, "--help")'
         else:
             help_command = '$HelpArgs = @($ScriptPath, "--help")'
+    if subcommand is not None:
+        help_command = "\n    ".join(
+            [
+                help_command.replace(', "--help")', ")").replace('@("--help")', "@()"),
+                f"if (${subcommand}) {{ $HelpArgs += ${subcommand} }}",
+                '$HelpArgs += "--help"',
+            ]
+        )
+    help_launch = (
+        f'{_MODULE_INVOKE_HELPER} "{runner}" $HelpArgs'
+        if function_mode
+        else f'& "{runner}" @HelpArgs'
+    )
 
-    return f"""
-# Check for unknown parameters
-if ($args.Count -gt 0) {{
-    Write-Error "Unknown parameter(s): $($args -join ', ')"
-    $Help = $true
-}}
-
+    return f"""{unknown_check}
 # Display help
 if ($Help) {{
     {help_command}
-    & "{runner}" @HelpArgs
-    exit 0
+    {help_launch}
+    {help_exit}
 }}
-"""
+{runtime_checks}"""
+
+
+def _render_embedded_help(help_text: str, compress: bool) -> str:
+    """Render PowerShell statements that print ``help_text`` without Python.
+
+    Plain text is embedded as a single-quoted here-string; ``compress`` (or
+    text that would terminate the here-string early) stores it as base64
+    encoded gzip instead.
+    """
+    help_text = help_text.rstrip("\n")
+    lines = help_text.split("\n")
+    if not compress and not any(line.startswith("'@") for line in lines):
+        return "\n".join(["    Write-Output @'", *lines, "'@"])
+
+    # mtime=0 keeps the output byte-identical across regenerations
+    encoded = base64.b64encode(
+        gzip.compress(help_text.encode("utf-8"), mtime=0)
+    ).decode("ascii")
+    return "\n".join(
+        [
+            f"    $HelpData = [Convert]::FromBase64String('{encoded}')",
+            "    $HelpStream = New-Object System.IO.Compression.GZipStream((New-Object System.IO.MemoryStream(, $HelpData)), [System.IO.Compression.CompressionMode]::Decompress)",
+            "    $HelpReader = New-Object System.IO.StreamReader($HelpStream, [System.Text.Encoding]::UTF8)",
+            "    Write-Output $HelpReader.ReadToEnd()",
+            "    $HelpReader.Dispose()",
+        ]
+    )
+
 
+def _render_comment_help(spec: WrapperSpec, parameters: Sequence[_Parameter]) -> str:
+    """Render a comment-based help block (``.SYNOPSIS``/``.PARAMETER``) for Get-Help."""
 
-def _render_param_line(action: argparse.Action) -> str:
-    name = _to_pascal_case(action.dest)
-    type_hint, default_literal = _determine_param_type_and_default(action)
+    def clean(text: str) -> str:
+        # "#>" would close the comment block early
+        return text.replace("#>", "# >").strip()
 
+    description = clean(spec.description or "")
+    synopsis = description.split("\n\n", 1)[0].replace("\n", " ") or spec.prog
+    lines = ["<#", ".SYNOPSIS", f"    {synopsis}"]
+    if description:
+        lines += [
+            ".DESCRIPTION",
+            *(f"    {line}".rstrip() for line in description.split("\n")),
+        ]
+
+    lines += [".PARAMETER Help", "    Show help for this command."]
+    for parameter in parameters:
+        action = parameter.argument
+        if action.help is None:
+            continue
+        help_text = action.help
+        if not help_text and action.action == "parsers":
+            help_text = "Subcommand: " + ", ".join(action.choices or ())
+        lines.append(f".PARAMETER {parameter.name}")
+        if help_text:
+            lines.append(f"    {clean(help_text)}")
+
+    if spec.epilog:
+        lines += [
+            ".NOTES",
+            *(f"    {line}".rstrip() for line in clean(spec.epilog).split("\n")),
+        ]
+    lines += ["#>", ""]
+    return "\n".join(lines)
+
+
+def _render_param_line(
+    parameter: _Parameter,
+    validation: _ParameterValidation | None = None,
+    position: int | None = None,
+    completer: str | None = None,
+    *,
+    pipeline: bool = False,
+) -> str:
     parts: list[str] = []
 
-    validate_set = _render_validate_set(action)
+    if validation is None:
+        validate_set = _render_validate_set(parameter.argument)
+    else:
+        parts += validation.attributes(parameter)
+        validate_set = validation.validate_set(parameter.argument)
+    named = [
+        *([f"Position = {position}"] if position is not None else []),
+        *(["ValueFromPipeline"] if pipeline else []),
+    ]
+    if named:
+        # Every [Parameter()] attribute (one per parameter set) needs them
+        arguments = ", ".join(named)
+        declared = [part for part in parts if part.startswith("[Parameter(")]
+        parts = [
+            part.replace("[Parameter(", f"[Parameter({arguments}, ", 1)
+            for part in parts
+        ]
+        if not declared:
+            parts.insert(0, f"[Parameter({arguments})]")
     if validate_set:
         parts.append(validate_set)
+    if completer:
+        parts.append(completer)
 
-    parts.append(f"[{type_hint}]${name}")
-
-    if default_literal is not None:
-        parts[-1] += f" = {default_literal}"
+    declaration = f"[{parameter.type_hint}]${parameter.name}"
+    if parameter.default_literal is not None:
+        declaration += f" = {parameter.default_literal}"
+    parts.append(declaration)
 
     return "\n    ".join(parts)
 
 
 def _determine_param_type_and_default(
-    action: argparse.Action,
+    action: ArgumentSpec,
 ) -> tuple[str, str | None]:
-    # Check if action is a boolean flag by examining the action attribute
-    # Note: action.action is not a string, it's the action class itself
-    action_class = action.__class__.__name__
-    if action_class in ("_StoreTrueAction", "_StoreFalseAction"):
+    if action.is_switch:
         return "switch", None
 
-    python_type = action.type
-
-    if python_type is int:
+    if action.type == "int":
         ps_type = "int"
-    elif python_type is float:
+    elif action.type == "float":
         ps_type = "double"
-    elif python_type is Path:
-        ps_type = "string"
     else:
         ps_type = "string"
+    if _collects_list(action):
+        ps_type += "[]"
 
-    if action.default in (None, argparse.SUPPRESS):
+    if action.default is None or action.default == []:
         return ps_type, None
+    return ps_type, _ps_default_literal(action.default)
 
-    if isinstance(action.default, bool):
-        default_literal = "$true" if action.default else "$false"
-    elif isinstance(action.default, (str, Path)):
-        default_literal = _ps_single_quoted_string(str(action.default))
-    else:
-        default_literal = str(action.default)
 
-    return ps_type, default_literal
+# nargs values for which argparse collects a list
+_LIST_NARGS = frozenset(
+    {argparse.ONE_OR_MORE, argparse.ZERO_OR_MORE, argparse.REMAINDER}
+)
+
 
+def _collects_list(action: ArgumentSpec) -> bool:
+    """Whether ``action`` takes a flat list of values, i.e. maps to an array.
 
-def _render_validate_set(action: argparse.Action) -> str | None:
+    ``append`` with its own ``nargs`` collects a list of lists, which a flat
+    PowerShell array cannot express, so it stays a scalar.
+    """
+    if action.action == "append":
+        return action.nargs in (None, argparse.OPTIONAL)
+    return (
+        action.action == "extend"
+        or action.nargs in _LIST_NARGS
+        or (isinstance(action.nargs, int) and action.nargs > 0)
+    )
+
+
+def _nargs_count(action: ArgumentSpec) -> tuple[int, int | str] | None:
+    """Bounds of the number of values ``nargs`` requires of an array parameter.
+
+    Each ``append``/``extend`` occurrence takes its own ``nargs`` values,
+    which a count over the whole array cannot check except for the minimum.
+    """
+    if not _collects_list(action):
+        return None
+    if action.nargs == argparse.ONE_OR_MORE:
+        return 1, "[int]::MaxValue"
+    if isinstance(action.nargs, int) and action.action == "store":
+        return action.nargs, action.nargs
+    return None
+
+
+def _ps_default_literal(value: Any) -> str:
+    """Render a spec default (see :attr:`ArgumentSpec.default`) as a literal."""
+    if isinstance(value, bool):
+        return "$true" if value else "$false"
+    if isinstance(value, str):
+        return _ps_single_quoted_string(value)
+    if isinstance(value, list | tuple):
+        return f"@({', '.join(_ps_default_literal(item) for item in value)})"
+    return str(value)
+
+
+# Integer ranges up to this size (rendered as ValidateRange by validation)
+# get a completion table; larger ones are left to the user.
+_MAX_RANGE_COMPLETIONS = 1000
+
+
+def _render_argument_completers(
+    parameters: Sequence[_Parameter],
+    hints: Mapping[str, CompletionHint] | None,
+    validation: _ParameterValidation | None,
+    launch: _CompletionLaunch,
+) -> dict[str, str]:
+    """Render ``[ArgumentCompleter()]`` attributes, keyed by action dest.
+
+    Completion tables are computed here and embedded as literals, so tab
+    completion never starts Python. ``hints`` provides values per dest (file
+    globs for path arguments); integer range choices rendered as
+    ``ValidateRange`` get their values listed, as they lose the completion
+    ``ValidateSet`` provides. The attribute is evaluated when the parameter
+    is completed, which, unlike ``Register-ArgumentCompleter``, also works for
+    a script that has not been run.
+
+    Values only known at runtime come from a completion callable, given as a
+    hint or as the action's ``completer`` attribute (see
+    :func:`_render_dynamic_completer`).
+    """
+    by_dest = {p.argument.dest: p for p in parameters}
+    unknown = sorted(set(hints or {}) - set(by_dest))
+    if unknown:
+        raise ValueError(
+            f"Error: completion_hints refers to unknown argument(s): {', '.join(unknown)}\n"
+            f"\n"
+            f"  Keys must be argument dests, e.g. 'output_dir' for --output-dir.\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Use the dest of an argument that is part of the wrapper\n"
+            f"  2. Remove the hint"
+        )
+
+    completers: dict[str, str] = {}
+    for dest, parameter in by_dest.items():
+        action = parameter.argument
+        if action.is_switch:
+            continue
+        hint = hints.get(dest) if hints else None
+        if callable(hint):
+            hint = callable_reference(hint)
+        elif hint is None:
+            hint = action.completer
+        if isinstance(hint, str):
+            completers[dest] = _render_dynamic_completer(parameter, hint, launch)
+            continue
+        if hint is not None:
+            values = [str(value) for value in hint]
+            if action.type in ("path", "file"):
+                completers[dest] = _render_glob_completer(values)
+            else:
+                completers[dest] = _render_value_completer(values)
+            continue
+        value_range = _choices_range(action)
+        if (
+            validation is not None
+            and validation.checks
+            and value_range is not None
+            and value_range[1] - value_range[0] < _MAX_RANGE_COMPLETIONS
+        ):
+            completers[dest] = _render_value_completer(
+                [str(value) for value in range(value_range[0], value_range[1] + 1)]
+            )
+    return completers
+
+
+@dataclass(frozen=True)
+class _CompletionLaunch:
+    """How a dynamic completer locates the command and starts Python."""
+
+    command: str
+    location: str
+    # None when the wrapper has no Python to call (console_script mode)
+    python: str | None
+    script_mode: bool
+    ttl: float
+    cache_size: int
+
+
+def _render_dynamic_completer(
+    parameter: _Parameter,
+    reference: str,
+    launch: _CompletionLaunch,
+) -> str:
+    """Render a completer that serves a callable's results from a disk cache.
+
+    ``reference`` names the callable as ``"module:qualname"`` (see
+    :func:`argparse_ps1.spec.callable_reference`).
+
+    The cache file for (command, parameter, callable, prefix) is named after
+    its SHA256, as computed by :func:`argparse_ps1.complete.cache_key`. While
+    it is younger than the TTL and than the callable's source file (recorded
+    in the entry), the completer reads it directly; otherwise it runs
+    ``python -m argparse_ps1.complete``, which calls the callable, rewrites
+    the file and evicts the oldest entries beyond the cache size.
+    """
+    module, _, qualname = reference.partition(":")
+    if not module or not qualname or "<" in qualname:
+        raise ValueError(
+            f"Error: completion callable for '{parameter.argument.dest}' cannot be imported.\n"
+            f"\n"
+            f"  Callable: {reference}\n"
+            f"  The wrapper calls it in a new Python process, so it must be a\n"
+            f"  module-level function.\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Define the completer as a module-level function\n"
+            f"  2. Pass a list of values in completion_hints instead"
+        )
+    if module == "__main__":
+        raise ValueError(
+            f"Error: completion callable for '{parameter.argument.dest}' is defined in __main__.\n"
+            f"\n"
+            f"  Callable: {qualname}\n"
+            f"  The wrapper imports the callable's module at completion time;\n"
+            f"  loading it from the script would run the whole script.\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Move the completer into a module next to the script or in the project\n"
+            f"  2. Pass a list of values in completion_hints instead"
+        )
+    spec = _ps_single_quoted_string(f"{module}:{qualname}")
+
+    if launch.python is None:
+        raise ValueError(
+            f"Error: completion callable for '{parameter.argument.dest}' needs Python.\n"
+            f"\n"
+            f"  Callable: {reference}\n"
+            f"  A console_script wrapper only runs the installed command, so it\n"
+            f"  cannot call Python at completion time.\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Pass a list of values in completion_hints instead\n"
+            f"  2. Generate the wrapper in script or project mode"
+        )
+
+    name = _ps_single_quoted_string(parameter.name)
+    command = _ps_single_quoted_string(launch.command)
+    # A module next to the wrapped script is importable, as it is for the script
+    search_path = (
+        " --path (Split-Path -Parent $ScriptPath)" if launch.script_mode else ""
+    )
+    lines = [
+        "[ArgumentCompleter({",
+        "param($CommandName, $ParameterName, $WordToComplete)",
+        "$Word = $WordToComplete.Trim(\"'\", '\"')",
+        '$CacheRoot = if ($env:LOCALAPPDATA) { $env:LOCALAPPDATA } elseif ($env:XDG_CACHE_HOME) { $env:XDG_CACHE_HOME } else { Join-Path $HOME ".cache" }',
+        '$CacheDir = Join-Path $CacheRoot "argparse-ps1" | Join-Path -ChildPath "completions"',
+        "$ScriptDir = $PSScriptRoot",
+        launch.location,
+        f"$Spec = {spec}",
+        f'$Key = [System.Text.Encoding]::UTF8.GetBytes({command} + "`0" + {name} + "`0" + $Spec + "`0" + $Word)',
+        '$Hash = -join ([System.Security.Cryptography.SHA256]::Create().ComputeHash($Key) | ForEach-Object { $_.ToString("x2") })',
+        '$CacheFile = Join-Path $CacheDir "$Hash.json"',
+        "$Cached = Get-Item -LiteralPath $CacheFile -ErrorAction SilentlyContinue",
+        "$Entry = $null",
+        f"if ($Cached -and ([DateTime]::UtcNow - $Cached.LastWriteTimeUtc).TotalSeconds -lt {launch.ttl:g}) {{",
+        "    $Entry = Get-Content -LiteralPath $CacheFile -Raw -Encoding UTF8 | ConvertFrom-Json",
+        "    if ($Entry.source) {",
+        "        # Stale once the file defining the callable has been modified",
+        "        $Source = Get-Item -LiteralPath $Entry.source -ErrorAction SilentlyContinue",
+        "        if (-not $Source -or $Source.LastWriteTimeUtc -ge $Cached.LastWriteTimeUtc) { $Entry = $null }",
+        "    }",
+        "}",
+        "if (-not $Entry) {",
+        "    # Missing or expired: run the completion callable through Python",
+        f'    & {launch.python} -m argparse_ps1.complete $Spec "--prefix=$Word"{search_path} --command {command} --parameter {name} --cache-dir $CacheDir --ttl {launch.ttl:g} --max-entries {launch.cache_size} 2>$null | Out-Null',
+        "    if (Test-Path -LiteralPath $CacheFile) {",
+        "        $Entry = Get-Content -LiteralPath $CacheFile -Raw -Encoding UTF8 | ConvertFrom-Json",
+        "    }",
+        "}",
+        "if ($Entry) {",
+        "    $Entry.values |",
+        "        ForEach-Object { if ($_ -match '\\s') { \"'$($_ -replace \"'\", \"''\")'\" } else { $_ } }",
+        "}",
+    ]
+    return "\n        ".join(lines) + "\n    })]"
+
+
+def _render_value_completer(values: Sequence[str]) -> str:
+    table = ", ".join(_ps_single_quoted_string(value) for value in values)
+    lines = [
+        "[ArgumentCompleter({",
+        "param($CommandName, $ParameterName, $WordToComplete)",
+        f"@({table}) |",
+        "    Where-Object { $_.StartsWith($WordToComplete, [System.StringComparison]::OrdinalIgnoreCase) } |",
+        "    ForEach-Object { if ($_ -match '\\s') { \"'$($_ -replace \"'\", \"''\")'\" } else { $_ } }",
+    ]
+    return "\n        ".join(lines) + "\n    })]"
+
+
+def _render_glob_completer(patterns: Sequence[str]) -> str:
+    table = ", ".join(_ps_single_quoted_string(pattern) for pattern in patterns)
+    lines = [
+        "[ArgumentCompleter({",
+        "param($CommandName, $ParameterName, $WordToComplete)",
+        f"$Patterns = @({table})",
+        "$Word = $WordToComplete.Trim(\"'\", '\"')",
+        "# Directories are offered so that completion can descend into them",
+        'Get-ChildItem -Path "$Word*" -ErrorAction SilentlyContinue |',
+        "    Where-Object { $Name = $_.Name; $_.PSIsContainer -or ($Patterns | Where-Object { $Name -like $_ }) } |",
+        "    ForEach-Object { $Path = Resolve-Path -LiteralPath $_.FullName -Relative; if ($Path -match '\\s') { \"'$Path'\" } else { $Path } }",
+    ]
+    return "\n        ".join(lines) + "\n    })]"
+
+
+def _render_validate_set(action: ArgumentSpec) -> str | None:
     choices = getattr(action, "choices", None)
     if not choices:
         return None
     joined = '", "'.join(str(choice) for choice in choices)
+    if action.action == "parsers":
+        # Subcommands select their DynamicParam branch case-sensitively
+        return f'[ValidateSet("{joined}", IgnoreCase = $false)]'
     return f'[ValidateSet("{joined}")]'
 
 
-def _render_argument_conversion(actions: Sequence[argparse.Action]) -> str:
-    lines: list[str] = []
+def _render_conversion_line(parameter: _Parameter, common_switch: bool) -> str:
+    """Render the statement that appends ``parameter`` to ``$Arguments``."""
+    variable = f"${parameter.name}"
+    if common_switch:
+        variable = f'$PSBoundParameters["{parameter.name}"]'
 
-    for action in actions:
-        name = _to_pascal_case(action.dest)
-        variable = f"${name}"
+    option = parameter.option
+    if option is None:
+        # Positional arguments: Add as-is (no absolute path conversion)
+        if parameter.is_array:
+            # An unbound array is $null, which must not become an argument
+            return f"if ({_build_assignment_condition(parameter)}) {{ $Arguments += {variable} }}"
+        return f"$Arguments += {variable}"
 
-        if not action.option_strings:
-            # Positional arguments: Add as-is (no absolute path conversion)
-            lines.append(f"$Arguments += {variable}")
-            continue
+    if parameter.argument.is_switch:
+        return f'if ({variable}) {{ $Arguments += "{option}" }}'
 
-        option = _select_option_string(action.option_strings)
+    condition = _build_assignment_condition(parameter)
+    return f"if ({condition}) {{ {_render_option_assignment(parameter, variable)} }}"
 
-        # Check if action is a boolean flag by examining the action class
-        action_class = action.__class__.__name__
-        if action_class in ("_StoreTrueAction", "_StoreFalseAction"):
-            lines.append(f'if ({variable}) {{ $Arguments += "{option}" }}')
-            continue
 
-        condition = _build_assignment_condition(action, name)
-        # Optional arguments: Convert Path type to absolute path
-        if action.type is Path:
-            assignment = f'$Arguments += "{option}", (Resolve-Path {variable}).Path'
-        else:
-            assignment = f'$Arguments += "{option}", {variable}'
-        lines.append(f"if ({condition}) {{ {assignment} }}")
+def _render_option_assignment(parameter: _Parameter, value: str) -> str:
+    """Render the statement adding ``parameter``'s option and ``value``.
 
-    return "\n".join(lines)
+    Path values are made absolute; an array is resolved in one
+    ``Resolve-Path`` call and added in one concatenation, so the cost does not
+    grow with a statement per element.
+    """
+    # Optional arguments: Convert Path type to absolute path
+    if parameter.argument.type == "path":
+        value = f"(Resolve-Path {value}).Path"
+    if not parameter.is_array:
+        return f'$Arguments += "{parameter.option}", {value}'
+    if parameter.argument.nargs in (None, argparse.OPTIONAL):
+        # append/extend without nargs take one value per occurrence of the option
+        return f'$Arguments += foreach ($Value in {value}) {{ "{parameter.option}", $Value }}'
+    return f'$Arguments += @("{parameter.option}") + {value}'
 
 
 def _select_option_string(option_strings: Sequence[str]) -> str:
@@ -422,27 +2465,32 @@ def _select_option_string(option_strings: Sequence[str]) -> str:
     return option_strings[0]
 
 
-def _build_assignment_condition(action: argparse.Action, name: str) -> str:
-    variable = f"${name}"
-    python_type = action.type
+def _build_assignment_condition(parameter: _Parameter) -> str:
+    variable = f"${parameter.name}"
 
-    if action.default in (None, argparse.SUPPRESS):
+    if parameter.is_array:
+        # Arrays are compared by reference, and a given empty list still means
+        # the option was used
+        return f'$PSBoundParameters.ContainsKey("{parameter.name}")'
+    if parameter.default_literal is None:
         # When default is None
-        if python_type is int or python_type is float:
-            # Numeric type: $null check
-            return f"$null -ne {variable}"
+        if parameter.argument.type in ("int", "float"):
+            # Numeric type: [int]/[double] parameters default to 0, so check
+            # whether the parameter was actually given
+            return f'$PSBoundParameters.ContainsKey("{parameter.name}")'
         else:
             # String type: also check for empty string
             return f"-not [string]::IsNullOrEmpty({variable})"
 
-    if isinstance(action.default, bool):
-        default_literal = "$true" if action.default else "$false"
-    elif isinstance(action.default, (str, Path)):
-        default_literal = _ps_single_quoted_string(str(action.default))
-    else:
-        default_literal = str(action.default)
+    return f"{variable} -ne {parameter.default_literal}"
+
 
-    return f"{variable} -ne {default_literal}"
+def _action_name(action: ArgumentSpec) -> str:
+    """Return the PowerShell parameter name for ``action``."""
+    if action.dest == argparse.SUPPRESS:
+        # add_subparsers() without dest
+        return "Command"
+    return _to_pascal_case(action.dest)
 
 
 def _to_pascal_case(source: str) -> str:
@@ -470,6 +2518,31 @@ def _to_powershell_filename(source: str) -> str:
     return "-".join(capitalized_parts)
 
 
+# Start of a PEP 723 inline script metadata block
+_INLINE_METADATA = re.compile(r"^# /// script\s*$", re.MULTILINE)
+
+
+def _uv_script_python(runner: str, script_path: Path) -> str:
+    """Return the ``uv run`` command starting Python like ``uv run <script>``.
+
+    A script with inline metadata (PEP 723) runs with its declared
+    dependencies, which ``--with-requirements`` installs from the script;
+    otherwise uv uses the project environment or the default interpreter.
+    """
+    if _has_inline_metadata(script_path):
+        return f'"{runner}" run --with-requirements $ScriptPath python'
+    return f'"{runner}" run python'
+
+
+def _has_inline_metadata(script_path: Path) -> bool:
+    """Check whether ``script_path`` declares PEP 723 inline script metadata."""
+    try:
+        source = script_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return False
+    return _INLINE_METADATA.search(source) is not None
+
+
 def _calculate_script_relative_path(script_path: Path, output_path: Path) -> str:
     """Calculate PowerShell Join-Path command for relative script location.
 
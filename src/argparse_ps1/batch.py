@@ -0,0 +1,195 @@
+"""Generate many PowerShell wrappers in one call.
+
+:func:`generate_ps1_wrappers` shares pyproject.toml discovery and
+``[project.scripts]`` validation across all jobs, then renders and writes the
+wrappers on a thread pool. Every job gets its own :class:`WrapperResult`, so a
+failing job never prevents the others from being generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .argparse_ps1 import (
+    _RENDER_OPTION_DEFAULTS,
+    _render_wrapper,
+    _resolve_output_path,
+    _resolve_project_root,
+    _write_wrapper,
+)
+from .manifest import WrapperManifest, fingerprint_wrapper
+from .spec import WrapperSpec, extract_spec
+
+_OPTION_NAMES = frozenset(
+    {"output_path", "output_dir", "skip_dests", "runner", "command_name", "lock_file"}
+) | frozenset(_RENDER_OPTION_DEFAULTS)
+
+
+@dataclass(frozen=True)
+class WrapperJob:
+    """One wrapper to generate.
+
+    Attributes:
+        parser: ArgumentParser instance (or :class:`~argparse_ps1.spec.WrapperSpec`)
+                to generate wrapper for
+        script_path: Path to the Python script (absolute)
+        options: Keyword arguments accepted by ``generate_ps1_wrapper``
+                 (``output_path``, ``output_dir``, ``skip_dests``, ``runner``,
+                 ``command_name``, ``lock_file`` and the rendering options)
+    """
+
+    parser: argparse.ArgumentParser | WrapperSpec
+    script_path: Path
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class WrapperResult:
+    """Outcome of one :class:`WrapperJob`.
+
+    Exactly one of ``output_path`` and ``error`` is set. ``skipped`` is true
+    when the wrapper was left untouched, either because the manifest showed
+    its inputs were unchanged or because the rendered content was identical.
+    """
+
+    job: WrapperJob
+    output_path: Path | None = None
+    error: Exception | None = None
+    skipped: bool = False
+    fingerprint: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+JobLike = (
+    WrapperJob
+    | tuple[argparse.ArgumentParser | WrapperSpec, Path]
+    | tuple[argparse.ArgumentParser | WrapperSpec, Path, Mapping[str, Any]]
+)
+
+
+def generate_ps1_wrappers(
+    jobs: Iterable[JobLike],
+    *,
+    max_workers: int | None = None,
+    manifest_path: Path | None = None,
+) -> list[WrapperResult]:
+    """Generate PowerShell wrappers for many parsers at once.
+
+    Args:
+        jobs: :class:`WrapperJob` instances or ``(parser, script_path[, options])``
+              tuples, where ``options`` holds ``generate_ps1_wrapper`` keywords
+        max_workers: Thread pool size for rendering and writing
+                     (default: :class:`~concurrent.futures.ThreadPoolExecutor` default)
+        manifest_path: Manifest file (e.g. ``.argparse-ps1.lock.json``) used to
+                       skip wrappers whose parser and options are unchanged
+
+    Returns:
+        One :class:`WrapperResult` per job, in the order the jobs were given.
+        Errors are collected per job instead of being raised.
+    """
+
+    normalized = [_normalize_job(job) for job in jobs]
+
+    # Discovery and validation are served from the process-wide project cache,
+    # so only the first job per project walks the filesystem and parses TOML.
+    prepared: list[tuple[WrapperJob, Path, Path | None] | WrapperResult] = []
+    for job in normalized:
+        try:
+            _check_options(job.options)
+            output_path = _resolve_output_path(
+                job.script_path,
+                job.options.get("output_path"),
+                job.options.get("output_dir"),
+            )
+            project_root = (
+                None
+                if job.options.get("console_script")
+                else _resolve_project_root(
+                    job.script_path,
+                    runner=job.options.get("runner", "uv"),
+                    command_name=job.options.get("command_name"),
+                )
+            )
+        except Exception as e:
+            prepared.append(WrapperResult(job=job, error=e))
+        else:
+            prepared.append((job, output_path, project_root))
+
+    manifest = WrapperManifest.load(manifest_path) if manifest_path else None
+
+    def run(
+        item: tuple[WrapperJob, Path, Path | None] | WrapperResult,
+    ) -> WrapperResult:
+        if isinstance(item, WrapperResult):
+            return item
+        job, output_path, project_root = item
+        settings: dict[str, Any] = {
+            "script_path": job.script_path,
+            "output_path": output_path,
+            "skip_dests": job.options.get("skip_dests"),
+            "runner": job.options.get("runner", "uv"),
+            "command_name": job.options.get("command_name"),
+            "project_root": project_root,
+            **{
+                name: job.options.get(name, default)
+                for name, default in _RENDER_OPTION_DEFAULTS.items()
+            },
+        }
+        try:
+            # Read the parser once for both the fingerprint and the rendering
+            spec = (
+                job.parser
+                if isinstance(job.parser, WrapperSpec)
+                else extract_spec(job.parser, format_help=settings["embed_help"])
+            )
+            fingerprint = None
+            if manifest is not None:
+                fingerprint = fingerprint_wrapper(spec, **settings)
+                if manifest.is_current(output_path, fingerprint):
+                    return WrapperResult(job=job, output_path=output_path, skipped=True)
+            content = _render_wrapper(spec, **settings)
+            written = _write_wrapper(
+                output_path, content, lock_file=job.options.get("lock_file", False)
+            )
+        except Exception as e:
+            return WrapperResult(job=job, error=e)
+        return WrapperResult(
+            job=job,
+            output_path=output_path,
+            skipped=not written,
+            fingerprint=fingerprint,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(run, prepared))
+
+    if manifest is not None:
+        for result in results:
+            if result.fingerprint is not None and result.output_path is not None:
+                manifest.record(result.output_path, result.fingerprint)
+        manifest.save()
+    return results
+
+
+def _normalize_job(job: JobLike) -> WrapperJob:
+    if isinstance(job, WrapperJob):
+        return job
+    if len(job) == 2:
+        parser, script_path = job
+        return WrapperJob(parser=parser, script_path=script_path)
+    parser, script_path, options = job
+    return WrapperJob(parser=parser, script_path=script_path, options=options)
+
+
+def _check_options(options: Mapping[str, Any]) -> None:
+    unknown = sorted(set(options) - _OPTION_NAMES)
+    if unknown:
+        raise TypeError(f"Unknown generate_ps1_wrapper option(s): {', '.join(unknown)}")
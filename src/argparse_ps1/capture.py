@@ -0,0 +1,146 @@
+"""Capture the :class:`argparse.ArgumentParser` a program builds.
+
+The parser is intercepted at ``parse_args``/``parse_known_args`` time, so the
+program's work after argument parsing never runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import runpy
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+
+class ParserCaptured(BaseException):
+    """Raised from the patched ``parse_args`` to unwind the captured program.
+
+    Derives from :class:`BaseException` so ``except Exception`` blocks in the
+    program do not swallow it.
+    """
+
+    def __init__(self, parser: argparse.ArgumentParser) -> None:
+        super().__init__(parser.prog)
+        self.parser = parser
+
+
+CaptureHook = Callable[[argparse.ArgumentParser], None]
+
+
+@contextmanager
+def intercept_parse_args(
+    on_capture: CaptureHook | None = None,
+) -> Iterator[list[argparse.ArgumentParser]]:
+    """Patch ``ArgumentParser`` so parse calls raise :class:`ParserCaptured`.
+
+    Args:
+        on_capture: Called with the first parser before the program is
+                    unwound, so work such as wrapper generation happens even
+                    if the program swallows :class:`ParserCaptured`
+
+    Yields:
+        A list that receives the first captured parser.
+    """
+
+    original_parse_args = argparse.ArgumentParser.parse_args
+    original_parse_known_args = argparse.ArgumentParser.parse_known_args
+    captured: list[argparse.ArgumentParser] = []
+
+    def capture(self: argparse.ArgumentParser, *_args: Any, **_kwargs: Any) -> Any:
+        if not captured:
+            captured.append(self)
+            if on_capture is not None:
+                on_capture(self)
+        raise ParserCaptured(self)
+
+    argparse.ArgumentParser.parse_args = capture  # type: ignore
+    argparse.ArgumentParser.parse_known_args = capture  # type: ignore
+    try:
+        yield captured
+    finally:
+        argparse.ArgumentParser.parse_args = original_parse_args  # type: ignore
+        argparse.ArgumentParser.parse_known_args = original_parse_known_args  # type: ignore
+
+
+def capture_parser(
+    func: Callable[[], object],
+    *,
+    prog: str | None = None,
+    on_capture: CaptureHook | None = None,
+) -> argparse.ArgumentParser:
+    """Call ``func`` and return the parser it tries to parse arguments with.
+
+    Args:
+        func: Program entry point (e.g. a ``[project.scripts]`` target)
+        prog: Value for ``sys.argv[0]`` while ``func`` runs
+        on_capture: Called with the parser inside the intercepted parse call
+
+    Raises:
+        RuntimeError: If ``func`` finishes without parsing arguments
+    """
+
+    saved_argv = sys.argv
+    sys.argv = [prog or getattr(func, "__name__", "prog")]
+    try:
+        with intercept_parse_args(on_capture) as captured:
+            try:
+                func()
+            except ParserCaptured:
+                pass
+            except SystemExit as e:
+                if not captured:
+                    raise RuntimeError(
+                        f"Error: program exited (code {e.code}) before parsing arguments"
+                    ) from e
+    finally:
+        sys.argv = saved_argv
+
+    if not captured:
+        raise RuntimeError("Error: program returned without parsing arguments")
+    return captured[0]
+
+
+def capture_script(
+    script_path: Path, *, on_capture: CaptureHook | None = None
+) -> argparse.ArgumentParser:
+    """Run ``script_path`` as ``__main__`` and return the parser it parses with.
+
+    The script runs in the current process with its directory on ``sys.path``,
+    exactly as ``python script_path`` would, but stops at the parse call.
+
+    Raises:
+        RuntimeError: If the script finishes without parsing arguments
+    """
+
+    script_path = script_path.resolve()
+    saved_path = list(sys.path)
+    sys.path.insert(0, str(script_path.parent))
+    try:
+        return capture_parser(
+            lambda: runpy.run_path(str(script_path), run_name="__main__"),
+            prog=str(script_path),
+            on_capture=on_capture,
+        )
+    finally:
+        sys.path[:] = saved_path
+
+
+def load_entry_point(spec: str) -> Callable[[], object]:
+    """Import and return the callable named by a ``module:attr`` entry point."""
+
+    # Strip extras, e.g. "pkg.cli:main [extra]"
+    target = spec.split("[", 1)[0].strip()
+    module_name, _, attr_path = target.partition(":")
+    if not module_name or not attr_path:
+        raise ValueError(
+            f"Error: invalid entry point '{spec}' (expected 'module:function')"
+        )
+
+    obj: Any = importlib.import_module(module_name.strip())
+    for attr in attr_path.strip().split("."):
+        obj = getattr(obj, attr)
+    return obj
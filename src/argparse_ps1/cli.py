@@ -0,0 +1,368 @@
+"""Command-line interface: ``python -m argparse_ps1 <command>``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from .argparse_ps1 import generate_ps1_wrapper, render_ps1_wrapper
+from .capture import capture_script
+from .scan import DEFAULT_TIMEOUT, scan_project
+from .spec import dump_spec, extract_spec, load_spec
+from .static import StaticExtractionError, extract_parser_static
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the argparse-ps1 command-line interface."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m argparse_ps1",
+        description="Generate PowerShell wrapper scripts for argparse-based scripts",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan = subparsers.add_parser(
+        "scan",
+        help="Generate wrappers for every [project.scripts] entry point",
+        description=(
+            "Import each [project.scripts] entry point in its own process, "
+            "capture its ArgumentParser and generate a project-mode wrapper."
+        ),
+    )
+    scan.add_argument(
+        "project",
+        nargs="?",
+        type=Path,
+        default=None,
+        help="Directory to search upward from for pyproject.toml (default: cwd)",
+    )
+    scan.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory where .ps1 files will be placed (default: cwd)",
+    )
+    scan.add_argument(
+        "-c",
+        "--command",
+        dest="commands",
+        action="append",
+        default=None,
+        help="Only generate this command (repeatable)",
+    )
+    scan.add_argument(
+        "--skip-dest",
+        dest="skip_dests",
+        action="append",
+        default=None,
+        help="Parameter destination to skip in every wrapper (repeatable)",
+    )
+    scan.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed per entry point before it is killed (default: 60)",
+    )
+    scan.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of concurrent extraction processes (default: CPU count)",
+    )
+    scan.add_argument(
+        "--python",
+        default=None,
+        help=(
+            "Interpreter that imports the entry points, e.g. the project's "
+            ".venv Python (default: the one running argparse-ps1)"
+        ),
+    )
+    scan.set_defaults(handler=_run_scan)
+
+    capture = subparsers.add_parser(
+        "capture",
+        help="Generate a wrapper by running a script up to its parse_args call",
+        description=(
+            "Run SCRIPT with ArgumentParser.parse_args/parse_known_args patched. "
+            "The first parse call generates the wrapper and stops the script, "
+            "so none of its post-parse work runs."
+        ),
+    )
+    capture.add_argument("script", type=Path, help="Python script to capture")
+    capture.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory where the .ps1 file will be placed (default: cwd)",
+    )
+    capture.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output path for the .ps1 file (overrides --output-dir)",
+    )
+    capture.add_argument(
+        "--skip-dest",
+        dest="skip_dests",
+        action="append",
+        default=None,
+        help="Parameter destination to skip (repeatable)",
+    )
+    capture.add_argument(
+        "--runner",
+        default="uv",
+        help='Command to run Python (default: "uv")',
+    )
+    capture.add_argument(
+        "--command-name",
+        default=None,
+        help="Command name registered in [project.scripts] (enables project mode)",
+    )
+    capture.add_argument(
+        "--static",
+        action="store_true",
+        help="Try static extraction first; run the script only if that fails",
+    )
+    capture.set_defaults(handler=_run_capture)
+
+    spec = subparsers.add_parser(
+        "spec",
+        help="Save a script's parser as a JSON wrapper spec",
+        description=(
+            "Extract SCRIPT's ArgumentParser (statically or by running the script "
+            "up to its parse_args call) and save it as a wrapper spec that "
+            "'render --spec' turns into a wrapper without importing the script."
+        ),
+    )
+    spec.add_argument("script", type=Path, help="Python script to extract")
+    spec.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Path of the JSON spec to write",
+    )
+    spec.add_argument(
+        "--static",
+        action="store_true",
+        help="Try static extraction first; run the script only if that fails",
+    )
+    spec.set_defaults(handler=_run_spec)
+
+    render = subparsers.add_parser(
+        "render",
+        help="Generate a wrapper from a saved JSON wrapper spec",
+        description=(
+            "Render the wrapper for SCRIPT from a spec written by the 'spec' "
+            "command. SCRIPT is neither imported nor run."
+        ),
+    )
+    render.add_argument("script", type=Path, help="Python script the wrapper runs")
+    render.add_argument(
+        "--spec",
+        type=Path,
+        required=True,
+        help="JSON wrapper spec to render",
+    )
+    render.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory where the .ps1 file will be placed (default: cwd)",
+    )
+    render.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output path for the .ps1 file (overrides --output-dir)",
+    )
+    render.add_argument(
+        "--skip-dest",
+        dest="skip_dests",
+        action="append",
+        default=None,
+        help="Parameter destination to skip (repeatable)",
+    )
+    render.add_argument(
+        "--runner",
+        default="uv",
+        help='Command to run Python (default: "uv")',
+    )
+    render.add_argument(
+        "--command-name",
+        default=None,
+        help="Command name registered in [project.scripts] (enables project mode)",
+    )
+    render.add_argument(
+        "--pipeline-input",
+        metavar="DEST",
+        default=None,
+        help="List argument that accepts PowerShell pipeline input",
+    )
+    render.add_argument(
+        "--parallel-input",
+        metavar="DEST",
+        default=None,
+        help="Positional argument whose values run in parallel (-ThrottleLimit)",
+    )
+    render.add_argument(
+        "--as-object",
+        action="store_true",
+        help="Add -AsObject, which converts JSON-line output to objects",
+    )
+    render.add_argument(
+        "--trace-timing",
+        action="store_true",
+        help="Add -TraceTiming, which prints the time spent in each phase",
+    )
+    render_output = render.add_mutually_exclusive_group()
+    render_output.add_argument(
+        "--stdout",
+        action="store_true",
+        help=(
+            "Print the wrapper instead of writing it (--output/--output-dir "
+            "still set the location it is rendered for)"
+        ),
+    )
+    render_output.add_argument(
+        "--lock-file",
+        action="store_true",
+        help="Lock <output>.lock while writing, for concurrent generators",
+    )
+    render.set_defaults(handler=_run_render)
+
+    return parser
+
+
+def _run_scan(args: argparse.Namespace) -> int:
+    try:
+        results = scan_project(
+            args.project,
+            output_dir=args.output_dir,
+            commands=args.commands,
+            skip_dests=args.skip_dests,
+            timeout=args.timeout if args.timeout is not None else DEFAULT_TIMEOUT,
+            max_workers=args.jobs,
+            python=args.python,
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    failed = 0
+    for result in results:
+        if result.ok:
+            print(f"Generated PowerShell wrapper: {result.output_path}")
+        else:
+            failed += 1
+            print(f"Failed: {result.command_name} ({result.error})", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _run_capture(args: argparse.Namespace) -> int:
+    script_path: Path = args.script.resolve()
+    if not script_path.is_file():
+        print(f"Error: script not found: {script_path}", file=sys.stderr)
+        return 1
+
+    generated: list[Path] = []
+
+    def generate(parser: argparse.ArgumentParser) -> None:
+        generated.append(
+            generate_ps1_wrapper(
+                parser,
+                script_path=script_path,
+                output_path=args.output,
+                output_dir=args.output_dir,
+                skip_dests=args.skip_dests,
+                runner=args.runner,
+                command_name=args.command_name,
+            )
+        )
+
+    try:
+        if args.static:
+            try:
+                parser = extract_parser_static(script_path)
+            except StaticExtractionError:
+                pass
+            else:
+                generate(parser)
+        if not generated:
+            capture_script(script_path, on_capture=generate)
+    except (RuntimeError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if not generated:
+        print(
+            f"Error: no wrapper was generated for {script_path.name}"
+            " (the script caught the generation error)",
+            file=sys.stderr,
+        )
+        return 1
+    print(f"Generated PowerShell wrapper: {generated[0]}")
+    return 0
+
+
+def _run_spec(args: argparse.Namespace) -> int:
+    script_path: Path = args.script.resolve()
+    if not script_path.is_file():
+        print(f"Error: script not found: {script_path}", file=sys.stderr)
+        return 1
+
+    try:
+        parser = None
+        if args.static:
+            try:
+                parser = extract_parser_static(script_path)
+            except StaticExtractionError:
+                pass
+        if parser is None:
+            parser = capture_script(script_path)
+        dump_spec(extract_spec(parser), args.output)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Saved wrapper spec: {args.output}")
+    return 0
+
+
+def _run_render(args: argparse.Namespace) -> int:
+    options: dict[str, Any] = {
+        "script_path": args.script.resolve(),
+        "output_path": args.output,
+        "output_dir": args.output_dir,
+        "skip_dests": args.skip_dests,
+        "runner": args.runner,
+        "command_name": args.command_name,
+        "pipeline_input": args.pipeline_input,
+        "parallel_input": args.parallel_input,
+        "as_object": args.as_object,
+        "trace_timing": args.trace_timing,
+    }
+    try:
+        spec = load_spec(args.spec)
+        if args.stdout:
+            sys.stdout.write(render_ps1_wrapper(spec, **options))
+            return 0
+        output_path = generate_ps1_wrapper(spec, lock_file=args.lock_file, **options)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Generated PowerShell wrapper: {output_path}")
+    return 0
@@ -0,0 +1,167 @@
+"""Run completion callables for dynamically completed wrapper arguments.
+
+An argument declares a completion callable either as ``action.completer`` or
+through ``completion_hints``; the callable receives the word being completed
+and returns candidate values. Wrappers run it through::
+
+    python -m argparse_ps1.complete pkg.module:list_datasets --prefix tr \
+        --command My-Tool --parameter Dataset
+
+The callable is imported from its module, so only that module's top level runs;
+a function defined in the wrapped script itself is not supported, as loading it
+would run the whole script on every cache miss. Script wrappers pass the
+script's directory as ``--path`` so that a module next to the script can be
+imported.
+
+Results are cached on disk, one JSON file per (command, parameter, callable,
+prefix), named after a SHA256 of the four. Each entry also records the file
+the callable is defined in, and is recomputed once that file is modified. The
+wrapper's completer reads fresh cache files itself, so Python only starts when
+an entry is missing, older than the TTL or older than the callable's source.
+After each write the oldest entries beyond ``max_entries`` are removed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from .capture import load_entry_point
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user completion cache directory used by the wrappers."""
+    if os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"])
+    elif os.environ.get("XDG_CACHE_HOME"):
+        base = Path(os.environ["XDG_CACHE_HOME"])
+    else:
+        base = Path.home() / ".cache"
+    return base / "argparse-ps1" / "completions"
+
+
+def cache_key(command: str, parameter: str, spec: str, prefix: str) -> str:
+    """Return the cache file stem for one completion request."""
+    key = f"{command}\0{parameter}\0{spec}\0{prefix}".encode()
+    return hashlib.sha256(key).hexdigest()
+
+
+def complete(
+    spec: str,
+    prefix: str,
+    *,
+    command: str,
+    parameter: str,
+    cache_dir: Path | None = None,
+    ttl: float = DEFAULT_TTL,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> list[str]:
+    """Return completions for ``prefix``, served from the cache while fresh.
+
+    Args:
+        spec: Completion callable as ``module:function``
+        prefix: Word being completed
+        command: Wrapper name, part of the cache key
+        parameter: PowerShell parameter name, part of the cache key
+        cache_dir: Cache directory (default: :func:`default_cache_dir`)
+        ttl: Seconds a cached result stays valid
+        max_entries: Number of cache files kept; older ones are evicted
+    """
+
+    cache_dir = cache_dir or default_cache_dir()
+    cache_file = cache_dir / f"{cache_key(command, parameter, spec, prefix)}.json"
+    try:
+        cached = _read_fresh(cache_file, ttl)
+    except (OSError, ValueError, KeyError, TypeError):
+        cached = None
+    if cached is not None:
+        return cached
+
+    func = load_entry_point(spec)
+    values = [str(value) for value in func(prefix) if str(value).startswith(prefix)]
+    try:
+        source = inspect.getsourcefile(func)
+    except TypeError:
+        source = None
+    entry = {
+        "values": values,
+        "source": str(Path(source).resolve()) if source else None,
+    }
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(entry), encoding="utf-8")
+    temp_path.replace(cache_file)
+    _evict(cache_dir, max_entries)
+    return values
+
+
+def _read_fresh(cache_file: Path, ttl: float) -> list[str] | None:
+    """Return the cached values unless expired or older than their source."""
+    written = cache_file.stat().st_mtime_ns
+    if time.time() - written / 1e9 >= ttl:
+        return None
+    entry = json.loads(cache_file.read_text(encoding="utf-8"))
+    if entry.get("source") and Path(entry["source"]).stat().st_mtime_ns >= written:
+        return None
+    return list(entry["values"])
+
+
+def _evict(cache_dir: Path, max_entries: int) -> None:
+    """Remove the least recently written entries beyond ``max_entries``."""
+    entries: list[tuple[float, Path]] = []
+    for path in cache_dir.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        path.unlink(missing_ok=True)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m argparse_ps1.complete",
+        description="Print completions from a completion callable, using a disk cache.",
+    )
+    parser.add_argument("spec", help="Completion callable (module:function)")
+    parser.add_argument("--prefix", default="", help="Word being completed")
+    parser.add_argument("--command", required=True, help="Wrapper name")
+    parser.add_argument("--parameter", required=True, help="Parameter name")
+    parser.add_argument("--cache-dir", type=Path, help="Cache directory")
+    parser.add_argument(
+        "--path",
+        action="append",
+        default=[],
+        help="Directory searched for the callable's module first (repeatable)",
+    )
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL)
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    args = parser.parse_args(argv)
+    sys.path[:0] = args.path
+
+    for value in complete(
+        args.spec,
+        args.prefix,
+        command=args.command,
+        parameter=args.parameter,
+        cache_dir=args.cache_dir,
+        ttl=args.ttl,
+        max_entries=args.max_entries,
+    ):
+        print(value)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
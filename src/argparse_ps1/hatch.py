@@ -0,0 +1,335 @@
+"""Hatchling build hook that ships PowerShell wrappers in the wheel.
+
+Enable it in the project being built::
+
+    [build-system]
+    requires = ["hatchling", "argparse-ps1"]
+    build-backend = "hatchling.build"
+
+    [tool.hatch.build.hooks.argparse-ps1]
+    embed-help = true
+
+Every ``[project.scripts]`` entry gets a wrapper in console script mode (see
+``console_script`` in :func:`~argparse_ps1.generate_ps1_wrapper`). The wrapper
+is added to the wheel's scripts directory, so installing the wheel puts
+``My-Tool.ps1`` next to the ``my-tool`` launcher it runs.
+
+Parsers are rebuilt from the entry point module's source when possible (see
+:mod:`argparse_ps1.static`); otherwise the entry point is imported in a
+subprocess of the build environment. Extracted specs are cached in
+``cache-dir`` under a hash of the sources they were read from, so a rebuild
+whose parsers did not change skips extraction, and wrappers whose spec and
+options did not change are not rendered again. The sdist includes the spec
+cache, so a wheel built from it does not extract again either.
+
+Options:
+
+- ``commands``: Command names to generate wrappers for (default: all)
+- ``skip-dests``: Parameter destinations to leave out of every wrapper
+- ``embed-help``, ``compress-help``, ``validate-arguments``, ``worker``,
+  ``as-object``, ``trace-timing``: The rendering options of the same name
+- ``completion-hints``: Tab-completion values per command, then per dest
+- ``pipeline-input``, ``parallel-input``: Dest of the argument that accepts
+  pipeline input or runs in parallel, per command
+- ``cache-dir``: Cache directory, relative to the project root (default:
+  ``.argparse-ps1-cache``)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.config import BuilderConfig
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+from hatchling.plugin import hookimpl
+
+from .batch import WrapperJob, generate_ps1_wrappers
+from .manifest import _package_digest
+from .scan import DEFAULT_TIMEOUT, _command_to_filename, _last_error_line, _worker_env
+from .spec import WrapperSpec, extract_spec, load_spec
+from .static import StaticExtractionError, extract_parser_static
+
+DEFAULT_CACHE_DIR = ".argparse-ps1-cache"
+
+# Bumped when the cache layout changes; any change to the argparse-ps1 sources
+# also invalidates the cache, as it may extract parsers differently.
+_CACHE_VERSION = 1
+
+# Boolean hook options and the generate_ps1_wrapper keywords they set
+_RENDER_OPTIONS = {
+    "embed-help": "embed_help",
+    "compress-help": "compress_help",
+    "validate-arguments": "validate_arguments",
+    "worker": "worker",
+    "as-object": "as_object",
+    "trace-timing": "trace_timing",
+}
+
+
+class ArgparsePs1BuildHook(BuildHookInterface[BuilderConfig]):
+    """Generate a wrapper for every ``[project.scripts]`` entry at build time."""
+
+    PLUGIN_NAME = "argparse-ps1"
+
+    def initialize(
+        self, version: str, build_data: dict[str, Any]  # noqa: ARG002
+    ) -> None:
+        root = Path(self.root)
+        scripts = self._scripts()
+        cache = _SpecCache(
+            root / self._option("cache-dir", str, DEFAULT_CACHE_DIR) / "specs.json",
+            root,
+        )
+        specs = {
+            command: cache.get(command, entry_point)
+            for command, entry_point in sorted(scripts.items())
+        }
+        cache.save()
+
+        if self.target_name == "sdist":
+            # Ship the cache so a wheel built from the sdist starts warm
+            if cache.path.exists() and cache.path.is_relative_to(root):
+                relative = cache.path.relative_to(root).as_posix()
+                build_data["force_include"][str(cache.path)] = relative
+            return
+        if self.target_name != "wheel":
+            return
+
+        wrappers_dir = cache.path.parent / "wrappers"
+        wrappers_dir.mkdir(parents=True, exist_ok=True)
+        hints = self._option("completion-hints", dict, {})
+        pipeline_inputs = self._option("pipeline-input", dict, {})
+        parallel_inputs = self._option("parallel-input", dict, {})
+        options: dict[str, Any] = {
+            "console_script": True,
+            "skip_dests": self._option("skip-dests", list, []),
+            **{
+                keyword: self._option(name, bool, False)
+                for name, keyword in _RENDER_OPTIONS.items()
+            },
+        }
+        jobs = [
+            WrapperJob(
+                spec,
+                module.source,
+                {
+                    **options,
+                    "command_name": command,
+                    "output_path": wrappers_dir
+                    / f"{_command_to_filename(command)}.ps1",
+                    "completion_hints": hints.get(command),
+                    "pipeline_input": pipeline_inputs.get(command),
+                    "parallel_input": parallel_inputs.get(command),
+                },
+            )
+            for command, (spec, module) in specs.items()
+        ]
+        results = generate_ps1_wrappers(
+            jobs, manifest_path=cache.path.parent / "manifest.json"
+        )
+
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise ValueError(
+                "Error: PowerShell wrapper generation failed.\n\n"
+                + "\n".join(
+                    f"  {result.job.options['command_name']}: {result.error}"
+                    for result in failed
+                )
+            )
+        # Installed into Scripts/bin, next to the launchers the wrappers run
+        shared_scripts: dict[str, str] = build_data["shared_scripts"]
+        for result in results:
+            if result.output_path is not None:
+                shared_scripts[str(result.output_path)] = result.output_path.name
+
+    def _scripts(self) -> dict[str, str]:
+        scripts: dict[str, str] = dict(self.metadata.core.scripts)
+        commands = self._option("commands", list, None)
+        if commands is None:
+            return scripts
+        missing = sorted(set(commands) - set(scripts))
+        if missing:
+            raise ValueError(
+                f"Error: command(s) not found in [project.scripts]: {', '.join(missing)}"
+            )
+        return {name: spec for name, spec in scripts.items() if name in commands}
+
+    def _option(self, name: str, kind: type, default: Any) -> Any:
+        value = self.config.get(name, default)
+        if value is not default and not isinstance(value, kind):
+            raise TypeError(
+                f"Option '{name}' for build hook '{self.PLUGIN_NAME}' must be a "
+                f"{kind.__name__}"
+            )
+        return value
+
+
+@hookimpl
+def hatch_register_build_hook() -> type[ArgparsePs1BuildHook]:
+    return ArgparsePs1BuildHook
+
+
+@dataclass(frozen=True)
+class _Module:
+    """Source file of an entry point module and of its top-level package."""
+
+    source: Path
+    package: Path
+
+    def key(self, whole_package: bool) -> str:
+        """Hash the module's source, or every file of its package."""
+        files = (
+            sorted(self.package.rglob("*.py"))
+            if whole_package and self.package.is_dir()
+            else [self.source]
+        )
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(path.relative_to(self.package.parent).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        return digest.hexdigest()
+
+
+def _find_module(root: Path, module_name: str) -> _Module | None:
+    """Locate ``module_name`` on the path extraction subprocesses use."""
+    parts = module_name.split(".")
+    for base in (root, root / "src"):
+        for source in (
+            base.joinpath(*parts[:-1], f"{parts[-1]}.py"),
+            base.joinpath(*parts, "__init__.py"),
+        ):
+            if source.is_file():
+                package = base / parts[0]
+                return _Module(
+                    source, package if package.is_dir() else package.with_suffix(".py")
+                )
+    return None
+
+
+class _SpecCache:
+    """Extracted specs, keyed by a hash of the sources they were read from.
+
+    Statically extracted parsers depend on the entry point module alone, as
+    static extraction fails once the parser is passed to code elsewhere (see
+    :mod:`argparse_ps1.static`); imported ones are keyed by every file of the
+    module's top-level package.
+    """
+
+    def __init__(self, path: Path, root: Path):
+        self.path = path
+        self.root = root
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        current = (
+            isinstance(data, dict)
+            and data.get("version") == _CACHE_VERSION
+            and data.get("argparse_ps1") == _package_digest()
+        )
+        self._entries: dict[str, Any] = dict(data["commands"]) if current else {}
+        self._used: dict[str, Any] = {}
+
+    def get(self, command: str, entry_point: str) -> tuple[WrapperSpec, _Module]:
+        module_name = entry_point.split("[", 1)[0].partition(":")[0].strip()
+        module = _find_module(self.root, module_name)
+        if module is None:
+            raise ValueError(
+                f"Error: module '{module_name}' of command '{command}' was not found.\n"
+                f"\n"
+                f"  Searched: {self.root} and {self.root / 'src'}\n"
+                f"\n"
+                f"Possible solutions:\n"
+                f"  1. Check the entry point in [project.scripts]\n"
+                f"  2. Leave the command out with the hook's 'commands' option"
+            )
+
+        entry = self._entries.get(command)
+        if isinstance(entry, dict) and entry.get("entry_point") == entry_point:
+            try:
+                if entry["key"] == module.key(entry["method"] == "import"):
+                    self._used[command] = entry
+                    return WrapperSpec.from_dict(entry["spec"]), module
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        spec, method = self._extract(command, entry_point, module)
+        self._used[command] = {
+            "entry_point": entry_point,
+            "method": method,
+            "key": module.key(method == "import"),
+            "spec": spec.to_dict(),
+        }
+        return spec, module
+
+    def save(self) -> None:
+        """Write the entries used by this build if anything changed."""
+        if self._used == self._entries and self.path.exists():
+            return
+        data = {
+            "version": _CACHE_VERSION,
+            "argparse_ps1": _package_digest(),
+            "commands": self._used,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        temp_path.replace(self.path)
+
+    def _extract(
+        self, command: str, entry_point: str, module: _Module
+    ) -> tuple[WrapperSpec, str]:
+        try:
+            # The console script runs as the command, not as the module file
+            parser = extract_parser_static(module.source, prog=command)
+        except StaticExtractionError:
+            pass
+        else:
+            return extract_spec(parser), "static"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spec_path = Path(tmpdir) / "spec.json"
+            args = [
+                sys.executable,
+                "-m",
+                "argparse_ps1._scan_worker",
+                "--spec",
+                entry_point,
+                command,
+                str(spec_path),
+                str(self.root),
+            ]
+            try:
+                completed = subprocess.run(  # noqa: S603
+                    args,
+                    cwd=self.root,
+                    env=_worker_env(self.root),
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    text=True,
+                    timeout=DEFAULT_TIMEOUT,
+                    check=False,
+                )
+            except subprocess.TimeoutExpired:
+                error = f"timed out after {DEFAULT_TIMEOUT:g}s"
+            else:
+                if completed.returncode == 0:
+                    return load_spec(spec_path), "import"
+                error = _last_error_line(completed.stderr) or (
+                    f"exited with code {completed.returncode}"
+                )
+        raise ValueError(
+            f"Error: cannot extract the parser of '{command}' ({entry_point}): {error}"
+        )
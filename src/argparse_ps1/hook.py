@@ -0,0 +1,100 @@
+"""Wire ``--make-ps1`` into a parser without paying for the generator.
+
+:func:`install` adds the flag with an action that runs when argparse sees it.
+Only then are the renderer and its dependencies (``tomllib``, ``gzip``, ...)
+imported, so a normal run of the script imports nothing beyond this module
+and :mod:`argparse_ps1.trace`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from .trace import trace_timing
+
+# typing/collections.abc/pathlib are not imported by argparse; avoid loading
+# them for annotations only.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+    from typing import Any
+
+
+def install(
+    parser: argparse.ArgumentParser,
+    *,
+    flag: str = "--make-ps1",
+    script_path: Path | None = None,
+    **options: Any,
+) -> argparse.Action:
+    """Add ``flag`` to ``parser``; passing it generates the wrapper and exits.
+
+    The flag itself is left out of the wrapper and, as it defaults to
+    ``argparse.SUPPRESS``, never appears in the parsed namespace. When the
+    wrapper was called with ``-TraceTiming``, the parser also reports its
+    timestamps (see :func:`~argparse_ps1.trace_timing`).
+
+    Args:
+        parser: Parser to add the flag to
+        flag: Option string of the flag (default: ``--make-ps1``)
+        script_path: Path to the Python script (default: the ``__main__``
+                     module's file)
+        **options: Further keyword arguments for
+                   :func:`~argparse_ps1.generate_ps1_wrapper` (``output_dir``,
+                   ``runner``, ``command_name``, ...). They are checked when
+                   the flag is used.
+
+    Returns:
+        The added action.
+    """
+    trace_timing(parser)
+    return parser.add_argument(
+        flag,
+        action=_MakePs1Action,
+        script_path=script_path,
+        wrapper_options=options,
+        help="Generate a PowerShell wrapper script and exit",
+    )
+
+
+class _MakePs1Action(argparse.Action):
+    def __init__(
+        self,
+        option_strings: Sequence[str],
+        dest: str,
+        *,
+        script_path: Path | None,
+        wrapper_options: Mapping[str, Any],
+        help: str | None = None,
+    ) -> None:
+        super().__init__(
+            option_strings, dest, nargs=0, default=argparse.SUPPRESS, help=help
+        )
+        self.script_path = script_path
+        self.wrapper_options = wrapper_options
+
+    def __call__(
+        self, parser: argparse.ArgumentParser, *_args: Any, **_kwargs: Any
+    ) -> None:
+        from .argparse_ps1 import generate_ps1_wrapper  # noqa: PLC0415 - deferred
+
+        options = dict(self.wrapper_options)
+        options["skip_dests"] = {*options.get("skip_dests", ()), self.dest}
+        try:
+            output = generate_ps1_wrapper(
+                parser, script_path=self.script_path or _main_script(), **options
+            )
+        except (TypeError, ValueError) as e:
+            parser.exit(1, f"{e}\n")
+        print(f"Generated PowerShell wrapper: {output}")
+        parser.exit(0)
+
+
+def _main_script() -> Path:
+    """Return the file of the running ``__main__`` module (or ``sys.argv[0]``)."""
+    from pathlib import Path  # noqa: PLC0415 - deferred
+
+    main_file = getattr(sys.modules.get("__main__"), "__file__", None)
+    return Path(main_file or sys.argv[0]).resolve()
@@ -0,0 +1,175 @@
+"""Manifest of generated wrappers for incremental regeneration.
+
+The manifest (``.argparse-ps1.lock.json`` by default) records, per wrapper, a
+fingerprint of the parser's :class:`~argparse_ps1.spec.WrapperSpec` and of the
+generation options together with the size and mtime of the file that was
+written. Fingerprints also cover the argparse_ps1 sources, so upgrading (or
+editing) the renderer regenerates every wrapper. A wrapper whose fingerprint is
+unchanged and whose file is untouched is skipped without rendering or writing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .argparse_ps1 import _has_inline_metadata, _read_project_scripts
+from .spec import WrapperSpec, extract_spec
+
+MANIFEST_FILENAME = ".argparse-ps1.lock.json"
+
+# Bump when the manifest layout changes. Changes to the rendered output need no
+# bump: fingerprints include the argparse_ps1 version and a hash of its sources.
+_FINGERPRINT_VERSION = 7
+
+
+def fingerprint_wrapper(
+    parser: argparse.ArgumentParser | WrapperSpec,
+    *,
+    script_path: Path,
+    output_path: Path,
+    skip_dests: Iterable[str] | None,
+    runner: str,
+    command_name: str | None,
+    project_root: Path | None,
+    **render_options: Any,
+) -> str:
+    """Return a stable hash of everything that determines a wrapper's content."""
+
+    skip = {"help"}
+    if skip_dests:
+        skip.update(skip_dests)
+
+    spec = parser if isinstance(parser, WrapperSpec) else extract_spec(parser)
+    # cache_interpreter wrappers embed the command's [project.scripts] target
+    entry_point = None
+    if project_root is not None and command_name is not None:
+        scripts = _read_project_scripts(project_root / "pyproject.toml")
+        entry_point = scripts.get(command_name)
+    # Script-mode completers run in the script's inline-metadata environment
+    inline_metadata = project_root is None and _has_inline_metadata(script_path)
+    payload: dict[str, Any] = {
+        "version": _FINGERPRINT_VERSION,
+        "argparse_ps1": __version__,
+        "renderer": _package_digest(),
+        "spec": spec.to_dict(),
+        "options": {
+            "script_path": str(script_path.resolve()),
+            "output_path": str(output_path.resolve()),
+            "skip_dests": sorted(skip),
+            "runner": runner,
+            "command_name": command_name,
+            "project_root": str(project_root.resolve()) if project_root else None,
+            "entry_point": entry_point,
+            "inline_metadata": inline_metadata,
+            "render": {
+                name: _option_repr(value) for name, value in render_options.items()
+            },
+        },
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@functools.cache
+def _package_digest() -> str:
+    """Return a SHA256 over the argparse_ps1 sources, computed once per process.
+
+    Extraction and rendering both live in these files, so the digest changes
+    whenever either may produce different output, including in editable
+    installs whose version number stays the same.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _option_repr(value: object) -> str:
+    if isinstance(value, Mapping):
+        # Completion callables in completion_hints are named, not repr'd with
+        # their address
+        return repr(
+            {
+                key: _type_name(item) if callable(item) else repr(item)
+                for key, item in value.items()  # type: ignore
+            }
+        )
+    return repr(value)
+
+
+def _type_name(value: object) -> str | None:
+    if value is None:
+        return None
+    module = getattr(value, "__module__", None)
+    qualname = getattr(value, "__qualname__", None)
+    if module and qualname:
+        return f"{module}.{qualname}"
+    return repr(value)
+
+
+class WrapperManifest:
+    """Fingerprints of previously generated wrappers, keyed by output path."""
+
+    def __init__(self, path: Path, entries: dict[str, dict[str, Any]] | None = None):
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> WrapperManifest:
+        """Load ``path``; a missing or unreadable manifest starts out empty."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != _FINGERPRINT_VERSION:
+            return cls(path)
+        entries = data.get("wrappers")
+        return cls(path, entries if isinstance(entries, dict) else None)
+
+    def is_current(self, output_path: Path, fingerprint: str) -> bool:
+        """Check whether ``output_path`` was generated from ``fingerprint`` and is untouched."""
+        entry = self._entries.get(self._key(output_path))
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        try:
+            stat = output_path.stat()
+        except OSError:
+            return False
+        return (
+            entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        )
+
+    def record(self, output_path: Path, fingerprint: str) -> None:
+        """Remember the current state of ``output_path`` under ``fingerprint``."""
+        stat = output_path.stat()
+        self._entries[self._key(output_path)] = {
+            "fingerprint": fingerprint,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def save(self) -> None:
+        """Write the manifest, replacing the previous file atomically."""
+        data = {"version": _FINGERPRINT_VERSION, "wrappers": self._entries}
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        temp_path.replace(self.path)
+
+    def _key(self, output_path: Path) -> str:
+        resolved = output_path.resolve()
+        try:
+            return resolved.relative_to(self.path.resolve().parent).as_posix()
+        except ValueError:
+            return resolved.as_posix()
@@ -0,0 +1,226 @@
+"""Render many parsers as functions of one autoloadable PowerShell module.
+
+:func:`generate_ps1_module` writes ``<Name>/<Name>.psm1`` with one function per
+parser and a ``<Name>/<Name>.psd1`` manifest listing them in
+``FunctionsToExport``. With the module directory on ``$env:PSModulePath``,
+PowerShell discovers the commands from the manifest alone and only loads the
+.psm1 when one of them is first called, instead of scanning a wrapper script
+per command. Encoding setup and the unknown-args check live in two helpers
+shared by every function rather than being repeated in each wrapper.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+
+from .argparse_ps1 import (
+    _MODULE_INVOKE_HELPER,
+    _MODULE_UNKNOWN_ARGS_HELPER,
+    _PARALLEL_FUNCTION,
+    _RENDER_OPTION_DEFAULTS,
+    _TIMING_FUNCTION,
+    _WORKER_CLIENT_FUNCTION,
+    _ps_single_quoted_string,
+    _render_wrapper,
+    _resolve_project_root,
+    _to_powershell_filename,
+    _write_wrapper,
+)
+from .batch import JobLike, _check_options, _normalize_job
+from .scan import _command_to_filename
+
+_SHARED_HELPERS = f"""# Shared by every command in this module
+function {_MODULE_INVOKE_HELPER} {{
+    param([string]$Runner, [object[]]$Arguments)
+
+    # Set PowerShell output encoding to UTF-8
+    [Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+    $OutputEncoding = [System.Text.Encoding]::UTF8
+
+    # Set Python output encoding to UTF-8
+    $env:PYTHONIOENCODING = "utf-8"
+
+    & $Runner @Arguments
+}}
+
+function {_MODULE_UNKNOWN_ARGS_HELPER} {{
+    param([object[]]$UnknownArgs)
+
+    if ($UnknownArgs.Count -gt 0) {{
+        Write-Error "Unknown parameter(s): $($UnknownArgs -join ', ')"
+        return $true
+    }}
+    return $false
+}}
+"""
+
+
+def generate_ps1_module(
+    jobs: Iterable[JobLike],
+    *,
+    module_name: str,
+    output_dir: Path | None = None,
+    module_version: str = "1.0.0",
+    description: str | None = None,
+) -> Path:
+    """Generate a PowerShell module exposing one function per parser.
+
+    Each function is named like the wrapper script it replaces: after the
+    job's ``command_name`` when given, otherwise after the script
+    (``my_tool.py`` -> ``My-Tool``).
+
+    Args:
+        jobs: :class:`~argparse_ps1.WrapperJob` instances or
+              ``(parser, script_path[, options])`` tuples, as for
+              :func:`~argparse_ps1.generate_ps1_wrappers`. ``output_path``,
+              ``output_dir`` and ``console_script`` are not accepted per job.
+        module_name: Module name; files are written to ``output_dir/module_name``
+        output_dir: Directory that receives the module directory (default: cwd)
+        module_version: ``ModuleVersion`` written to the manifest
+        description: ``Description`` written to the manifest
+
+    Returns:
+        Path to the generated .psd1 manifest.
+
+    Raises:
+        ValueError: If the module name is invalid or two jobs map to the same
+                    function name
+        TypeError: If a job has unknown or unsupported options
+    """
+
+    if not module_name or module_name != Path(module_name).name:
+        raise ValueError(f"Error: invalid module name '{module_name}'")
+
+    module_dir = (output_dir or Path.cwd()) / module_name
+    normalized = [_normalize_job(job) for job in jobs]
+    functions: dict[str, str] = {}
+    for job in normalized:
+        _check_options(job.options)
+        unsupported = sorted(
+            {"output_path", "output_dir", "console_script"} & set(job.options)
+        )
+        if unsupported:
+            raise TypeError(
+                f"Option(s) not supported for module output: {', '.join(unsupported)}"
+            )
+
+        runner = job.options.get("runner", "uv")
+        command_name = job.options.get("command_name")
+        function_name = (
+            _command_to_filename(command_name)
+            if command_name
+            else _to_powershell_filename(job.script_path.stem)
+        )
+        if function_name in functions:
+            raise ValueError(
+                f"Error: more than one parser maps to function '{function_name}'.\n"
+                f"\n"
+                f"  Conflicting script: {job.script_path}\n"
+                f"\n"
+                f"Possible solutions:\n"
+                f"  1. Rename one of the scripts\n"
+                f"  2. Generate the conflicting parsers into separate modules"
+            )
+
+        functions[function_name] = _render_wrapper(
+            job.parser,
+            script_path=job.script_path,
+            # Paths are resolved relative to the module directory, and the
+            # interpreter cache (cache_interpreter) is named after the function
+            output_path=module_dir / f"{function_name}.ps1",
+            skip_dests=job.options.get("skip_dests"),
+            runner=runner,
+            command_name=command_name,
+            project_root=_resolve_project_root(
+                job.script_path, runner=runner, command_name=command_name
+            ),
+            function_name=function_name,
+            **{
+                name: job.options.get(name, default)
+                for name, default in _RENDER_OPTION_DEFAULTS.items()
+            },
+        )
+
+    names = sorted(functions)
+    helpers = [_SHARED_HELPERS]
+    if any(job.options.get("worker") for job in normalized):
+        helpers.append(_WORKER_CLIENT_FUNCTION)
+    if any(job.options.get("parallel_input") for job in normalized):
+        helpers.append(_PARALLEL_FUNCTION)
+    if any(job.options.get("trace_timing") for job in normalized):
+        helpers.append(_TIMING_FUNCTION)
+    # The module files are shared by all jobs; lock them if any job asks to
+    lock_file = any(job.options.get("lock_file") for job in normalized)
+    module_dir.mkdir(parents=True, exist_ok=True)
+    psm1_path = module_dir / f"{module_name}.psm1"
+    psd1_path = module_dir / f"{module_name}.psd1"
+    _write_wrapper(
+        psm1_path,
+        "\n".join(
+            [
+                "# Generated by argparse-ps1",
+                "",
+                *helpers,
+                *(functions[name] for name in names),
+                f"Export-ModuleMember -Function {', '.join(names) or '@()'}",
+                "",
+            ]
+        ),
+        lock_file=lock_file,
+    )
+    _write_wrapper(
+        psd1_path,
+        _render_module_manifest(
+            module_name,
+            names,
+            module_version=module_version,
+            description=description,
+        ),
+        lock_file=lock_file,
+    )
+    return psd1_path
+
+
+def _render_module_manifest(
+    module_name: str,
+    function_names: list[str],
+    *,
+    module_version: str,
+    description: str | None,
+) -> str:
+    """Render the .psd1 manifest.
+
+    Explicit (possibly empty) export lists let the autoloader index the module
+    without loading it; the GUID is derived from the module name so that
+    regeneration produces identical output.
+    """
+    guid = uuid.uuid5(uuid.NAMESPACE_URL, f"argparse-ps1:{module_name}")
+    if function_names:
+        exports = [
+            "    FunctionsToExport = @(",
+            *(f"        {_ps_single_quoted_string(name)}" for name in function_names),
+            "    )",
+        ]
+    else:
+        exports = ["    FunctionsToExport = @()"]
+    return "\n".join(
+        [
+            "# Generated by argparse-ps1",
+            "@{",
+            f"    RootModule = {_ps_single_quoted_string(f'{module_name}.psm1')}",
+            f"    ModuleVersion = {_ps_single_quoted_string(module_version)}",
+            f"    GUID = '{guid}'",
+            "    Description = "
+            + _ps_single_quoted_string(
+                description or "PowerShell wrappers generated by argparse-ps1"
+            ),
+            *exports,
+            "    CmdletsToExport = @()",
+            "    VariablesToExport = @()",
+            "    AliasesToExport = @()",
+            "}",
+            "",
+        ]
+    )
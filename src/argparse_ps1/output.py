@@ -0,0 +1,60 @@
+"""Write records that a wrapper's ``-AsObject`` switch turns into objects.
+
+A wrapper generated with ``as_object`` sets ``ARGPARSE_PS1_OUTPUT=json`` when
+called with ``-AsObject``. :func:`emit` then writes each record as a JSON line
+prefixed with :data:`RECORD_MARKER`, which the wrapper converts into a
+``PSCustomObject`` as it arrives; other output, such as ``[INFO] starting``
+from ``print`` or logging, passes through as text. Without ``-AsObject``,
+:func:`emit` writes plain text::
+
+    for path in paths:
+        size = path.stat().st_size
+        argparse_ps1.emit({"name": path.name, "size": size}, text=f"{path} {size}")
+
+``.\\My-Tool.ps1 -AsObject | Where-Object size -gt 1MB`` then filters the
+records while the script is still producing them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, TextIO
+
+# Environment variable the wrapper sets to "json" for -AsObject
+OUTPUT_ENV = "ARGPARSE_PS1_OUTPUT"
+
+# Prefix of the lines the wrapper converts (ASCII record separator, as in
+# RFC 7464 JSON text sequences)
+RECORD_MARKER = "\x1e"
+
+
+def object_output() -> bool:
+    """Return whether the wrapper was called with ``-AsObject``."""
+    return os.environ.get(OUTPUT_ENV) == "json"
+
+
+def emit(record: Any, *, text: str | None = None, stream: TextIO | None = None) -> None:
+    """Write ``record`` as one marked JSON line, or as text without ``-AsObject``.
+
+    The stream is flushed after every record, so each one reaches PowerShell
+    while the script is still running rather than when a pipe buffer fills.
+
+    Args:
+        record: Value to write; anything ``json`` cannot encode (e.g. a
+                ``Path``) is written as its ``str()``
+        text: Line written instead of ``record`` without ``-AsObject``
+              (default: ``str(record)``)
+        stream: Stream to write to (default: ``sys.stdout``)
+    """
+    if object_output():
+        line = RECORD_MARKER + json.dumps(record, ensure_ascii=False, default=str)
+    else:
+        line = str(record) if text is None else text
+    stream = stream or sys.stdout
+    stream.write(line + "\n")
+    stream.flush()
@@ -0,0 +1,62 @@
+"""Read the items piped into a wrapper generated with ``pipeline_input``.
+
+``Get-ChildItem *.csv | My-Tool`` starts Python once and streams the items to
+its stdin, one per line, instead of passing them as arguments; the wrapper
+sets ``ARGPARSE_PS1_PIPELINE=1`` for that process. :func:`pipeline_items`
+hides the difference::
+
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args()
+    for name in argparse_ps1.pipeline_items(args.files):
+        ...
+
+Like :mod:`argparse_ps1.hook`, this module imports nothing beyond the
+standard modules every Python process has loaded.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from typing import Any, TextIO
+
+# Environment variable the wrapper sets while it streams pipeline input
+PIPELINE_ENV = "ARGPARSE_PS1_PIPELINE"
+
+
+def pipeline_items(
+    values: Iterable[Any] | None = None,
+    *,
+    convert: Callable[[str], Any] | None = None,
+    stream: TextIO | None = None,
+) -> Iterator[Any]:
+    """Return the pipeline argument's values, or the items piped into the wrapper.
+
+    With piped input the wrapper passes nothing for the argument, so
+    ``values`` only holds its default and is ignored. Items are read lazily,
+    so the script processes each one while PowerShell is still producing the
+    next. The environment variable is removed on the first call, so child
+    processes of the script do not mistake their stdin for pipeline input.
+
+    Args:
+        values: The parsed argument (e.g. ``args.files``)
+        convert: Applied to each piped item, as argparse applies ``type`` to
+                 command-line values (default: items are strings)
+        stream: Stream to read items from (default: ``sys.stdin``)
+
+    Returns:
+        An iterator over the values or the piped items.
+    """
+    if os.environ.pop(PIPELINE_ENV, None) != "1":
+        return iter(values or ())
+    return _read_items(stream or sys.stdin, convert)
+
+
+def _read_items(stream: TextIO, convert: Callable[[str], Any] | None) -> Iterator[Any]:
+    for line in stream:
+        item = line.removesuffix("\n").removesuffix("\r")
+        yield item if convert is None else convert(item)
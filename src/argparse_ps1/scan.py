@@ -0,0 +1,165 @@
+"""Generate wrappers for every ``[project.scripts]`` entry point of a project.
+
+Each entry point is imported in its own Python subprocess, where its parser is
+captured at ``parse_args`` time and rendered in project mode. Subprocesses run
+concurrently and are killed when they exceed the per-script timeout, so one
+slow or hanging import never blocks the rest.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .argparse_ps1 import (
+    _find_project_root,
+    _read_project_scripts,
+    _to_powershell_filename,
+)
+
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    """Outcome of generating the wrapper for one ``[project.scripts]`` entry.
+
+    Exactly one of ``output_path`` and ``error`` is set.
+    """
+
+    command_name: str
+    entry_point: str
+    output_path: Path | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def scan_project(
+    start: Path | None = None,
+    *,
+    output_dir: Path | None = None,
+    commands: Iterable[str] | None = None,
+    skip_dests: Iterable[str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_workers: int | None = None,
+    python: str | None = None,
+) -> list[ScanResult]:
+    """Generate project-mode wrappers for the entry points in ``[project.scripts]``.
+
+    Args:
+        start: Directory to search upward from for pyproject.toml (default: cwd)
+        output_dir: Directory where .ps1 files will be placed (default: cwd)
+        commands: Only generate these command names (default: all)
+        skip_dests: Parameter destinations to skip in every wrapper
+        timeout: Seconds allowed per entry point before its process is killed
+        max_workers: Number of concurrent extraction processes (default: CPU count)
+        python: Interpreter used to import entry points (default: current one)
+
+    Returns:
+        One :class:`ScanResult` per command, sorted by command name.
+    """
+
+    start = (start or Path.cwd()).resolve()
+    project_root = _find_project_root(start)
+    if project_root is None:
+        raise ValueError(
+            f"Error: pyproject.toml was not found.\n"
+            f"\n"
+            f"  Search started from: {start}\n"
+            f"\n"
+            f"Possible solutions:\n"
+            f"  1. Run the command inside a uv project directory\n"
+            f"  2. Pass the project directory explicitly"
+        )
+
+    scripts = _read_project_scripts(project_root / "pyproject.toml")
+    if commands is not None:
+        wanted = set(commands)
+        missing = sorted(wanted - set(scripts))
+        if missing:
+            raise ValueError(
+                f"Error: command(s) not found in [project.scripts]: {', '.join(missing)}"
+            )
+        scripts = {name: spec for name, spec in scripts.items() if name in wanted}
+
+    output_dir = (output_dir or Path.cwd()).resolve()
+    skip = list(skip_dests or [])
+    env = _worker_env(project_root)
+
+    def run(item: tuple[str, str]) -> ScanResult:
+        command_name, entry_point = item
+        output_path = output_dir / f"{_command_to_filename(command_name)}.ps1"
+        args = [
+            python or sys.executable,
+            "-m",
+            "argparse_ps1._scan_worker",
+            entry_point,
+            command_name,
+            str(output_path),
+            str(project_root),
+            *skip,
+        ]
+        try:
+            completed = subprocess.run(  # noqa: S603
+                args,
+                cwd=project_root,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return ScanResult(
+                command_name, entry_point, error=f"timed out after {timeout:g}s"
+            )
+        except OSError as e:
+            # e.g. a --python interpreter that does not exist
+            return ScanResult(command_name, entry_point, error=str(e))
+
+        if completed.returncode != 0:
+            return ScanResult(
+                command_name,
+                entry_point,
+                error=_last_error_line(completed.stderr)
+                or f"exited with code {completed.returncode}",
+            )
+        return ScanResult(command_name, entry_point, output_path=output_path)
+
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, sorted(scripts.items())))
+
+
+def _command_to_filename(command_name: str) -> str:
+    """Convert a command name such as ``my-tool`` to ``My-Tool``."""
+    return _to_powershell_filename(command_name.replace("-", "_"))
+
+
+def _worker_env(project_root: Path) -> dict[str, str]:
+    """Environment for extraction processes with the project importable."""
+    env = dict(os.environ)
+    paths = [str(project_root)]
+    if (project_root / "src").is_dir():
+        paths.append(str(project_root / "src"))
+    # Keep argparse_ps1 itself importable when the project does not depend on it
+    paths.append(str(Path(__file__).resolve().parent.parent))
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+
+def _last_error_line(stderr: str) -> str:
+    lines = [line for line in stderr.strip().splitlines() if line.strip()]
+    return lines[-1].strip() if lines else ""
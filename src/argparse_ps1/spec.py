@@ -0,0 +1,374 @@
+"""Serializable description of a parser, as consumed by the wrapper renderer.
+
+:func:`extract_spec` reads everything rendering needs from an
+:class:`argparse.ArgumentParser` once: argument names, kinds, types, defaults,
+choices, expanded help text, mutually exclusive groups and subcommands. The
+resulting :class:`WrapperSpec` holds only plain values, so it can be saved with
+:func:`dump_spec` and rendered later with :func:`load_spec` (or
+``python -m argparse_ps1 render --spec``) without importing the script that
+built the parser.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Bump when the JSON layout changes incompatibly
+SPEC_VERSION = 1
+
+# Names for argparse's action classes, as accepted by ``add_argument(action=...)``
+_ACTION_NAMES: dict[type[argparse.Action], str] = {
+    argparse._StoreAction: "store",
+    argparse._StoreConstAction: "store_const",
+    argparse._StoreTrueAction: "store_true",
+    argparse._StoreFalseAction: "store_false",
+    argparse._AppendAction: "append",
+    argparse._AppendConstAction: "append_const",
+    argparse._CountAction: "count",
+    argparse._HelpAction: "help",
+    argparse._VersionAction: "version",
+    argparse._SubParsersAction: "parsers",
+    argparse._ExtendAction: "extend",
+    argparse.BooleanOptionalAction: "boolean_optional",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ArgumentSpec:
+    """One argument of a parser.
+
+    Attributes:
+        dest: Destination name, or ``argparse.SUPPRESS`` for ``add_subparsers()``
+              without ``dest``
+        option_strings: Option strings; empty for positionals
+        action: Action name (``"store"``, ``"store_true"``, ``"append"``,
+                ``"parsers"``, ...); custom actions use their nearest argparse
+                base class and fall back to ``"store"``
+        type: ``"int"``, ``"float"``, ``"path"`` or ``"file"`` (FileType);
+              ``None`` for strings and other converters
+        file_mode: Mode of a FileType ``type``
+        nargs: argparse ``nargs``
+        default: Default value; ``None`` when there is none
+        choices: Allowed values as strings, or a :class:`range`
+        required: Whether argparse requires the argument
+        help: Expanded help text; ``None`` when hidden with ``argparse.SUPPRESS``
+        completer: ``"module:qualname"`` of the argument's completion callable
+        subcommands: Subcommands of a ``"parsers"`` argument
+    """
+
+    dest: str
+    option_strings: tuple[str, ...] = ()
+    action: str = "store"
+    type: str | None = None
+    file_mode: str | None = None
+    nargs: int | str | None = None
+    default: Any = None
+    choices: tuple[str, ...] | range | None = None
+    required: bool = False
+    help: str | None = ""
+    completer: str | None = None
+    subcommands: tuple[SubcommandSpec, ...] = ()
+
+    @property
+    def is_switch(self) -> bool:
+        return self.action in ("store_true", "store_false")
+
+    @property
+    def positional(self) -> bool:
+        return not self.option_strings
+
+
+@dataclass(frozen=True, slots=True)
+class SubcommandSpec:
+    """One subcommand; ``names`` lists the name followed by its aliases."""
+
+    names: tuple[str, ...]
+    arguments: tuple[ArgumentSpec, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class GroupSpec:
+    """A mutually exclusive group; ``members`` index into ``WrapperSpec.arguments``."""
+
+    members: tuple[int, ...]
+    required: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class WrapperSpec:
+    """Everything the renderer reads from a parser.
+
+    Attributes:
+        prog: Program name
+        description: Parser description
+        epilog: Parser epilog
+        help_text: Output of ``parser.format_help()``
+        arguments: Arguments in declaration order
+        groups: Mutually exclusive groups
+    """
+
+    prog: str
+    description: str | None = None
+    epilog: str | None = None
+    help_text: str = ""
+    arguments: tuple[ArgumentSpec, ...] = ()
+    groups: tuple[GroupSpec, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-compatible dict; fields at their default are omitted."""
+        data: dict[str, Any] = {"version": SPEC_VERSION, "prog": self.prog}
+        if self.description is not None:
+            data["description"] = self.description
+        if self.epilog is not None:
+            data["epilog"] = self.epilog
+        if self.help_text:
+            data["help_text"] = self.help_text
+        data["arguments"] = [_argument_to_dict(a) for a in self.arguments]
+        if self.groups:
+            data["groups"] = [
+                {"members": list(g.members), "required": g.required}
+                for g in self.groups
+            ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> WrapperSpec:
+        """Build a spec from :meth:`to_dict` output.
+
+        Raises:
+            ValueError: If ``data`` is not a spec of a supported version
+        """
+        if data.get("version") != SPEC_VERSION:
+            raise ValueError(
+                f"Error: unsupported wrapper spec version {data.get('version')!r} "
+                f"(expected {SPEC_VERSION}).\n"
+                f"\n"
+                f"Possible solutions:\n"
+                f"  1. Regenerate the spec with this version of argparse-ps1"
+            )
+        try:
+            return cls(
+                prog=data["prog"],
+                description=data.get("description"),
+                epilog=data.get("epilog"),
+                help_text=data.get("help_text", ""),
+                arguments=tuple(_argument_from_dict(a) for a in data["arguments"]),
+                groups=tuple(
+                    GroupSpec(tuple(g["members"]), g.get("required", False))
+                    for g in data.get("groups", ())
+                ),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Error: invalid wrapper spec: {e!r}") from e
+
+
+def extract_spec(
+    parser: argparse.ArgumentParser, *, format_help: bool = True
+) -> WrapperSpec:
+    """Describe ``parser`` as a :class:`WrapperSpec`.
+
+    Args:
+        parser: Parser to describe
+        format_help: Store ``parser.format_help()`` as ``help_text``, which
+                     only wrappers with ``embed_help`` use. Formatting dominates
+                     extraction time for parsers with thousands of options.
+    """
+    index = {id(action): i for i, action in enumerate(parser._actions)}
+    groups = tuple(
+        GroupSpec(
+            tuple(index[id(a)] for a in group._group_actions if id(a) in index),
+            group.required,
+        )
+        for group in parser._mutually_exclusive_groups
+    )
+    return WrapperSpec(
+        prog=parser.prog,
+        description=parser.description,
+        epilog=parser.epilog,
+        help_text=parser.format_help() if format_help else "",
+        arguments=_extract_arguments(parser),
+        groups=groups,
+    )
+
+
+def dump_spec(spec: WrapperSpec, path: Path) -> None:
+    """Write ``spec`` to ``path`` as JSON."""
+    path.write_text(
+        json.dumps(spec.to_dict(), indent=1, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+
+
+def load_spec(path: Path) -> WrapperSpec:
+    """Read a spec written by :func:`dump_spec`.
+
+    Raises:
+        ValueError: If the file is not valid JSON or not a supported spec
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Error: invalid wrapper spec {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Error: invalid wrapper spec {path}: not a JSON object")
+    return WrapperSpec.from_dict(data)
+
+
+def callable_reference(function: Callable[..., Any]) -> str:
+    """Return ``"module:qualname"`` for ``function``, or its repr if unnamed."""
+    module = getattr(function, "__module__", None)
+    qualname = getattr(function, "__qualname__", None)
+    if module and qualname:
+        return f"{module}:{qualname}"
+    return repr(function)
+
+
+def _extract_arguments(parser: argparse.ArgumentParser) -> tuple[ArgumentSpec, ...]:
+    formatter = parser._get_formatter()
+    return tuple(_extract_argument(action, formatter) for action in parser._actions)
+
+
+def _extract_argument(
+    action: argparse.Action, formatter: argparse.HelpFormatter
+) -> ArgumentSpec:
+    subcommands: tuple[SubcommandSpec, ...] = ()
+    choices: tuple[str, ...] | range | None = None
+    if isinstance(action, argparse._SubParsersAction):
+        # Aliases map to the same parser object as their subcommand
+        names: dict[int, list[str]] = {}
+        parsers: dict[int, argparse.ArgumentParser] = {}
+        for name, subparser in action.choices.items():
+            names.setdefault(id(subparser), []).append(name)
+            parsers[id(subparser)] = subparser
+        subcommands = tuple(
+            SubcommandSpec(tuple(names[key]), _extract_arguments(parsers[key]))
+            for key in names
+        )
+        choices = tuple(action.choices)
+    elif isinstance(action.choices, range):
+        choices = action.choices
+    elif action.choices is not None:
+        choices = tuple(str(choice) for choice in action.choices)
+
+    help_text: str | None
+    if action.help == argparse.SUPPRESS:
+        help_text = None
+    else:
+        try:
+            help_text = formatter._expand_help(action) if action.help else ""
+        except (KeyError, TypeError, ValueError):
+            help_text = action.help or ""
+
+    completer = getattr(action, "completer", None)
+    return ArgumentSpec(
+        dest=action.dest,
+        option_strings=tuple(action.option_strings),
+        action=_action_kind(action),
+        type=_type_kind(action.type),
+        file_mode=(
+            getattr(action.type, "_mode", None)
+            if isinstance(action.type, argparse.FileType)
+            else None
+        ),
+        nargs=action.nargs,
+        default=_plain_value(action.default),
+        choices=choices,
+        required=action.required,
+        help=help_text,
+        completer=callable_reference(completer) if callable(completer) else None,
+        subcommands=subcommands,
+    )
+
+
+def _action_kind(action: argparse.Action) -> str:
+    for cls in type(action).__mro__:
+        name = _ACTION_NAMES.get(cls)
+        if name is not None:
+            return name
+    return "store"
+
+
+def _type_kind(python_type: object) -> str | None:
+    if python_type is int:
+        return "int"
+    if python_type is float:
+        return "float"
+    if python_type is Path:
+        return "path"
+    if isinstance(python_type, argparse.FileType):
+        return "file"
+    return None
+
+
+def _plain_value(value: object) -> Any:
+    """Reduce a default to a JSON value; other objects become their ``str()``."""
+    if value is None or (isinstance(value, str) and value == argparse.SUPPRESS):
+        return None
+    if isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, list | tuple):
+        return [_plain_value(item) for item in value]  # type: ignore
+    return str(value)
+
+
+def _argument_to_dict(argument: ArgumentSpec) -> dict[str, Any]:
+    data: dict[str, Any] = {"dest": argument.dest}
+    if argument.option_strings:
+        data["option_strings"] = list(argument.option_strings)
+    if argument.action != "store":
+        data["action"] = argument.action
+    for name in ("type", "file_mode", "nargs", "default", "completer"):
+        value = getattr(argument, name)
+        if value is not None:
+            data[name] = value
+    if isinstance(argument.choices, range):
+        choices = argument.choices
+        data["choices"] = {"range": [choices.start, choices.stop, choices.step]}
+    elif argument.choices is not None:
+        data["choices"] = list(argument.choices)
+    if argument.required:
+        data["required"] = True
+    if argument.help != "":
+        data["help"] = argument.help
+    if argument.subcommands:
+        data["subcommands"] = [
+            {
+                "names": list(sub.names),
+                "arguments": [_argument_to_dict(a) for a in sub.arguments],
+            }
+            for sub in argument.subcommands
+        ]
+    return data
+
+
+def _argument_from_dict(data: Mapping[str, Any]) -> ArgumentSpec:
+    choices = data.get("choices")
+    if isinstance(choices, dict):
+        choices = range(*choices["range"])
+    elif choices is not None:
+        choices = tuple(str(choice) for choice in choices)
+    return ArgumentSpec(
+        dest=data["dest"],
+        option_strings=tuple(data.get("option_strings", ())),
+        action=data.get("action", "store"),
+        type=data.get("type"),
+        file_mode=data.get("file_mode"),
+        nargs=data.get("nargs"),
+        default=data.get("default"),
+        choices=choices,
+        required=data.get("required", False),
+        help=data.get("help", ""),
+        completer=data.get("completer"),
+        subcommands=tuple(
+            SubcommandSpec(
+                tuple(sub["names"]),
+                tuple(_argument_from_dict(a) for a in sub.get("arguments", ())),
+            )
+            for sub in data.get("subcommands", ())
+        ),
+    )
@@ -0,0 +1,439 @@
+"""Rebuild a script's :class:`argparse.ArgumentParser` from its source code.
+
+:func:`extract_parser` reads the script with :mod:`ast` and replays literal
+``ArgumentParser(...)``, ``add_argument(...)``, ``add_argument_group(...)``,
+``add_mutually_exclusive_group(...)`` and ``set_defaults(...)`` calls on a
+fresh parser, so the script and its dependencies are never imported.
+
+Only values that can be evaluated without running code are accepted: literals,
+``int``/``float``/``str``/``bool``/``Path`` types, ``Path("...")`` defaults,
+``argparse`` constants, module-level literal constants and ``range``/``list``/
+``tuple``/``sorted`` over those. Subcommands created with
+``add_subparsers(...)``/``add_parser(...)`` are replayed the same way;
+``set_defaults`` values that cannot be evaluated (typically ``func=handler``)
+are dropped, as they never reach the command line. Anything else (custom
+``type`` callables, parsers or groups passed to helper functions, returned or
+aliased, calls inside loops or conditionals, ...) makes static extraction
+fail, and :func:`extract_parser` falls back to running the script up to its
+``parse_args`` call. Only :func:`argparse_ps1.install` and
+:func:`argparse_ps1.trace_timing` may receive the parser, as they add nothing
+that reaches the wrapper.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import pathlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .capture import capture_script
+
+
+class StaticExtractionError(ValueError):
+    """The script's parser cannot be rebuilt without running the script."""
+
+    def __init__(self, script_path: Path, node: ast.AST | None, reason: str):
+        location = f"{script_path}:{getattr(node, 'lineno', '?')}"
+        super().__init__(
+            f"Error: cannot extract parser statically ({location}): {reason}"
+        )
+        self.script_path = script_path
+        self.reason = reason
+
+
+def extract_parser(
+    script_path: Path, *, allow_import: bool = True
+) -> argparse.ArgumentParser:
+    """Return the parser built by ``script_path``, preferring static extraction.
+
+    Args:
+        script_path: Path to the Python script
+        allow_import: Run the script up to ``parse_args`` when static
+                      extraction is not possible (default: True)
+
+    Raises:
+        StaticExtractionError: If static extraction fails and ``allow_import``
+                               is False
+    """
+    try:
+        return extract_parser_static(script_path)
+    except StaticExtractionError:
+        if not allow_import:
+            raise
+    return capture_script(script_path)
+
+
+def extract_parser_static(
+    script_path: Path, *, prog: str | None = None
+) -> argparse.ArgumentParser:
+    """Rebuild the parser of ``script_path`` from its source without importing it.
+
+    Args:
+        script_path: Path to the Python script
+        prog: Program name for parsers that do not set ``prog`` themselves
+              (default: the script's file name, as when it is run)
+
+    Raises:
+        StaticExtractionError: If the parser uses constructs that cannot be
+                               evaluated statically
+    """
+    source = script_path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(script_path))
+    return _Extractor(script_path, tree, prog or script_path.name).run()
+
+
+_ALLOWED_MODULES: dict[str, Any] = {"argparse": argparse, "pathlib": pathlib}
+
+_BUILTIN_NAMES: dict[str, Any] = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "bool": bool,
+    "None": None,
+    "True": True,
+    "False": False,
+    "range": range,
+    "list": list,
+    "tuple": tuple,
+    "sorted": sorted,
+}
+
+_ALLOWED_CALLS = frozenset({pathlib.Path, pathlib.PurePath, range, list, tuple, sorted})
+
+# Keyword arguments whose value only affects help output; an unevaluable
+# value (e.g. an f-string) is dropped instead of aborting static extraction.
+_TEXT_KEYWORDS = frozenset({"help", "description", "epilog", "usage", "metavar"})
+
+_PARSER_METHODS = frozenset(
+    {
+        "add_argument",
+        "add_argument_group",
+        "add_mutually_exclusive_group",
+        "add_subparsers",
+        "add_parser",
+        "set_defaults",
+    }
+)
+
+# Methods whose result is bound to a name for later calls
+_BINDING_METHODS = frozenset(
+    {
+        "add_argument_group",
+        "add_mutually_exclusive_group",
+        "add_subparsers",
+        "add_parser",
+    }
+)
+
+# argparse_ps1 functions that take the parser without adding wrapper arguments
+_ARGPARSE_PS1_HELPERS = frozenset({"install", "trace_timing"})
+
+# Statements whose body may run zero or many times
+_DYNAMIC_NODES = (
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.If,
+    ast.IfExp,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.Lambda,
+)
+
+
+def _is_main_guard(node: ast.AST) -> bool:
+    """Check for ``if __name__ == "__main__":``, which runs exactly once."""
+    if not isinstance(node, ast.If):
+        return False
+    test = node.test
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and isinstance(test.comparators[0], ast.Constant)
+        and test.comparators[0].value == "__main__"
+    )
+
+
+class _Unsupported(Exception):
+    def __init__(self, node: ast.AST, reason: str):
+        super().__init__(reason)
+        self.node = node
+        self.reason = reason
+
+
+class _Extractor:
+    def __init__(self, script_path: Path, tree: ast.Module, prog: str):
+        self.script_path = script_path
+        self.prog = prog
+        self.tree = tree
+        self.names: dict[str, Any] = dict(_BUILTIN_NAMES)
+        self.bindings: dict[str, Any] = {}
+        self.parser: argparse.ArgumentParser | None = None
+        # Local names of argparse_ps1 and of its _ARGPARSE_PS1_HELPERS
+        self.helper_modules: set[str] = set()
+        self.helpers: set[str] = set()
+        self.parents: dict[ast.AST, ast.AST] = {}
+        for parent in ast.walk(tree):
+            for child in ast.iter_child_nodes(parent):
+                self.parents[child] = parent
+
+    def run(self) -> argparse.ArgumentParser:
+        try:
+            self._collect_module_names()
+            calls = [node for node in ast.walk(self.tree) if isinstance(node, ast.Call)]
+            calls.sort(key=lambda node: (node.lineno, node.col_offset))
+            for call in calls:
+                self._visit_call(call)
+            self._check_escapes()
+        except _Unsupported as e:
+            raise StaticExtractionError(self.script_path, e.node, e.reason) from None
+
+        if self.parser is None:
+            raise StaticExtractionError(
+                self.script_path, None, "no ArgumentParser construction found"
+            )
+        return self.parser
+
+    def _collect_module_names(self) -> None:
+        """Resolve imports and module-level literal constants."""
+        for node in self.tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name == "argparse_ps1":
+                        self.helper_modules.add(alias.asname or alias.name)
+                    module = _ALLOWED_MODULES.get(alias.name)
+                    if module is not None:
+                        self.names[alias.asname or alias.name] = module
+            elif isinstance(node, ast.ImportFrom) and node.module == "argparse_ps1":
+                self.helpers.update(
+                    alias.asname or alias.name
+                    for alias in node.names
+                    if alias.name in _ARGPARSE_PS1_HELPERS
+                )
+            elif isinstance(node, ast.ImportFrom) and node.module in _ALLOWED_MODULES:
+                module = _ALLOWED_MODULES[node.module]
+                for alias in node.names:
+                    if hasattr(module, alias.name):
+                        self.names[alias.asname or alias.name] = getattr(
+                            module, alias.name
+                        )
+            elif (
+                isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+            ):
+                try:
+                    self.names[node.targets[0].id] = self._evaluate(node.value)
+                except _Unsupported:
+                    # Not a constant; only an error if an argument refers to it
+                    self.names.pop(node.targets[0].id, None)
+
+    def _check_escapes(self) -> None:
+        """Reject parsers, groups and subparsers that reach code not replayed here.
+
+        A parser passed to a helper (``add_common_args(parser)``), returned or
+        assigned to another name may gain arguments this extractor never sees.
+        """
+        for node in ast.walk(self.tree):
+            if not (
+                isinstance(node, ast.Name)
+                and isinstance(node.ctx, ast.Load)
+                and node.id in self.bindings
+            ):
+                continue
+            parent = self.parents.get(node)
+            if isinstance(parent, ast.Attribute) and parent.value is node:
+                continue
+            if self._is_helper_call(parent) and node in parent.args:
+                continue
+            raise _Unsupported(
+                node,
+                f"'{node.id}' is used outside of its own method calls "
+                f"(e.g. passed to a function), so its arguments may be incomplete",
+            )
+        for call in ast.walk(self.tree):
+            if not (
+                isinstance(call, ast.Call)
+                and isinstance(call.func, ast.Attribute)
+                and call.func.attr in _BINDING_METHODS
+                and isinstance(call.func.value, ast.Name)
+                and call.func.value.id in self.bindings
+            ):
+                continue
+            parent = self.parents.get(call)
+            if not isinstance(
+                parent, ast.Expr | ast.Assign | ast.AnnAssign | ast.NamedExpr
+            ):
+                raise _Unsupported(
+                    call,
+                    f"result of '{call.func.attr}' is used without being assigned "
+                    f"to a name",
+                )
+
+    def _is_helper_call(self, node: ast.AST | None) -> bool:
+        if not isinstance(node, ast.Call):
+            return False
+        func = node.func
+        if isinstance(func, ast.Name):
+            return func.id in self.helpers
+        return (
+            isinstance(func, ast.Attribute)
+            and func.attr in _ARGPARSE_PS1_HELPERS
+            and isinstance(func.value, ast.Name)
+            and func.value.id in self.helper_modules
+        )
+
+    def _visit_call(self, call: ast.Call) -> None:
+        func = call.func
+        if self._is_parser_class(func):
+            self._create_parser(call)
+            return
+
+        if not isinstance(func, ast.Attribute):
+            return
+        method = func.attr
+        if method not in _PARSER_METHODS:
+            return
+        if not isinstance(func.value, ast.Name):
+            raise _Unsupported(call, f"'{method}' called on a computed expression")
+
+        target = self.bindings.get(func.value.id)
+        if target is None:
+            raise _Unsupported(
+                call, f"'{func.value.id}.{method}' does not refer to a known parser"
+            )
+        self._check_static_context(call)
+
+        droppable = _TEXT_KEYWORDS
+        if method == "set_defaults":
+            # Values for dests without an argument only reach the namespace
+            dests = {action.dest for action in getattr(target, "_actions", ())}
+            droppable = frozenset(
+                keyword.arg
+                for keyword in call.keywords
+                if keyword.arg is not None and keyword.arg not in dests
+            )
+        args, kwargs = self._evaluate_arguments(call, droppable)
+        try:
+            result = getattr(target, method)(*args, **kwargs)
+        except (AttributeError, TypeError, ValueError, argparse.ArgumentError) as e:
+            raise _Unsupported(call, str(e)) from e
+        if method in _BINDING_METHODS:
+            self._bind_result(call, result)
+
+    def _create_parser(self, call: ast.Call) -> None:
+        if self.parser is not None:
+            raise _Unsupported(call, "more than one ArgumentParser is created")
+        self._check_static_context(call)
+        args, kwargs = self._evaluate_arguments(call)
+        # Not the argv[0] of the process doing the extraction
+        if not args:
+            kwargs.setdefault("prog", self.prog)
+        try:
+            self.parser = argparse.ArgumentParser(*args, **kwargs)
+        except (TypeError, ValueError) as e:
+            raise _Unsupported(call, str(e)) from e
+        self._bind_result(call, self.parser)
+
+    def _bind_result(self, call: ast.Call, value: Any) -> None:
+        parent = self.parents.get(call)
+        if isinstance(parent, ast.Assign) and len(parent.targets) == 1:
+            target = parent.targets[0]
+        elif isinstance(parent, ast.AnnAssign | ast.NamedExpr):
+            target = parent.target
+        else:
+            return
+        if isinstance(target, ast.Name):
+            self.bindings[target.id] = value
+
+    def _check_static_context(self, call: ast.Call) -> None:
+        node: ast.AST = call
+        while node in self.parents:
+            node = self.parents[node]
+            if isinstance(node, _DYNAMIC_NODES) and not _is_main_guard(node):
+                raise _Unsupported(call, "call is inside a loop or conditional")
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                return
+
+    def _is_parser_class(self, node: ast.expr) -> bool:
+        try:
+            return self._evaluate(node) is argparse.ArgumentParser
+        except _Unsupported:
+            return False
+
+    def _evaluate_arguments(
+        self, call: ast.Call, droppable: frozenset[str] = _TEXT_KEYWORDS
+    ) -> tuple[list[Any], dict[str, Any]]:
+        args: list[Any] = []
+        for arg in call.args:
+            if isinstance(arg, ast.Starred):
+                raise _Unsupported(call, "starred arguments are not supported")
+            args.append(self._evaluate(arg))
+
+        kwargs: dict[str, Any] = {}
+        for keyword in call.keywords:
+            if keyword.arg is None:
+                raise _Unsupported(call, "**kwargs are not supported")
+            try:
+                kwargs[keyword.arg] = self._evaluate(keyword.value)
+            except _Unsupported:
+                if keyword.arg not in droppable:
+                    raise
+        return args, kwargs
+
+    def _evaluate(self, node: ast.expr) -> Any:
+        try:
+            return self._evaluate_node(node)
+        except (ArithmeticError, LookupError, TypeError, ValueError) as e:
+            # e.g. int("x") or an unhashable dict key: a literal that fails
+            # to evaluate is reported at its own line like any other
+            raise _Unsupported(node, f"{type(e).__name__}: {e}") from e
+
+    def _evaluate_node(self, node: ast.expr) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.List | ast.Tuple | ast.Set):
+            items = [self._evaluate(item) for item in node.elts]
+            if isinstance(node, ast.Tuple):
+                return tuple(items)
+            return set(items) if isinstance(node, ast.Set) else items
+        if isinstance(node, ast.Dict):
+            if any(key is None for key in node.keys):
+                raise _Unsupported(node, "dict unpacking is not supported")
+            return {
+                self._evaluate(key): self._evaluate(value)
+                for key, value in zip(node.keys, node.values, strict=True)
+                if key is not None
+            }
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = self._evaluate(node.operand)
+            if isinstance(operand, int | float):
+                return -operand
+        if isinstance(node, ast.Name):
+            if node.id in self.names:
+                return self.names[node.id]
+            raise _Unsupported(node, f"name '{node.id}' is not a static value")
+        if isinstance(node, ast.Attribute):
+            base = self._evaluate(node.value)
+            if base in _ALLOWED_MODULES.values() and hasattr(base, node.attr):
+                return getattr(base, node.attr)
+            raise _Unsupported(node, f"attribute '{node.attr}' is not a static value")
+        if isinstance(node, ast.Call):
+            func = self._evaluate_callable(node.func)
+            args, kwargs = self._evaluate_arguments(node)
+            return func(*args, **kwargs)
+        raise _Unsupported(node, f"{type(node).__name__} is not a static value")
+
+    def _evaluate_callable(self, node: ast.expr) -> Callable[..., Any]:
+        func = self._evaluate(node)
+        if callable(func) and func in _ALLOWED_CALLS:
+            return func
+        raise _Unsupported(node, "call is not a static value")
@@ -0,0 +1,56 @@
+"""Report the Python side of a wrapper run with ``-TraceTiming``.
+
+A wrapper generated with ``trace_timing`` accepts ``-TraceTiming``, which
+prints how long each phase of the invocation took to stderr. It times its own
+phases and passes the path of a file in ``ARGPARSE_PS1_TRACE``, where
+:func:`trace_timing` records when the parser was built and when
+``parse_args`` returned. That splits the launch (uv, interpreter startup and
+the script's imports) from the script's own work. :func:`argparse_ps1.install`
+calls it; other scripts call it before parsing::
+
+    parser = argparse.ArgumentParser()
+    ...
+    argparse_ps1.trace_timing(parser)
+    args = parser.parse_args()
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from typing import Any
+
+# Environment variable holding the file the wrapper reads timestamps from
+TRACE_ENV = "ARGPARSE_PS1_TRACE"
+
+
+def trace_timing(parser: argparse.ArgumentParser) -> None:
+    """Record when ``parser`` was built and when it first returns parsed arguments.
+
+    Does nothing unless the wrapper was called with ``-TraceTiming``. The
+    environment variable is removed, so Python processes the script starts
+    do not add their own timestamps.
+    """
+    path = os.environ.pop(TRACE_ENV, None)
+    if not path:
+        return
+    _record(path, "parser")
+    parse_known_args = parser.parse_known_args
+
+    # parse_args() calls parse_known_args(), so this covers both
+    def traced(*args: Any, **kwargs: Any) -> Any:
+        result = parse_known_args(*args, **kwargs)
+        del parser.parse_known_args
+        _record(path, "parse_args")
+        return result
+
+    parser.parse_known_args = traced
+
+
+def _record(path: str, event: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:  # noqa: PTH123 - no pathlib
+        f.write(f'{{"event": "{event}", "time": {time.time()!r}}}\n')
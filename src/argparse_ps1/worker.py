@@ -0,0 +1,319 @@
+"""Persistent worker that runs a command in an already warm Python process.
+
+Start one worker per command, next to a wrapper generated with
+``worker=True``::
+
+    python -m argparse_ps1.worker --state-file bin/.My-Tool.worker.json pkg.cli:main
+
+The worker imports the target once and listens on a localhost TCP port. Its
+port and a random access token are written to the state file, where the
+wrapper finds them. On POSIX the file is readable only by the current user; on
+Windows it inherits the ACL of its directory, so keep the wrappers (and the
+state file) in a directory other users cannot read. Each request is one JSON line
+``{"token": ..., "argv": [...], "cwd": ...}``; the worker answers with JSON
+lines ``{"stream": "stdout" | "stderr", "data": ...}`` and a final
+``{"exit": code}``. Requests are served one at a time, in-process, so the
+target's module-level state persists between calls.
+
+:func:`call` is the Python equivalent of the wrapper's client: it returns
+``None`` when no worker answers, so callers can fall back to a cold start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hmac
+import io
+import json
+import os
+import runpy
+import secrets
+import socket
+import sys
+import traceback
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO
+
+from .capture import load_entry_point
+
+_HOST = "127.0.0.1"
+
+# Output is sent at line ends, or in chunks of this many characters
+_FRAME_SIZE = 8192
+
+
+def serve(
+    target: str,
+    *,
+    state_file: Path,
+    prog: str | None = None,
+    port: int = 0,
+    idle_timeout: float | None = None,
+) -> None:
+    """Serve ``target`` until interrupted or idle for ``idle_timeout`` seconds.
+
+    Args:
+        target: ``module:function`` entry point, imported once at startup, or
+                a script path, run as ``__main__`` for every request
+        state_file: File that receives the port and access token
+        prog: Value for ``sys.argv[0]`` (default: ``target``)
+        port: TCP port on 127.0.0.1 (default: any free port)
+        idle_timeout: Stop after this many seconds without a request
+                      (default: never)
+    """
+
+    run = _load_target(target)
+    token = secrets.token_hex(16)
+    with socket.create_server((_HOST, port)) as server:
+        server.settimeout(idle_timeout)
+        _write_state(
+            state_file,
+            {
+                "pid": os.getpid(),
+                "port": server.getsockname()[1],
+                "token": token,
+                "target": target,
+            },
+        )
+        try:
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except TimeoutError:
+                    break
+                with connection:
+                    connection.settimeout(None)
+                    _handle(connection, run, token, prog or target)
+        finally:
+            state_file.unlink(missing_ok=True)
+
+
+def call(
+    state_file: Path,
+    argv: Sequence[str],
+    *,
+    cwd: Path | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+    timeout: float | None = None,
+) -> int | None:
+    """Run ``argv`` in the worker described by ``state_file``.
+
+    Args:
+        state_file: State file written by :func:`serve`
+        argv: Command-line arguments (without the program name)
+        cwd: Working directory for the command (default: current directory)
+        stdout: Receives the command's standard output (default: sys.stdout)
+        stderr: Receives the command's standard error (default: sys.stderr)
+        timeout: Seconds to wait for the connection and for each response line
+
+    Returns:
+        The command's exit code, or ``None`` if no worker accepted the request
+        (nothing ran; start the command normally instead).
+
+    Raises:
+        ConnectionError: If the worker stopped answering mid-command
+    """
+
+    try:
+        state = json.loads(state_file.read_text(encoding="utf-8"))
+        connection = socket.create_connection((_HOST, int(state["port"])), timeout)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    outputs = {"stdout": stdout or sys.stdout, "stderr": stderr or sys.stderr}
+    with connection, connection.makefile("rwb") as stream:
+        request = {
+            "token": state.get("token", ""),
+            "argv": [str(arg) for arg in argv],
+            "cwd": str(cwd or Path.cwd()),
+        }
+        try:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+        except OSError:
+            return None
+
+        received = False
+        for line in stream:
+            received = True
+            frame = json.loads(line)
+            if "exit" in frame:
+                return int(frame["exit"])
+            outputs[frame["stream"]].write(frame["data"])
+
+    if not received:
+        # Rejected (e.g. a stale state file): the command never started
+        return None
+    raise ConnectionError("Error: worker connection closed before the command finished")
+
+
+def _load_target(target: str) -> Callable[[], object]:
+    script_path = Path(target)
+    if script_path.suffix == ".py" or script_path.is_file():
+        resolved = str(script_path.resolve())
+        sys.path.insert(0, str(script_path.resolve().parent))
+        return lambda: runpy.run_path(resolved, run_name="__main__")
+    return load_entry_point(target)
+
+
+def _write_state(state_file: Path, state: dict[str, Any]) -> None:
+    """Write ``state``, replacing any old file.
+
+    Mode 0o600 keeps the token private on POSIX. Windows ignores it, and the
+    file gets the ACL its directory passes on.
+    """
+    temp_path = state_file.with_name(f"{state_file.name}.{os.getpid()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    temp_path.replace(state_file)
+
+
+def _handle(
+    connection: socket.socket, run: Callable[[], object], token: str, prog: str
+) -> None:
+    with connection.makefile("rwb") as stream:
+        try:
+            request = json.loads(stream.readline())
+        except ValueError:
+            return
+        if not isinstance(request, dict) or not hmac.compare_digest(
+            str(request.get("token", "")), token
+        ):
+            return
+
+        stdout = _FrameWriter(stream, "stdout")
+        stderr = _FrameWriter(stream, "stderr")
+        exit_code = _run(
+            run,
+            [prog, *(str(arg) for arg in request.get("argv", []))],
+            request.get("cwd"),
+            stdout,
+            stderr,
+        )
+        stdout.flush()
+        stderr.flush()
+        with contextlib.suppress(OSError):
+            _send(stream, {"exit": exit_code})
+
+
+def _run(
+    run: Callable[[], object],
+    argv: list[str],
+    cwd: str | None,
+    stdout: _FrameWriter,
+    stderr: _FrameWriter,
+) -> int:
+    """Run the target like ``python <target> <argv>`` and return its exit code."""
+    saved_argv = sys.argv
+    saved_cwd = Path.cwd()
+    saved_stdin, saved_stdout, saved_stderr = sys.stdin, sys.stdout, sys.stderr
+    sys.argv = argv
+    sys.stdin = io.StringIO()
+    sys.stdout, sys.stderr = stdout, stderr  # type: ignore
+    try:
+        if cwd:
+            os.chdir(cwd)
+        run()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=stderr)
+        return 1
+    except Exception:
+        traceback.print_exc(file=stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+        sys.stdin, sys.stdout, sys.stderr = saved_stdin, saved_stdout, saved_stderr
+        os.chdir(saved_cwd)
+    return 0
+
+
+def _send(stream: BinaryIO, frame: dict[str, Any]) -> None:
+    stream.write(json.dumps(frame).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards its output to the client as frames."""
+
+    def __init__(self, stream: BinaryIO, name: str) -> None:
+        self._stream = stream
+        self._name = name
+        self._buffer: list[str] = []
+        self._size = 0
+        self._closed_by_client = False
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        self._size += len(text)
+        if "\n" in text or self._size >= _FRAME_SIZE:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        if self._closed_by_client:
+            return
+        try:
+            _send(self._stream, {"stream": self._name, "data": data})
+        except OSError:
+            # The client went away; let the command finish without output
+            self._closed_by_client = True
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m argparse_ps1.worker",
+        description="Serve a command from a persistent Python process.",
+    )
+    parser.add_argument(
+        "target", help="Entry point (module:function) or path to a Python script"
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        required=True,
+        help="State file the wrapper reads (.<Wrapper>.worker.json next to it)",
+    )
+    parser.add_argument("--prog", help="Program name passed as sys.argv[0]")
+    parser.add_argument(
+        "--port", type=int, default=0, help="TCP port on 127.0.0.1 (default: any)"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        help="Stop after this many seconds without a request",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        serve(
+            args.target,
+            state_file=args.state_file,
+            prog=args.prog,
+            port=args.port,
+            idle_timeout=args.idle_timeout,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
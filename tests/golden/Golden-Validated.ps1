@@ -0,0 +1,63 @@
+#!/usr/bin/env pwsh
+
+# Direct script mode: Execute Python file directly
+
+[CmdletBinding(DefaultParameterSetName = "Run")]
+param(
+    [Parameter(ParameterSetName = "Help")]
+    [switch]$Help,
+    [Parameter(Mandatory, ParameterSetName = "Run")]
+    [string]$Source,
+    [string]$Target = 'out.txt',
+    [int]$Count = 3,
+    [double]$Rate,
+    [ValidateSet("fast", "slow")]
+    [string]$Mode = 'fast',
+    [switch]$DryRun,
+    [switch]$Color,
+    [string]$LogFile,
+    [ValidateRange(1, 3)]
+    [ArgumentCompleter({
+        param($CommandName, $ParameterName, $WordToComplete)
+        @('1', '2', '3') |
+            Where-Object { $_.StartsWith($WordToComplete, [System.StringComparison]::OrdinalIgnoreCase) } |
+            ForEach-Object { if ($_ -match '\s') { "'$($_ -replace "'", "''")'" } else { $_ } }
+    })]
+    [int]$Level,
+    [switch]$Quiet
+)
+
+
+# Set script path
+$ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
+$ScriptPath = (Join-Path $ScriptDir "golden.py")
+
+
+# Display help
+if ($Help) {
+    $HelpArgs = @("run", $ScriptPath, "--help")
+    & "uv" @HelpArgs
+    exit 0
+}
+
+# Set PowerShell output encoding to UTF-8
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+$OutputEncoding = [System.Text.Encoding]::UTF8
+
+# Set Python output encoding to UTF-8
+$env:PYTHONIOENCODING = "utf-8"
+
+$Arguments = @("run", $ScriptPath)
+$Arguments += $Source
+$Arguments += $Target
+if ($Count -ne 3) { $Arguments += "--count", $Count }
+if ($PSBoundParameters.ContainsKey("Rate")) { $Arguments += "--rate", $Rate }
+if ($Mode -ne 'fast') { $Arguments += "--mode", $Mode }
+if ($DryRun) { $Arguments += "--dry-run" }
+if ($Color) { $Arguments += "--no-color" }
+if (-not [string]::IsNullOrEmpty($LogFile)) { $Arguments += "--log-file", (Resolve-Path $LogFile).Path }
+if ($PSBoundParameters.ContainsKey("Level")) { $Arguments += "--level", $Level }
+if ($PSBoundParameters["Verbose"]) { $Arguments += "--verbose" }
+if ($Quiet) { $Arguments += "--quiet" }
+& "uv" @Arguments
+exit $LASTEXITCODE
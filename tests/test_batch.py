@@ -0,0 +1,188 @@
+"""Tests for batch wrapper generation."""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from argparse_ps1 import WrapperJob, batch, generate_ps1_wrappers, manifest
+
+PYPROJECT_CONTENT = """
+[project]
+name = "test-project"
+version = "0.1.2"
+
+[project.scripts]
+tool-a = "pkg.a:main"
+tool-b = "pkg.b:main"
+"""
+
+
+def _make_parser(option: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(f"--{option}", type=int)
+    return parser
+
+
+def test_generate_many_wrappers_in_order():
+    """Results are returned per job, in job order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        jobs = [
+            (_make_parser(f"opt{i}"), root / f"script_{i}.py", {"output_dir": root})
+            for i in range(20)
+        ]
+
+        results = generate_ps1_wrappers(jobs, max_workers=4)
+
+        assert [r.ok for r in results] == [True] * 20
+        for i, result in enumerate(results):
+            assert result.output_path == root / f"Script-{i}.ps1"
+            content = result.output_path.read_text(encoding="utf-8-sig")
+            assert f"[int]$Opt{i}" in content
+
+
+def test_project_mode_jobs_share_discovery():
+    """Project mode jobs resolve against the same pyproject.toml."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "pyproject.toml").write_text(PYPROJECT_CONTENT, encoding="utf-8")
+        (root / "pkg").mkdir()
+
+        jobs = [
+            WrapperJob(
+                _make_parser("a"),
+                root / "pkg" / "a.py",
+                {"output_dir": root, "command_name": "tool-a"},
+            ),
+            WrapperJob(
+                _make_parser("b"),
+                root / "pkg" / "b.py",
+                {"output_dir": root, "command_name": "tool-b"},
+            ),
+        ]
+
+        results = generate_ps1_wrappers(jobs)
+
+        assert all(r.ok for r in results)
+        assert '"tool-a"' in (root / "A.ps1").read_text(encoding="utf-8-sig")
+        assert '"tool-b"' in (root / "B.ps1").read_text(encoding="utf-8-sig")
+
+
+def test_errors_are_collected_per_job():
+    """A failing job does not stop the remaining jobs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "pyproject.toml").write_text(PYPROJECT_CONTENT, encoding="utf-8")
+
+        jobs = [
+            (_make_parser("a"), root / "a.py", {"output_dir": root}),
+            (
+                _make_parser("b"),
+                root / "b.py",
+                {"output_dir": root, "command_name": "missing"},
+            ),
+            (_make_parser("c"), root / "c.py", {"output_dir": root, "bogus": 1}),
+            (_make_parser("d"), root / "d.py", {"output_dir": root / "nope"}),
+            (_make_parser("e"), root / "e.py", {"output_dir": root}),
+        ]
+
+        results = generate_ps1_wrappers(jobs)
+
+        assert [r.ok for r in results] == [True, False, False, False, True]
+        assert isinstance(results[1].error, ValueError)
+        assert "not found in [project.scripts]" in str(results[1].error)
+        assert isinstance(results[2].error, TypeError)
+        assert isinstance(results[3].error, OSError)
+        assert results[1].output_path is None
+
+
+def test_manifest_skips_unchanged_wrappers():
+    """Unchanged parsers are skipped; changed parsers are rewritten."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        manifest_path = root / ".argparse-ps1.lock.json"
+        parsers = [_make_parser("a"), _make_parser("b")]
+
+        def jobs():
+            return [
+                (parser, root / f"script_{i}.py", {"output_dir": root})
+                for i, parser in enumerate(parsers)
+            ]
+
+        first = generate_ps1_wrappers(jobs(), manifest_path=manifest_path)
+        assert [r.skipped for r in first] == [False, False]
+        assert manifest_path.exists()
+        mtime = (root / "Script-0.ps1").stat().st_mtime_ns
+
+        parsers[1].add_argument("--extra", action="store_true")
+        second = generate_ps1_wrappers(jobs(), manifest_path=manifest_path)
+
+        assert [r.skipped for r in second] == [True, False]
+        assert (root / "Script-0.ps1").stat().st_mtime_ns == mtime
+        assert "[switch]$Extra" in (root / "Script-1.ps1").read_text(
+            encoding="utf-8-sig"
+        )
+
+
+def test_manifest_regenerates_deleted_wrapper():
+    """A wrapper removed from disk is regenerated even if its inputs match."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        manifest_path = root / ".argparse-ps1.lock.json"
+        jobs = [(_make_parser("a"), root / "script.py", {"output_dir": root})]
+
+        generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+        (root / "Script.ps1").unlink()
+        results = generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+
+        assert not results[0].skipped
+        assert (root / "Script.ps1").exists()
+
+
+def test_manifest_regenerates_when_entry_point_changes():
+    """cache_interpreter wrappers embed the entry point, so it is fingerprinted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        pyproject_path = root / "pyproject.toml"
+        pyproject_path.write_text(PYPROJECT_CONTENT, encoding="utf-8")
+        (root / "pkg").mkdir()
+        manifest_path = root / ".argparse-ps1.lock.json"
+        jobs = [
+            WrapperJob(
+                _make_parser("a"),
+                root / "pkg" / "a.py",
+                {
+                    "output_dir": root,
+                    "command_name": "tool-a",
+                    "cache_interpreter": True,
+                },
+            )
+        ]
+
+        generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+        pyproject_path.write_text(
+            PYPROJECT_CONTENT.replace("pkg.a:main", "pkg.b:run"), encoding="utf-8"
+        )
+        results = generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+
+        assert not results[0].skipped
+        content = (root / "A.ps1").read_text(encoding="utf-8-sig")
+        assert "pkg.b" in content
+        assert "pkg.a" not in content
+
+
+def test_manifest_regenerates_when_renderer_changes(monkeypatch):
+    """Wrappers written by another argparse_ps1 version are not skipped."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        manifest_path = root / ".argparse-ps1.lock.json"
+        jobs = [(_make_parser("a"), root / "script.py", {"output_dir": root})]
+
+        with monkeypatch.context() as patch:
+            patch.setattr(manifest, "_package_digest", lambda: "older")
+            patch.setattr(batch, "_render_wrapper", lambda *_a, **_k: "# older\n")
+            generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+        results = generate_ps1_wrappers(jobs, manifest_path=manifest_path)
+
+        assert not results[0].skipped
+        assert "[int]$A" in (root / "Script.ps1").read_text(encoding="utf-8-sig")
@@ -0,0 +1,39 @@
+"""Tests for the benchmark runner in benchmarks/bench_generate.py."""
+
+import importlib.util
+import tempfile
+from pathlib import Path
+
+BENCH_PATH = Path(__file__).parent.parent / "benchmarks" / "bench_generate.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_generate", BENCH_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    bench = _load_bench()
+    baseline = {"fast": 0.100, "slow": 0.100, "noise": 0.0001}
+    results = {"fast": 0.110, "slow": 0.200, "noise": 0.001, "unknown": 1.0}
+
+    regressions = bench.compare(baseline, results, 0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
+
+
+def test_save_then_compare_round_trip():
+    bench = _load_bench()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline = Path(tmpdir) / "baseline.json"
+        options = ["--baseline", str(baseline), "--sizes", "10", "--repeat", "1"]
+        options += ["--only", "script,10]"]
+
+        assert bench.main(["--save", *options]) == 0
+        assert list(bench.load_baseline(baseline)) == ["generate[script,10]"]
+        # A generous threshold keeps timer noise from failing the comparison
+        assert bench.main(["--compare", "--threshold", "100", *options]) == 0
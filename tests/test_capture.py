@@ -0,0 +1,109 @@
+"""Tests for ``python -m argparse_ps1 capture``."""
+
+import argparse
+import tempfile
+import textwrap
+from pathlib import Path
+
+from argparse_ps1 import cli
+from argparse_ps1.cli import main
+
+SCRIPT = """
+import argparse
+from pathlib import Path
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--count", type=int, default=3)
+parser.add_argument("--make-ps1", action="store_true")
+args = parser.parse_args()
+(Path(__file__).parent / "side_effect.txt").write_text("ran", encoding="utf-8")
+"""
+
+SWALLOWING_SCRIPT = """
+import argparse
+from pathlib import Path
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--name")
+try:
+    args = parser.parse_args()
+except BaseException:
+    pass
+"""
+
+
+def _write(tmpdir: str, source: str) -> Path:
+    script_path = Path(tmpdir) / "my_tool.py"
+    script_path.write_text(textwrap.dedent(source), encoding="utf-8")
+    return script_path
+
+
+def test_capture_generates_wrapper_without_running_script_body():
+    """The script stops at parse_args, so its post-parse work never runs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, SCRIPT)
+
+        exit_code = main(
+            [
+                "capture",
+                str(script_path),
+                "--output-dir",
+                tmpdir,
+                "--skip-dest",
+                "make_ps1",
+            ]
+        )
+
+        assert exit_code == 0
+        assert not (Path(tmpdir) / "side_effect.txt").exists()
+        content = (Path(tmpdir) / "My-Tool.ps1").read_text(encoding="utf-8-sig")
+        assert "[int]$Count = 3" in content
+        assert "makeps1" not in content.lower()
+        assert argparse.ArgumentParser.parse_args.__name__ == "parse_args"
+
+
+def test_capture_generates_even_if_script_swallows_interrupt():
+    """The wrapper is written inside the patched parse call itself."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, SWALLOWING_SCRIPT)
+
+        exit_code = main(["capture", str(script_path), "--output-dir", tmpdir])
+
+        assert exit_code == 0
+        assert (Path(tmpdir) / "My-Tool.ps1").exists()
+
+
+def test_capture_static_first():
+    """--static uses static extraction when the script allows it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, SCRIPT)
+
+        exit_code = main(
+            ["capture", str(script_path), "--output-dir", tmpdir, "--static"]
+        )
+
+        assert exit_code == 0
+        assert not (Path(tmpdir) / "side_effect.txt").exists()
+        assert (Path(tmpdir) / "My-Tool.ps1").exists()
+
+
+def test_capture_reports_scripts_that_never_parse():
+    """A script without parse_args is reported as an error."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, "print('no parser here')\n")
+
+        assert main(["capture", str(script_path), "--output-dir", tmpdir]) == 1
+
+
+def test_capture_reports_generation_errors_the_script_swallows(monkeypatch, capsys):
+    """A failed generation caught by the script is an error, not a crash."""
+
+    def failing_generate(*_args, **_kwargs):
+        raise ValueError("Error: cannot write wrapper")
+
+    monkeypatch.setattr(cli, "generate_ps1_wrapper", failing_generate)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, SWALLOWING_SCRIPT)
+
+        assert main(["capture", str(script_path), "--output-dir", tmpdir]) == 1
+        assert "no wrapper was generated for my_tool.py" in capsys.readouterr().err
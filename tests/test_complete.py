@@ -0,0 +1,135 @@
+"""Tests for completion callables and their disk cache."""
+
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from argparse_ps1 import complete
+
+MODULE = """
+from pathlib import Path
+
+CALLS = Path(__file__).with_name("calls.txt")
+
+
+def environments(prefix):
+    with CALLS.open("a") as f:
+        f.write(prefix + "\\n")
+    return ["dev", "demo", "prod"]
+"""
+
+
+@pytest.fixture(autouse=True)
+def _isolated_imports(monkeypatch):
+    """Import each test's completer modules afresh from its own directory."""
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    yield
+    for name in ("tool_envs", "other_envs"):
+        sys.modules.pop(name, None)
+
+
+def _calls(tmpdir: Path) -> list[str]:
+    calls = tmpdir / "calls.txt"
+    return calls.read_text().splitlines() if calls.exists() else []
+
+
+def test_results_are_cached_until_ttl():
+    """Only the first request per prefix calls the function."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        (tmp / "tool_envs.py").write_text(textwrap.dedent(MODULE), encoding="utf-8")
+        sys.path.insert(0, tmpdir)
+        spec = "tool_envs:environments"
+        options = {"command": "Tool", "parameter": "Env", "cache_dir": tmp / "cache"}
+
+        assert complete.complete(spec, "de", **options) == ["dev", "demo"]
+        assert complete.complete(spec, "de", **options) == ["dev", "demo"]
+        assert complete.complete(spec, "p", **options) == ["prod"]
+        assert _calls(tmp) == ["de", "p"]
+
+        cache_file = (
+            tmp / "cache" / f"{complete.cache_key('Tool', 'Env', spec, 'de')}.json"
+        )
+        assert cache_file.exists()
+        os.utime(cache_file, (0, 0))
+        assert complete.complete(spec, "de", **options) == ["dev", "demo"]
+        assert _calls(tmp) == ["de", "p", "de"]
+
+
+def test_oldest_entries_are_evicted():
+    """The cache keeps at most max_entries results."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        (tmp / "tool_envs.py").write_text(textwrap.dedent(MODULE), encoding="utf-8")
+        sys.path.insert(0, tmpdir)
+        cache_dir = tmp / "cache"
+
+        spec = "tool_envs:environments"
+
+        for index, prefix in enumerate(["", "d", "de", "dev"]):
+            complete.complete(
+                spec,
+                prefix,
+                command="Tool",
+                parameter="Env",
+                cache_dir=cache_dir,
+                max_entries=2,
+            )
+            # Distinct mtimes regardless of filesystem timestamp resolution
+            key = complete.cache_key("Tool", "Env", spec, prefix)
+            cache_file = cache_dir / f"{key}.json"
+            os.utime(cache_file, (1000 + index, 1000 + index))
+
+        remaining = {path.stem for path in cache_dir.glob("*.json")}
+        assert remaining == {
+            complete.cache_key("Tool", "Env", spec, "de"),
+            complete.cache_key("Tool", "Env", spec, "dev"),
+        }
+
+
+def test_results_are_recomputed_when_the_source_changes():
+    """Entries are keyed on the callable and expire when its file is edited."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        module_path = tmp / "tool_envs.py"
+        module_path.write_text(textwrap.dedent(MODULE), encoding="utf-8")
+        (tmp / "other_envs.py").write_text(
+            textwrap.dedent(MODULE).replace('"prod"', '"preview"'), encoding="utf-8"
+        )
+        sys.path.insert(0, tmpdir)
+        spec = "tool_envs:environments"
+        other_spec = "other_envs:environments"
+        options = {"command": "Tool", "parameter": "Env", "cache_dir": tmp / "cache"}
+
+        assert complete.complete(spec, "p", **options) == ["prod"]
+        assert complete.complete(other_spec, "p", **options) == ["preview"]
+
+        cache_file = (
+            tmp / "cache" / f"{complete.cache_key('Tool', 'Env', spec, 'p')}.json"
+        )
+        now = time.time()
+        os.utime(module_path, (now - 20, now - 20))
+        os.utime(cache_file, (now - 10, now - 10))
+        assert complete.complete(spec, "p", **options) == ["prod"]
+        assert _calls(tmp) == ["p", "p"]
+
+        os.utime(module_path, (now, now))
+        assert complete.complete(spec, "p", **options) == ["prod"]
+        assert _calls(tmp) == ["p", "p", "p"]
+
+
+def test_main_imports_the_callable_from_the_given_path(capsys):
+    """--path makes a module next to the wrapped script importable."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        (tmp / "tool_envs.py").write_text(textwrap.dedent(MODULE), encoding="utf-8")
+        argv = ["tool_envs:environments", "--prefix=d", "--path", tmpdir]
+        argv += ["--command", "Tool", "--parameter", "Env"]
+
+        assert complete.main([*argv, "--cache-dir", str(tmp / "cache")]) == 0
+        assert capsys.readouterr().out.split() == ["dev", "demo"]
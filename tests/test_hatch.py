@@ -0,0 +1,161 @@
+"""Tests for the hatchling build hook."""
+
+import json
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("hatchling")
+
+from hatchling.builders.sdist import SdistBuilder  # noqa: E402
+from hatchling.builders.wheel import WheelBuilder  # noqa: E402
+
+from argparse_ps1 import hatch  # noqa: E402
+
+PYPROJECT = """
+[build-system]
+requires = ["hatchling"]
+build-backend = "hatchling.build"
+
+[project]
+name = "demo"
+version = "1.0"
+
+[project.scripts]
+demo-tool = "demo.cli:main"
+demo-loop = "demo.loop:main"
+
+[tool.hatch.build.hooks.custom]
+path = "hook.py"
+embed-help = true
+"""
+
+# Loads the hook the way hatchling's entry point would, without installing it
+HOOK = """
+def get_build_hook():
+    from argparse_ps1.hatch import ArgparsePs1BuildHook
+
+    return ArgparsePs1BuildHook
+"""
+
+CLI = """
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Demo tool")
+    parser.add_argument("--count", type=int, default=3)
+    parser.parse_args()
+"""
+
+# Arguments added in a loop cannot be extracted statically
+LOOP = """
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    for name in ("alpha", "beta"):
+        parser.add_argument(f"--{name}")
+    parser.parse_args()
+"""
+
+
+def _make_project(root: Path) -> None:
+    (root / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+    (root / "hook.py").write_text(HOOK, encoding="utf-8")
+    package = root / "src" / "demo"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "cli.py").write_text(CLI, encoding="utf-8")
+    (package / "loop.py").write_text(LOOP, encoding="utf-8")
+
+
+def _build_wheel(root: Path, monkeypatch) -> tuple[dict[str, str], list[str]]:
+    extracted: list[str] = []
+    original_extract = hatch._SpecCache._extract
+
+    def recording_extract(self, command, entry_point, module):
+        extracted.append(command)
+        return original_extract(self, command, entry_point, module)
+
+    monkeypatch.setattr(hatch._SpecCache, "_extract", recording_extract)
+    dist = root / "dist"
+    (wheel,) = WheelBuilder(str(root)).build(directory=str(dist))
+    with zipfile.ZipFile(wheel) as archive:
+        scripts = {
+            Path(name).name: archive.read(name).decode("utf-8-sig")
+            for name in archive.namelist()
+            if name.startswith("demo-1.0.data/scripts/")
+        }
+    Path(wheel).unlink()
+    return scripts, extracted
+
+
+def test_wheel_ships_console_script_wrappers(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+
+        scripts, extracted = _build_wheel(root, monkeypatch)
+
+        assert sorted(scripts) == ["Demo-Loop.ps1", "Demo-Tool.ps1"]
+        assert sorted(extracted) == ["demo-loop", "demo-tool"]
+        tool = scripts["Demo-Tool.ps1"]
+        assert "Join-Path $ScriptDir 'demo-tool'" in tool
+        assert "[int]$Count = 3" in tool
+        assert "usage: demo-tool" in tool
+        assert "[string]$Alpha" in scripts["Demo-Loop.ps1"]
+
+        cache = json.loads(
+            (root / ".argparse-ps1-cache" / "specs.json").read_text(encoding="utf-8")
+        )
+        methods = {name: entry["method"] for name, entry in cache["commands"].items()}
+        assert methods == {"demo-loop": "import", "demo-tool": "static"}
+
+
+def test_rebuild_extracts_only_changed_parsers(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+        _build_wheel(root, monkeypatch)
+
+        scripts, extracted = _build_wheel(root, monkeypatch)
+        assert extracted == []
+        assert "[int]$Count = 3" in scripts["Demo-Tool.ps1"]
+
+        # demo-loop was imported, so any file of its package invalidates it;
+        # demo-tool was read statically from cli.py alone
+        loop = root / "src" / "demo" / "loop.py"
+        loop.write_text(LOOP.replace('"beta"', '"gamma"'), encoding="utf-8")
+        scripts, extracted = _build_wheel(root, monkeypatch)
+        assert extracted == ["demo-loop"]
+        assert "[string]$Gamma" in scripts["Demo-Loop.ps1"]
+
+
+def test_changed_argparse_ps1_sources_invalidate_spec_cache(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+        _build_wheel(root, monkeypatch)
+
+        # Keyed on the sources, not the version: editable installs keep theirs
+        monkeypatch.setattr(hatch, "_package_digest", lambda: "changed")
+        _, extracted = _build_wheel(root, monkeypatch)
+        assert sorted(extracted) == ["demo-loop", "demo-tool"]
+
+
+def test_sdist_includes_spec_cache():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+
+        (sdist,) = SdistBuilder(str(root)).build(directory=str(root / "dist"))
+
+        with tarfile.open(sdist) as archive:
+            names = archive.getnames()
+        assert "demo-1.0/.argparse-ps1-cache/specs.json" in names
+        assert not any("/wrappers/" in name for name in names)
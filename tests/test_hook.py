@@ -0,0 +1,93 @@
+"""Tests for the install() hook."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import argparse_ps1
+
+SCRIPT = """
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import argparse_ps1
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--name", default="world")
+argparse_ps1.install(parser, output_dir=Path(sys.argv[1]))
+args = parser.parse_args(sys.argv[2:])
+deferred = ["argparse_ps1.argparse_ps1", "tomllib", "gzip", "concurrent.futures"]
+print(json.dumps({
+    "args": vars(args),
+    "loaded": [name for name in deferred if name in sys.modules],
+}))
+"""
+
+
+def _run_script(tmpdir: str, *args: str) -> subprocess.CompletedProcess[str]:
+    script_path = Path(tmpdir) / "hooked_tool.py"
+    script_path.write_text(SCRIPT, encoding="utf-8")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [
+            str(Path(argparse_ps1.__file__).resolve().parent.parent),
+            env.get("PYTHONPATH", ""),
+        ]
+    )
+    return subprocess.run(  # noqa: S603
+        [sys.executable, str(script_path), tmpdir, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+
+
+def test_normal_run_does_not_import_the_generator():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        completed = _run_script(tmpdir, "--name", "ps")
+
+        assert completed.returncode == 0, completed.stderr
+        result = json.loads(completed.stdout)
+        assert result == {"args": {"name": "ps"}, "loaded": []}
+        assert not list(Path(tmpdir).glob("*.ps1"))
+
+
+def test_flag_generates_wrapper_without_itself_and_exits():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        completed = _run_script(tmpdir, "--make-ps1")
+
+        assert completed.returncode == 0, completed.stderr
+        assert "Generated PowerShell wrapper:" in completed.stdout
+        # The script exited before printing its parsed arguments
+        assert "args" not in completed.stdout
+        content = (Path(tmpdir) / "Hooked-Tool.ps1").read_text(encoding="utf-8-sig")
+        assert "$Name" in content
+        assert "make-ps1" not in content.lower()
+
+
+def test_invalid_options_exit_with_error(capsys):
+    parser = argparse.ArgumentParser()
+    argparse_ps1.install(parser, flag="--wrap", script_path=Path("tool.py"), bad=1)
+
+    with pytest.raises(SystemExit) as excinfo:
+        parser.parse_args(["--wrap"])
+
+    assert excinfo.value.code == 1
+    assert "bad" in capsys.readouterr().err
+
+
+def test_lazy_attributes_resolve():
+    assert set(argparse_ps1.__all__) <= set(dir(argparse_ps1))
+    for name in argparse_ps1.__all__:
+        assert getattr(argparse_ps1, name) is not None
+    with pytest.raises(AttributeError):
+        _ = argparse_ps1.missing_attribute
@@ -0,0 +1,151 @@
+"""Tests for PowerShell module output."""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from argparse_ps1 import WrapperJob, generate_ps1_module
+
+PYPROJECT_CONTENT = """
+[project]
+name = "test-project"
+version = "0.1.2"
+
+[project.scripts]
+tool-a = "pkg.a:main"
+"""
+
+
+def _make_parser(option: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=f"Tool with --{option}")
+    parser.add_argument(f"--{option}", type=int)
+    return parser
+
+
+def test_module_exports_one_function_per_parser():
+    """The manifest lists every function and the .psm1 defines them once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "pyproject.toml").write_text(PYPROJECT_CONTENT, encoding="utf-8")
+        (root / "pkg").mkdir()
+        jobs = [
+            (_make_parser("first"), root / "scripts" / "first_tool.py"),
+            WrapperJob(
+                _make_parser("second"),
+                root / "pkg" / "a.py",
+                {"command_name": "tool-a"},
+            ),
+        ]
+
+        psd1_path = generate_ps1_module(
+            jobs, module_name="MyTools", output_dir=root / "modules"
+        )
+
+        assert psd1_path == root / "modules" / "MyTools" / "MyTools.psd1"
+        manifest = psd1_path.read_text(encoding="utf-8-sig")
+        assert "RootModule = 'MyTools.psm1'" in manifest
+        assert "'First-Tool'" in manifest
+        assert "'Tool-A'" in manifest
+        assert "CmdletsToExport = @()" in manifest
+
+        module = psd1_path.with_suffix(".psm1").read_text(encoding="utf-8-sig")
+        assert "function First-Tool {" in module
+        assert "function Tool-A {" in module
+        assert "Export-ModuleMember -Function First-Tool, Tool-A" in module
+        assert '$ProjectRoot = (Join-Path (Join-Path $ScriptDir "..") "..")' in module
+        # -Help needs $ProjectRoot, so it is resolved before the help check
+        assert module.index("$ProjectRoot = ") < module.index('"tool-a", "--help"')
+        # Shared setup is defined once, not per function
+        assert module.count("[Console]::OutputEncoding") == 1
+        assert module.count("PYTHONIOENCODING") == 1
+        assert module.count("Unknown parameter(s)") == 1
+        # Functions must never exit the caller's session
+        assert "exit" not in module
+
+
+def test_module_keeps_embedded_help_here_string_unindented():
+    """The here-string terminator stays at the start of its line."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        psd1_path = generate_ps1_module(
+            [(_make_parser("count"), root / "tool.py", {"embed_help": True})],
+            module_name="Tools",
+            output_dir=root,
+        )
+        module = psd1_path.with_suffix(".psm1").read_text(encoding="utf-8-sig")
+
+        assert "        Write-Output @'\nusage: " in module
+        assert "\n'@\n" in module
+        assert "    $ScriptDir = $PSScriptRoot" in module
+
+
+def test_module_output_is_stable():
+    """Regeneration produces identical files, including the manifest GUID."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        jobs = [(_make_parser("x"), root / "tool.py")]
+        first = generate_ps1_module(jobs, module_name="Tools", output_dir=root)
+        content = first.read_bytes()
+        mtime = first.stat().st_mtime_ns
+
+        second = generate_ps1_module(jobs, module_name="Tools", output_dir=root)
+
+        assert second.read_bytes() == content
+        assert second.stat().st_mtime_ns == mtime
+
+
+def test_module_defines_parallel_helper_once():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        jobs = [
+            (parser, root / name, {"parallel_input": "source"})
+            for name in ("a.py", "b.py")
+        ]
+        psd1 = generate_ps1_module(jobs, module_name="Tools", output_dir=root)
+        content = psd1.with_suffix(".psm1").read_text(encoding="utf-8-sig")
+
+    assert content.count("function Invoke-ArgparsePs1Parallel {") == 1
+    assert content.count('Invoke-ArgparsePs1Parallel "uv" $Arguments') == 2
+    # Functions return instead of exiting the session after the fan-out
+    assert "exit $LASTEXITCODE" not in content
+
+
+def test_module_functions_do_not_time_session_startup():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        jobs = [(parser, root / "a.py", {"trace_timing": True})]
+        psd1 = generate_ps1_module(jobs, module_name="Tools", output_dir=root)
+        content = psd1.with_suffix(".psm1").read_text(encoding="utf-8-sig")
+
+    assert content.count("function Write-ArgparsePs1Timing {") == 1
+    # Without a script name the report starts at the function call, not at
+    # the start of the (long-running) session
+    assert (
+        "if ($TraceTiming) { Write-ArgparsePs1Timing $TraceStart $TraceLaunch "
+        "$TraceFile }"
+    ) in content
+
+
+def test_module_rejects_conflicting_function_names():
+    """Two parsers that map to the same function name are an error."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        jobs = [
+            (_make_parser("a"), root / "a" / "tool.py"),
+            (_make_parser("b"), root / "b" / "tool.py"),
+        ]
+        with pytest.raises(ValueError, match="Tool"):
+            generate_ps1_module(jobs, module_name="Tools", output_dir=root)
+
+        with pytest.raises(TypeError, match="output_dir"):
+            generate_ps1_module(
+                [(_make_parser("a"), root / "tool.py", {"output_dir": root})],
+                module_name="Tools",
+                output_dir=root,
+            )
@@ -0,0 +1,45 @@
+"""Tests for -AsObject output (as_object and argparse_ps1.emit)."""
+
+import io
+import json
+from pathlib import Path
+
+from argparse_ps1 import emit
+from argparse_ps1.output import OUTPUT_ENV, RECORD_MARKER
+
+
+class _CountingStream(io.StringIO):
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def test_emit_writes_json_lines_for_as_object(monkeypatch):
+    monkeypatch.setenv(OUTPUT_ENV, "json")
+    stream = _CountingStream()
+
+    emit({"name": "a.txt", "path": Path("dir"), "note": "é"}, text="a", stream=stream)
+    emit([1, 2], stream=stream)
+
+    # str.splitlines() would also split at the marker
+    lines = stream.getvalue().removesuffix("\n").split("\n")
+    # Only marked lines are converted, so other output may start with [ or {
+    assert all(line.startswith(RECORD_MARKER) for line in lines)
+    assert [json.loads(line.removeprefix(RECORD_MARKER)) for line in lines] == [
+        {"name": "a.txt", "path": "dir", "note": "é"},
+        [1, 2],
+    ]
+    # Every record is flushed, so PowerShell converts it as soon as it is written
+    assert stream.flushes == 2
+
+
+def test_emit_writes_text_without_as_object(monkeypatch):
+    monkeypatch.delenv(OUTPUT_ENV, raising=False)
+    stream = io.StringIO()
+
+    emit({"name": "a.txt"}, text="a.txt 10", stream=stream)
+    emit(3, stream=stream)
+
+    assert stream.getvalue() == "a.txt 10\n3\n"
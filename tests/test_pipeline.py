@@ -0,0 +1,47 @@
+"""Tests for pipeline input (pipeline_input and argparse_ps1.pipeline_items)."""
+
+import argparse
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from argparse_ps1 import generate_ps1_module, pipeline_items
+from argparse_ps1.pipeline import PIPELINE_ENV
+
+
+def test_items_come_from_argument_without_piped_input(monkeypatch):
+    monkeypatch.delenv(PIPELINE_ENV, raising=False)
+
+    assert list(pipeline_items(["a", "b"], stream=io.StringIO("c\n"))) == ["a", "b"]
+    assert list(pipeline_items(None)) == []
+
+
+def test_items_are_read_from_stream_and_converted(monkeypatch):
+    monkeypatch.setenv(PIPELINE_ENV, "1")
+    stream = io.StringIO("1\r\n2\n\n3")
+
+    items = pipeline_items([10], convert=lambda item: int(item or 0), stream=stream)
+
+    # Children of the script must not read their stdin as pipeline input
+    assert PIPELINE_ENV not in os.environ
+    assert list(items) == [1, 2, 0, 3]
+
+
+def test_module_function_skips_blocks_after_early_return():
+    """In a function, a return in begin (e.g. -Help) must not start Python later."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("names", nargs="*")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        generate_ps1_module(
+            [(parser, root / "tool.py", {"pipeline_input": "names"})],
+            module_name="Tools",
+            output_dir=root,
+        )
+        content = (root / "Tools" / "Tools.psm1").read_text(encoding="utf-8-sig")
+
+    assert content.count("if ($Finished) { return }") == 2
+    assert '        $env:PYTHONIOENCODING = "utf-8"' in content
+    assert "        return\n" in content
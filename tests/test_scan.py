@@ -0,0 +1,124 @@
+"""Tests for ``python -m argparse_ps1 scan``."""
+
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+from argparse_ps1.cli import main
+from argparse_ps1.scan import scan_project
+
+PYPROJECT_CONTENT = """
+[project]
+name = "scan-project"
+version = "0.1.0"
+
+[project.scripts]
+good-tool = "scanpkg.good:main"
+slow-tool = "scanpkg.slow:main"
+broken-tool = "scanpkg.broken:main"
+"""
+
+GOOD_MODULE = """
+import argparse
+from pathlib import Path
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--out", type=Path)
+    parser.parse_args()
+    raise SystemExit("main body must not run")
+"""
+
+SLOW_MODULE = """
+import time
+
+time.sleep(30)
+
+def main():
+    pass
+"""
+
+BROKEN_MODULE = """
+def main():
+    raise RuntimeError("boom")
+"""
+
+
+def _make_project(root: Path) -> None:
+    (root / "pyproject.toml").write_text(PYPROJECT_CONTENT, encoding="utf-8")
+    package = root / "scanpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    for name, source in (
+        ("good", GOOD_MODULE),
+        ("slow", SLOW_MODULE),
+        ("broken", BROKEN_MODULE),
+    ):
+        (package / f"{name}.py").write_text(textwrap.dedent(source), encoding="utf-8")
+
+
+def test_scan_generates_entry_points_and_isolates_failures():
+    """Good entry points are generated; slow and broken ones fail independently."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+        output_dir = root / "bin"
+        output_dir.mkdir()
+
+        results = scan_project(root, output_dir=output_dir, timeout=2)
+
+        by_name = {result.command_name: result for result in results}
+        assert by_name["good-tool"].ok
+        assert by_name["good-tool"].output_path == output_dir / "Good-Tool.ps1"
+        assert "timed out" in (by_name["slow-tool"].error or "")
+        assert "boom" in (by_name["broken-tool"].error or "")
+
+        content = (output_dir / "Good-Tool.ps1").read_text(encoding="utf-8-sig")
+        assert '"run", "--project", $ProjectRoot, "good-tool"' in content
+        assert "[int]$Count = 1" in content
+        assert "(Resolve-Path $Out).Path" in content
+
+
+def test_scan_cli_selects_commands():
+    """The CLI honours --command and reports generated wrappers."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+
+        exit_code = main(
+            ["scan", str(root), "--output-dir", str(root), "--command", "good-tool"]
+        )
+
+        assert exit_code == 0
+        assert (root / "Good-Tool.ps1").exists()
+        assert not (root / "Slow-Tool.ps1").exists()
+
+
+def test_scan_cli_runs_extraction_with_given_python(capsys):
+    """--python selects the interpreter that imports the entry points."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_project(root)
+        args = ["scan", str(root), "--output-dir", str(root), "-c", "good-tool"]
+
+        assert main([*args, "--python", sys.executable]) == 0
+        (root / "Good-Tool.ps1").unlink()
+        missing = str(root / "missing-python")
+        assert main([*args, "--python", missing]) == 1
+
+        assert not (root / "Good-Tool.ps1").exists()
+        assert "Failed: good-tool" in capsys.readouterr().err
+
+
+def test_module_entry_point_help():
+    """``python -m argparse_ps1 --help`` lists the scan command."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "argparse_ps1", "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "scan" in completed.stdout
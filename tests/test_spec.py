@@ -0,0 +1,129 @@
+"""Tests for the serializable wrapper spec."""
+
+import argparse
+import json
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from argparse_ps1 import dump_spec, extract_spec, generate_ps1_wrapper, load_spec
+from argparse_ps1.cli import main
+
+SCRIPT = """
+import argparse
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--count", type=int, default=3)
+args = parser.parse_args()
+"""
+
+
+def regions(prefix: str) -> list[str]:
+    return [name for name in ("eu-west", "us-east") if name.startswith(prefix)]
+
+
+def _make_parser():
+    parser = argparse.ArgumentParser(prog="tool", description="Tool %(prog)s")
+    parser.add_argument("source", type=Path, help="Source (default: %(default)s)")
+    parser.add_argument("--level", type=int, choices=range(1, 6), default=3)
+    parser.add_argument("--ratio", type=float)
+    parser.add_argument("--out", type=Path, default=Path("out.txt"))
+    parser.add_argument("--config", type=argparse.FileType("r"))
+    parser.add_argument("--secret", help=argparse.SUPPRESS)
+    parser.add_argument("--region").completer = regions  # type: ignore[attr-defined]
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--fast", action="store_true")
+    group.add_argument("--safe", action="store_false")
+    subparsers = parser.add_subparsers(dest="command")
+    run = subparsers.add_parser("run", aliases=["r"])
+    run.add_argument("target", choices=["a", "b"])
+    run.add_argument("--dry-run", action="store_true")
+    return parser
+
+
+def _render(parser_or_spec, tmpdir, **options):
+    output_path = Path(tmpdir) / "Tool.ps1"
+    generate_ps1_wrapper(
+        parser_or_spec,
+        script_path=Path(tmpdir) / "tool.py",
+        output_path=output_path,
+        **options,
+    )
+    return output_path.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"validate_arguments": True, "embed_help": True}]
+)
+def test_loaded_spec_renders_like_the_parser(options):
+    """A spec round-tripped through JSON renders the same wrapper as the parser."""
+    parser = _make_parser()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec_path = Path(tmpdir) / "tool.spec.json"
+        dump_spec(extract_spec(parser), spec_path)
+        json.loads(spec_path.read_text(encoding="utf-8"))
+
+        expected = _render(parser, tmpdir, **options)
+        assert _render(load_spec(spec_path), tmpdir, **options) == expected
+
+
+def test_spec_round_trip_preserves_fields():
+    spec = extract_spec(_make_parser())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec_path = Path(tmpdir) / "tool.spec.json"
+        dump_spec(spec, spec_path)
+        loaded = load_spec(spec_path)
+
+    assert loaded == spec
+    by_dest = {argument.dest: argument for argument in loaded.arguments}
+    assert by_dest["level"].choices == range(1, 6)
+    assert by_dest["secret"].help is None
+    assert by_dest["region"].completer == f"{__name__}:regions"
+    assert by_dest["command"].subcommands[0].names == ("run", "r")
+
+
+def test_load_spec_rejects_other_versions():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        spec_path = Path(tmpdir) / "tool.spec.json"
+        spec_path.write_text('{"version": 999, "prog": "x", "arguments": []}')
+
+        with pytest.raises(ValueError, match="unsupported wrapper spec version"):
+            load_spec(spec_path)
+
+
+def test_cli_renders_spec_without_importing_script():
+    """'render --spec' never runs the script, even if it cannot be imported."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        script_path = tmp / "my_tool.py"
+        script_path.write_text(textwrap.dedent(SCRIPT), encoding="utf-8")
+        spec_path = tmp / "my_tool.spec.json"
+        assert main(["spec", str(script_path), "-o", str(spec_path)]) == 0
+
+        script_path.write_text("raise SystemExit('imported')\n", encoding="utf-8")
+        exit_code = main(
+            ["render", str(script_path), "--spec", str(spec_path), "-o", tmpdir]
+        )
+
+        assert exit_code == 0
+        content = (tmp / "My-Tool.ps1").read_text(encoding="utf-8-sig")
+        assert "[int]$Count = 3" in content
+
+
+def test_cli_render_to_stdout(capsys):
+    """'render --stdout' prints the wrapper and writes no file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        script_path = tmp / "my_tool.py"
+        script_path.write_text(textwrap.dedent(SCRIPT), encoding="utf-8")
+        spec_path = tmp / "my_tool.spec.json"
+        assert main(["spec", str(script_path), "-o", str(spec_path)]) == 0
+        capsys.readouterr()
+
+        args = ["render", str(script_path), "--spec", str(spec_path), "-o", tmpdir]
+        assert main([*args, "--stdout"]) == 0
+
+        assert "[int]$Count = 3" in capsys.readouterr().out
+        assert not (tmp / "My-Tool.ps1").exists()
@@ -0,0 +1,287 @@
+"""Tests for static (AST-based) parser extraction."""
+
+import argparse
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from argparse_ps1 import generate_ps1_wrapper
+from argparse_ps1.static import (
+    StaticExtractionError,
+    extract_parser,
+    extract_parser_static,
+)
+
+STATIC_SCRIPT = """
+import argparse
+import sys
+from pathlib import Path
+
+import some_heavy_dependency_that_is_not_installed
+
+MODES = ["fast", "slow"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a model")
+    parser.add_argument("data", type=Path, help=f"Data dir for {sys.platform}")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--lr", type=float, default=-0.5)
+    parser.add_argument("--out", type=Path, default=Path("model.bin"))
+    parser.add_argument("--mode", choices=MODES, default="fast")
+    parser.add_argument("--level", type=int, choices=list(range(1, 4)))
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("-v", "--verbose", action="store_true")
+    group.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args()
+    some_heavy_dependency_that_is_not_installed.train(args)
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+DYNAMIC_SCRIPT = """
+import argparse
+
+
+def parse_size(text):
+    return int(text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=parse_size)
+    args = parser.parse_args()
+    raise SystemExit("main body must not run")
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+def _write(tmpdir: str, source: str) -> Path:
+    script_path = Path(tmpdir) / "script.py"
+    script_path.write_text(textwrap.dedent(source), encoding="utf-8")
+    return script_path
+
+
+def test_static_extraction_without_import():
+    """Literal add_argument calls are rebuilt without importing the script."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, STATIC_SCRIPT)
+
+        parser = extract_parser_static(script_path)
+
+        actions = {action.dest: action for action in parser._actions}
+        assert parser.description == "Train a model"
+        assert actions["data"].type is Path
+        assert actions["data"].help is None
+        assert actions["epochs"].type is int
+        assert actions["epochs"].default == 10
+        assert actions["lr"].default == -0.5
+        assert actions["out"].default == Path("model.bin")
+        assert actions["mode"].choices == ["fast", "slow"]
+        assert actions["level"].choices == [1, 2, 3]
+        assert isinstance(actions["verbose"], argparse._StoreTrueAction)
+        assert len(parser._mutually_exclusive_groups) == 1
+
+        output_path = Path(tmpdir) / "Script.ps1"
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        content = output_path.read_text(encoding="utf-8-sig")
+        assert "[int]$Epochs = 10" in content
+        assert "[string]$Out = 'model.bin'" in content
+        assert '[ValidateSet("fast", "slow")]' in content
+
+
+def test_static_extraction_names_the_script_not_the_host_process():
+    """prog defaults to the script's name, as when the script is run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            "import argparse\nparser = argparse.ArgumentParser()\n",
+        )
+
+        assert extract_parser_static(script_path).prog == "script.py"
+        assert extract_parser_static(script_path, prog="tool").prog == "tool"
+
+        script_path.write_text(
+            "import argparse\nparser = argparse.ArgumentParser(prog='mine')\n",
+            encoding="utf-8",
+        )
+        assert extract_parser_static(script_path, prog="tool").prog == "mine"
+
+
+def test_static_extraction_rejects_dynamic_types():
+    """Custom type callables cannot be evaluated statically."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, DYNAMIC_SCRIPT)
+
+        with pytest.raises(StaticExtractionError, match="parse_size"):
+            extract_parser_static(script_path)
+        with pytest.raises(StaticExtractionError):
+            extract_parser(script_path, allow_import=False)
+
+
+def test_static_extraction_rejects_conditional_arguments():
+    """Arguments added inside loops or conditionals are not static."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            """
+            import argparse
+            parser = argparse.ArgumentParser()
+            for name in ["a", "b"]:
+                parser.add_argument("--" + name)
+            """,
+        )
+
+        with pytest.raises(StaticExtractionError, match="loop or conditional"):
+            extract_parser_static(script_path)
+
+
+def test_static_extraction_rejects_parsers_passed_to_helpers():
+    """Arguments added by a helper function cannot be seen statically."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "common.py").write_text(
+            "def add_common_args(parser):\n"
+            "    parser.add_argument('--verbose', action='store_true')\n",
+            encoding="utf-8",
+        )
+        script_path = _write(
+            tmpdir,
+            """
+            import argparse
+            from common import add_common_args
+            parser = argparse.ArgumentParser()
+            parser.add_argument("-n", type=int)
+            add_common_args(parser)
+            args = parser.parse_args()
+            """,
+        )
+
+        with pytest.raises(StaticExtractionError, match="script.py:6\\)"):
+            extract_parser_static(script_path)
+        parser = extract_parser(script_path)
+        assert [action.dest for action in parser._actions] == ["help", "n", "verbose"]
+
+
+@pytest.mark.parametrize(
+    "usage",
+    [
+        "def build():\n    return parser",
+        "alias = parser",
+        "register(parser.add_argument_group('extra'))",
+    ],
+)
+def test_static_extraction_rejects_escaping_parsers(usage):
+    """Returned, aliased or unassigned parser objects are not static."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            "import argparse\nparser = argparse.ArgumentParser()\n" + usage + "\n",
+        )
+
+        with pytest.raises(StaticExtractionError):
+            extract_parser_static(script_path)
+
+
+def test_static_extraction_accepts_argparse_ps1_install():
+    """install() only adds --make-ps1, which never reaches the wrapper."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            """
+            import argparse
+            import argparse_ps1
+            from argparse_ps1 import install
+            parser = argparse.ArgumentParser()
+            parser.add_argument("--name")
+            install(parser, runner="python")
+            argparse_ps1.trace_timing(parser)
+            args = parser.parse_args()
+            """,
+        )
+
+        parser = extract_parser_static(script_path)
+        assert [action.dest for action in parser._actions] == ["help", "name"]
+
+
+@pytest.mark.parametrize(
+    ("expression", "error"),
+    [
+        ('sorted([1, "a"])', "TypeError"),
+        ("range(1, 5, 0)", "ValueError"),
+        ("{[1]: 2}", "TypeError"),
+    ],
+)
+def test_static_extraction_reports_failing_literals(expression, error):
+    """Literals that raise while evaluated fail extraction at their line."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            f"""
+            import argparse
+            parser = argparse.ArgumentParser()
+            parser.add_argument("--mode", choices={expression})
+            """,
+        )
+
+        with pytest.raises(StaticExtractionError, match=f"script.py:4\\): {error}"):
+            extract_parser_static(script_path)
+
+
+def test_extract_parser_falls_back_to_running_script():
+    """Unsupported constructs fall back to capturing the parser at parse_args."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(tmpdir, DYNAMIC_SCRIPT)
+
+        parser = extract_parser(script_path)
+
+        actions = {action.dest: action for action in parser._actions}
+        assert actions["size"].type.__name__ == "parse_size"
+        assert argparse.ArgumentParser.parse_args.__name__ == "parse_args"
+
+
+def test_static_extraction_with_subcommands():
+    """add_subparsers/add_parser calls are replayed; handler defaults are dropped."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = _write(
+            tmpdir,
+            """
+            import argparse
+
+            import heavy
+
+
+            def main():
+                parser = argparse.ArgumentParser()
+                parser.add_argument("--config")
+                subparsers = parser.add_subparsers(dest="command", required=True)
+                train = subparsers.add_parser("train", aliases=["t"], help="Train")
+                train.add_argument("--epochs", type=int, default=3)
+                train.set_defaults(func=heavy.train, epochs=5)
+                evaluate = subparsers.add_parser("eval")
+                evaluate.add_argument("checkpoint")
+                args = parser.parse_args()
+                args.func(args)
+            """,
+        )
+
+        parser = extract_parser_static(script_path)
+
+        subparsers = next(
+            a for a in parser._actions if isinstance(a, argparse._SubParsersAction)
+        )
+        assert subparsers.dest == "command"
+        assert sorted(subparsers.choices) == ["eval", "t", "train"]
+        train = subparsers.choices["train"]
+        assert train.get_default("epochs") == 5
+        assert train.get_default("func") is None
+        assert [a.dest for a in subparsers.choices["eval"]._actions] == [
+            "help",
+            "checkpoint",
+        ]
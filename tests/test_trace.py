@@ -0,0 +1,52 @@
+"""Tests for -TraceTiming (trace_timing)."""
+
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import argparse_ps1
+from argparse_ps1.trace import TRACE_ENV
+
+
+def _events(path: Path) -> list[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["event"] for line in lines]
+
+
+def test_parser_reports_build_and_first_parse(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trace_file = Path(tmpdir) / "trace.jsonl"
+        monkeypatch.setenv(TRACE_ENV, str(trace_file))
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--name")
+
+        argparse_ps1.trace_timing(parser)
+        # Child processes of the script must not report to the wrapper
+        assert TRACE_ENV not in os.environ
+        assert parser.parse_args(["--name", "a"]).name == "a"
+        parser.parse_args([])
+
+        assert _events(trace_file) == ["parser", "parse_args"]
+
+
+def test_install_traces_parser(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trace_file = Path(tmpdir) / "trace.jsonl"
+        monkeypatch.setenv(TRACE_ENV, str(trace_file))
+        parser = argparse.ArgumentParser()
+
+        argparse_ps1.install(parser)
+        parser.parse_args([])
+
+        assert _events(trace_file) == ["parser", "parse_args"]
+
+
+def test_no_trace_without_wrapper(monkeypatch):
+    monkeypatch.delenv(TRACE_ENV, raising=False)
+    parser = argparse.ArgumentParser()
+
+    argparse_ps1.trace_timing(parser)
+
+    assert "parse_known_args" not in vars(parser)
@@ -1,10 +1,18 @@
 """Tests for argparse_ps1 package."""
 
 import argparse
+import base64
+import gzip
+import re
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from argparse_ps1 import generate_ps1_wrapper
+import pytest
+
+import argparse_ps1.argparse_ps1 as core
+from argparse_ps1 import clear_project_cache, generate_ps1_wrapper, render_ps1_wrapper
 
 
 def test_import():
@@ -339,3 +347,817 @@ def test_example_python_integration():
             # Verify argument handling
             assert "$Arguments" in content
             assert "exit $LASTEXITCODE" in content
+
+
+def test_identical_content_is_not_rewritten():
+    """Regenerating an unchanged wrapper leaves the file (and its mtime) alone."""
+    parser = argparse.ArgumentParser(description="Test script")
+    parser.add_argument("--count", type=int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test_script.ps1"
+        script_path = Path(__file__).parent / "test_script.py"
+
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        first_mtime = output_path.stat().st_mtime_ns
+        assert output_path.read_bytes().startswith(b"\xef\xbb\xbf")
+
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        assert output_path.stat().st_mtime_ns == first_mtime
+
+
+def test_render_ps1_wrapper_returns_text_without_writing():
+    """render_ps1_wrapper returns what generate_ps1_wrapper writes."""
+    parser = argparse.ArgumentParser(description="Test script")
+    parser.add_argument("--count", type=int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = Path(tmpdir) / "test_script.py"
+
+        content = render_ps1_wrapper(
+            parser, script_path=script_path, output_dir=Path(tmpdir)
+        )
+        assert list(Path(tmpdir).iterdir()) == []
+
+        output_path = generate_ps1_wrapper(
+            parser, script_path=script_path, output_dir=Path(tmpdir)
+        )
+        assert output_path.read_text(encoding="utf-8-sig") == content
+
+
+@pytest.mark.parametrize("lock_file", [False, True])
+def test_concurrent_generation_never_tears_wrapper(lock_file):
+    """Concurrent writers replace the wrapper whole and leave no temp files."""
+    small = argparse.ArgumentParser()
+    large = argparse.ArgumentParser()
+    for i in range(200):
+        large.add_argument(f"--option-{i}", help="An option")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "Tool.ps1"
+        script_path = Path(tmpdir) / "tool.py"
+        expected = {
+            render_ps1_wrapper(p, script_path=script_path, output_path=output_path)
+            for p in (small, large)
+        }
+        seen: set[str] = set()
+        stop = threading.Event()
+
+        def read() -> None:
+            while not stop.is_set():
+                try:
+                    seen.add(output_path.read_text(encoding="utf-8-sig"))
+                except FileNotFoundError:
+                    pass
+
+        def write(i: int) -> None:
+            generate_ps1_wrapper(
+                (small, large)[i % 2],
+                script_path=script_path,
+                output_path=output_path,
+                lock_file=lock_file,
+            )
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(write, range(64)))
+        finally:
+            stop.set()
+            reader.join()
+
+        assert seen <= expected
+        assert output_path.read_text(encoding="utf-8-sig") in expected
+        assert not list(Path(tmpdir).glob("*.tmp"))
+        assert (Path(tmpdir) / "Tool.ps1.lock").exists() == lock_file
+
+
+def test_failed_write_keeps_previous_wrapper(monkeypatch):
+    """A write that fails before the rename leaves the old wrapper in place."""
+    parser = argparse.ArgumentParser()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "Tool.ps1"
+        script_path = Path(tmpdir) / "tool.py"
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        previous = output_path.read_bytes()
+
+        def fail(*_args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(Path, "replace", fail)
+        parser.add_argument("--count", type=int)
+        with pytest.raises(OSError, match="disk full"):
+            generate_ps1_wrapper(
+                parser, script_path=script_path, output_path=output_path
+            )
+
+        assert output_path.read_bytes() == previous
+        assert [p.name for p in Path(tmpdir).iterdir()] == ["Tool.ps1"]
+
+
+def test_console_script_mode_runs_sibling_command():
+    """console_script wrappers run the installed launcher next to them."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # No pyproject.toml: console_script never looks for a project
+        script_path = Path(tmpdir) / "tool.py"
+        content = render_ps1_wrapper(
+            parser,
+            script_path=script_path,
+            output_dir=Path(tmpdir),
+            command_name="my-tool",
+            console_script=True,
+        )
+
+        assert "$Runner = Join-Path $ScriptDir 'my-tool'" in content
+        assert "& $Runner @Arguments" in content
+        assert "uv run" not in content
+
+        with pytest.raises(ValueError, match="console_script needs command_name"):
+            render_ps1_wrapper(parser, script_path=script_path, console_script=True)
+
+
+def test_project_discovery_is_cached(monkeypatch):
+    """pyproject.toml is parsed once per change, not once per wrapper."""
+    parse_count = 0
+    original_load = core.tomllib.load
+
+    def counting_load(f):
+        nonlocal parse_count
+        parse_count += 1
+        return original_load(f)
+
+    monkeypatch.setattr(core.tomllib, "load", counting_load)
+
+    parser = argparse.ArgumentParser(description="Test script")
+    parser.add_argument("--count", type=int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        pyproject_path = project_root / "pyproject.toml"
+        pyproject_path.write_text(
+            '[project]\nname = "p"\n\n[project.scripts]\ntool = "m:main"\n',
+            encoding="utf-8",
+        )
+        (project_root / "pkg").mkdir()
+        script_path = project_root / "pkg" / "tool.py"
+
+        for i in range(5):
+            generate_ps1_wrapper(
+                parser,
+                script_path=script_path,
+                output_path=project_root / f"tool{i}.ps1",
+                command_name="tool",
+            )
+        assert parse_count == 1
+
+        # Editing pyproject.toml (different size) invalidates the cached table
+        pyproject_path.write_text(
+            '[project]\nname = "p"\n\n[project.scripts]\ntool = "m:main"\nother = "m:other"\n',
+            encoding="utf-8",
+        )
+        generate_ps1_wrapper(
+            parser,
+            script_path=script_path,
+            output_path=project_root / "other.ps1",
+            command_name="other",
+        )
+        assert parse_count == 2
+
+        clear_project_cache()
+        generate_ps1_wrapper(
+            parser,
+            script_path=script_path,
+            output_path=project_root / "other.ps1",
+            command_name="other",
+        )
+        assert parse_count == 3
+
+
+def test_cache_interpreter_mode():
+    """cache_interpreter runs the entry point with a cached interpreter."""
+    parser = argparse.ArgumentParser(description="Test script")
+    parser.add_argument("--count", type=int)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "pyproject.toml").write_text(
+            '[project]\nname = "p"\n\n[project.scripts]\nmy-tool = "pkg.cli:main"\n',
+            encoding="utf-8",
+        )
+        output_path = project_root / "My-Tool.ps1"
+
+        generate_ps1_wrapper(
+            parser,
+            script_path=project_root / "pkg" / "cli.py",
+            output_path=output_path,
+            command_name="my-tool",
+            cache_interpreter=True,
+        )
+
+        content = output_path.read_text(encoding="utf-8-sig")
+        assert '$InterpreterCache = Join-Path $ScriptDir ".My-Tool.interpreter.json"' in content
+        assert "Get-FileHash -LiteralPath $LockFile -Algorithm SHA256" in content
+        assert "from pkg.cli import main; sys.exit(main())" in content
+        assert "sys.argv[0] = ''my-tool''" in content
+        assert '$Arguments = @("run", "--project", $ProjectRoot, "my-tool")' in content
+        assert "& $Runner @Arguments" in content
+
+
+def test_cache_interpreter_requires_project_mode():
+    """cache_interpreter without command_name is rejected."""
+    parser = argparse.ArgumentParser(description="Test script")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test_script.ps1"
+        script_path = Path(__file__).parent / "test_script.py"
+
+        with pytest.raises(ValueError, match="cache_interpreter requires project mode"):
+            generate_ps1_wrapper(
+                parser,
+                script_path=script_path,
+                output_path=output_path,
+                cache_interpreter=True,
+            )
+
+
+def test_embed_help():
+    """embed_help prints format_help() output and adds comment-based help."""
+    parser = argparse.ArgumentParser(description="Greeting script")
+    parser.add_argument("--count", type=int, default=2, help="Repeat (default: %(default)s)")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test_script.ps1"
+        script_path = Path(__file__).parent / "test_script.py"
+
+        generate_ps1_wrapper(
+            parser, script_path=script_path, output_path=output_path, embed_help=True
+        )
+
+        content = output_path.read_text(encoding="utf-8-sig")
+        assert "Write-Output @'\n" + parser.format_help().rstrip("\n") + "\n'@" in content
+        assert "@HelpArgs" not in content
+        assert ".SYNOPSIS\n    Greeting script" in content
+        assert ".PARAMETER Count\n    Repeat (default: 2)" in content
+        assert content.index("<#") < content.index("param(")
+
+
+def test_embed_help_compressed():
+    """compress_help stores the help text as deterministic gzip + base64."""
+    parser = argparse.ArgumentParser(description="Greeting script")
+    parser.add_argument("--name", help="Name to greet")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test_script.ps1"
+        script_path = Path(__file__).parent / "test_script.py"
+
+        generate_ps1_wrapper(
+            parser,
+            script_path=script_path,
+            output_path=output_path,
+            embed_help=True,
+            compress_help=True,
+        )
+        first = output_path.read_bytes()
+
+        content = first.decode("utf-8-sig")
+        match = re.search(r"FromBase64String\('([^']+)'\)", content)
+        assert match is not None
+        decoded = gzip.decompress(base64.b64decode(match.group(1))).decode("utf-8")
+        assert decoded == parser.format_help().rstrip("\n")
+        assert "GZipStream" in content
+
+        output_path.unlink()
+        generate_ps1_wrapper(
+            parser,
+            script_path=script_path,
+            output_path=output_path,
+            embed_help=True,
+            compress_help=True,
+        )
+        assert output_path.read_bytes() == first
+
+
+def _render(parser, **options):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "test_script.ps1"
+        script_path = Path(__file__).parent / "test_script.py"
+        generate_ps1_wrapper(
+            parser, script_path=script_path, output_path=output_path, **options
+        )
+        return output_path.read_text(encoding="utf-8-sig")
+
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+
+def _make_golden_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="golden", description="Golden test tool")
+    parser.add_argument("source", type=Path, help="Input file")
+    parser.add_argument("target", nargs="?", default="out.txt", help="Output file")
+    parser.add_argument("-n", "--count", type=int, default=3, help="How many")
+    parser.add_argument("--rate", type=float, help="Rate")
+    parser.add_argument("--mode", choices=["fast", "slow"], default="fast")
+    parser.add_argument("--dry-run", action="store_true", help="Do nothing")
+    parser.add_argument("--no-color", dest="color", action="store_false")
+    group = parser.add_argument_group("output")
+    group.add_argument("--log-file", type=Path)
+    group.add_argument("--level", type=int, choices=range(1, 4))
+    exclusive = parser.add_mutually_exclusive_group()
+    exclusive.add_argument("-v", "--verbose", action="store_true")
+    exclusive.add_argument("-q", "--quiet", action="store_true")
+    return parser
+
+
+@pytest.mark.parametrize(
+    ("golden", "options"),
+    [("Golden.ps1", {}), ("Golden-Validated.ps1", {"validate_arguments": True})],
+)
+def test_render_matches_golden_output(golden, options):
+    """Rendering from parameter records matches the output from before they existed.
+
+    The golden files were generated by the per-argument renderer the
+    parameter records replaced; regenerate them only for intended changes.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        content = render_ps1_wrapper(
+            _make_golden_parser(),
+            script_path=Path(tmpdir) / "golden.py",
+            output_dir=Path(tmpdir),
+            **options,
+        )
+
+    assert content == (GOLDEN_DIR / golden).read_text(encoding="utf-8")
+
+
+def test_numeric_option_without_default_is_only_passed_when_bound():
+    """[int] parameters default to 0, so conversion checks $PSBoundParameters."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int)
+
+    content = _render(parser)
+
+    assert 'if ($PSBoundParameters.ContainsKey("Count")) { $Arguments += "--count", $Count }' in content
+
+
+def test_list_arguments_map_to_arrays():
+    """nargs/append/extend become typed arrays added in one statement each."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--include", nargs="*", type=Path)
+    parser.add_argument("--tag", action="append", default=["x"])
+    parser.add_argument("--size", nargs=2, type=int)
+    parser.add_argument("--label", action="extend", nargs="+")
+    parser.add_argument("--pair", action="append", nargs=2)
+
+    content = _render(parser)
+
+    assert "[string[]]$Files" in content
+    assert "[string[]]$Include" in content
+    assert "[string[]]$Tag = @('x')" in content
+    assert "[int[]]$Size" in content
+    # append with nargs collects lists of lists and stays a scalar
+    assert "[string]$Pair" in content
+    assert 'if ($PSBoundParameters.ContainsKey("Files")) { $Arguments += $Files }' in content
+    # One Resolve-Path call and one concatenation for the whole array
+    assert '$Arguments += @("--include") + (Resolve-Path $Include).Path' in content
+    assert '$Arguments += foreach ($Value in $Tag) { "--tag", $Value }' in content
+    assert '$Arguments += @("--size") + $Size' in content
+    assert '$Arguments += @("--label") + $Label' in content
+
+
+
+def test_pipeline_input_streams_to_one_process():
+    """Piped items go to the stdin of one Python process started in begin."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", nargs="*", type=Path)
+    parser.add_argument("--count", type=int, default=1)
+
+    content = _render(parser, pipeline_input="paths")
+
+    assert "[CmdletBinding()]" in content
+    assert "[Parameter(ValueFromPipeline)]\n    [string[]]$Paths" in content
+    begin = content.index("\nbegin {")
+    process = content.index("\nprocess {")
+    end = content.index("\nend {")
+    assert begin < process < end
+    # Arguments are built once, before any item arrives
+    assert content.index('"--count", $Count') < process
+    assert "}.GetSteppablePipeline($MyInvocation.CommandOrigin)" in content
+    assert "(Resolve-Path $Paths).Path" in content[process:end]
+    assert "$PipelineInput.Process($Item)" in content[process:end]
+    assert content.index('& "uv" @Arguments', end) > content.index(
+        "$PipelineInput.End()"
+    )
+
+
+@pytest.mark.parametrize(
+    ("dest", "problem"),
+    [
+        ("missing", "is not a parameter"),
+        ("name", "does not take a list"),
+        ("files", "is required on the command line"),
+    ],
+)
+def test_pipeline_input_must_accept_no_arguments(dest, problem):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--name")
+
+    with pytest.raises(ValueError, match=problem):
+        _render(parser, pipeline_input=dest)
+
+
+
+def test_parallel_input_fans_out_over_values():
+    """A list for the parallel positional runs one process per value."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", type=Path)
+    parser.add_argument("dest")
+
+    content = _render(parser, parallel_input="source")
+
+    assert "[string[]]$Source," in content
+    assert "[int]$ThrottleLimit = [Environment]::ProcessorCount" in content
+    # The index is taken before the value(s) are added, in positional order
+    assert (
+        "$ParallelIndex = $Arguments.Count\n"
+        'if ($PSBoundParameters.ContainsKey("Source")) { $Arguments += $Source }\n'
+        "$Arguments += $Dest"
+    ) in content
+    assert content.count("function Invoke-ArgparsePs1Parallel {") == 1
+    fan_out = content.index("if (@($Source).Count -gt 1) {")
+    assert (
+        'Invoke-ArgparsePs1Parallel "uv" $Arguments $ParallelIndex @($Source).Count '
+        "$ThrottleLimit"
+    ) in content
+    assert fan_out < content.index('& "uv" @Arguments')
+
+
+@pytest.mark.parametrize(
+    ("dest", "problem"),
+    [
+        ("missing", "is not a parameter"),
+        ("names", "is not a positional argument taking one value"),
+        ("verbose", "is not a positional argument taking one value"),
+        ("dest", "another argument maps to -ThrottleLimit"),
+    ],
+)
+def test_parallel_input_must_be_single_positional(dest, problem):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dest")
+    parser.add_argument("names", nargs="*")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--throttle-limit", type=int)
+
+    with pytest.raises(ValueError, match=problem):
+        _render(parser, parallel_input=dest)
+
+
+
+def test_as_object_converts_json_lines_as_they_arrive():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name")
+
+    content = _render(parser, as_object=True, worker=True)
+
+    assert "[switch]$AsObject" in content
+    as_object = content.index("if ($AsObject) {")
+    assert '$env:ARGPARSE_PS1_OUTPUT = "json"' in content
+    # Converted per line in the pipeline, not after collecting the output
+    assert '& "uv" @Arguments | ForEach-Object {\n' in content
+    # Only lines emit() marked are converted: "[INFO] starting" or
+    # "{placeholder}" from print() stay text, as do marked lines that fail
+    assert "if (-not $_ -or $_[0] -ne [char]0x1E) { return $_ }" in content
+    assert (
+        "try { ConvertFrom-Json -InputObject $Record -ErrorAction Stop } "
+        "catch { $Record }"
+    ) in content
+    assert "-match" not in content
+    assert "$env:ARGPARSE_PS1_OUTPUT = $PreviousOutputEnv" in content
+    # The worker does not see the environment variable, so it is bypassed
+    assert as_object < content.index("Invoke-ArgparsePs1Worker $WorkerState")
+
+    parser.add_argument("--as-object", action="store_true")
+    with pytest.raises(ValueError, match="-AsObject"):
+        _render(parser, as_object=True)
+
+
+
+def test_trace_timing_reports_every_exit():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name")
+
+    content = _render(parser, trace_timing=True, as_object=True)
+
+    assert "[switch]$TraceTiming" in content
+    start = content.index("$TraceStart = [DateTime]::UtcNow")
+    launch = content.index("$TraceLaunch = [DateTime]::UtcNow")
+    assert start < content.index("# Set script path")
+    assert content.index('"--name", $Name') < launch
+    assert "$env:ARGPARSE_PS1_TRACE = $TraceFile" in content
+    # -AsObject and the plain launch both exit inside the try block
+    body = content[content.index("\ntry {") : content.index("\n} finally {")]
+    assert "if ($AsObject) {" in body
+    assert '    & "uv" @Arguments\n    exit $LASTEXITCODE' in body
+    assert (
+        "if ($TraceTiming) { Write-ArgparsePs1Timing $TraceStart $TraceLaunch "
+        "$TraceFile $MyInvocation.MyCommand.Name }"
+    ) in content
+    # Process startup is only reported for a process started to run the wrapper
+    timing = content[content.index("function Write-ArgparsePs1Timing") :]
+    assert "$Previous = $Start\n" in timing
+    assert "[Environment]::GetCommandLineArgs()" in timing
+
+    parser.add_argument("--trace-timing", action="store_true")
+    with pytest.raises(ValueError, match="trace_timing"):
+        _render(parser, trace_timing=True)
+
+
+def test_validate_arguments_required_and_groups():
+    """Required arguments become Mandatory; exclusive groups become parameter sets."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source")
+    parser.add_argument("--name", required=True)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--json", action="store_true")
+    group.add_argument("--csv", action="store_true")
+
+    content = _render(parser, validate_arguments=True)
+
+    assert '[CmdletBinding(DefaultParameterSetName = "Run")]' in content
+    assert '[Parameter(ParameterSetName = "Help")]\n    [switch]$Help' in content
+    assert (
+        '[Parameter(Mandatory, ParameterSetName = "Json")]\n'
+        '    [Parameter(Mandatory, ParameterSetName = "Csv")]\n'
+        '    [Parameter(Mandatory, ParameterSetName = "Run")]\n'
+        "    [string]$Name"
+    ) in content
+    assert '[Parameter(ParameterSetName = "Json")]\n    [switch]$Json' in content
+    assert '[Parameter(ParameterSetName = "Csv")]\n    [switch]$Csv' in content
+    # Advanced scripts reject unknown parameters during binding
+    assert "$args.Count" not in content
+
+
+def test_validate_arguments_ranges_and_files():
+    """Integer range choices and readable FileType arguments are validated."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--level", type=int, choices=range(1, 11))
+    parser.add_argument("--input", type=argparse.FileType("r"))
+
+    content = _render(parser, validate_arguments=True)
+
+    # Listed for tab completion, since ValidateSet no longer provides it
+    assert "[ValidateRange(1, 10)]\n    [ArgumentCompleter({" in content
+    assert "ValidateSet" not in content
+    assert "Test-Path -LiteralPath $_ -PathType Leaf" in content
+    # No [Parameter()] attributes needed, so the script stays a simple script
+    assert "CmdletBinding" not in content
+
+
+def test_validate_arguments_nargs_counts():
+    """nargs=N and nargs='+' arrays check how many values they get."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--point", type=float, nargs=2)
+    parser.add_argument("--tags", nargs="+")
+    parser.add_argument("--extra", nargs="*")
+
+    content = _render(parser, validate_arguments=True)
+
+    assert "[ValidateCount(2, 2)]\n    [double[]]$Point" in content
+    assert "[ValidateCount(1, [int]::MaxValue)]\n    [string[]]$Tags" in content
+    assert content.count("ValidateCount") == 2
+    assert "ValidateCount" not in _render(parser)
+
+
+def test_validate_arguments_verbose_uses_common_parameter():
+    """A --verbose switch is bound through the -Verbose common parameter."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", required=True)
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+    content = _render(parser, validate_arguments=True)
+
+    assert "[switch]$Verbose" not in content
+    assert 'if ($PSBoundParameters["Verbose"]) { $Arguments += "--verbose" }' in content
+
+
+def test_validate_arguments_rejects_common_parameter_clash():
+    """Non-switch arguments named like common parameters are rejected."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--debug", type=int)
+
+    with pytest.raises(ValueError, match="common parameter"):
+        _render(parser, validate_arguments=True)
+
+
+def test_param_block_without_arguments():
+    """A parser without arguments renders a valid param() block."""
+    parser = argparse.ArgumentParser()
+
+    content = _render(parser)
+
+    assert "param(\n    [switch]$Help\n)" in content
+
+
+def _make_subcommand_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tool")
+    parser.add_argument("--config")
+    parser.add_argument("--verbose", action="store_true")
+    subparsers = parser.add_subparsers(dest="command")
+    train = subparsers.add_parser("train", aliases=["t"])
+    train.add_argument("data")
+    train.add_argument("--epochs", type=int, default=3)
+    train.add_argument("--mode", choices=["a", "b"], required=True)
+    evaluate = subparsers.add_parser("eval")
+    evaluate.add_argument("--out", type=Path)
+    return parser
+
+
+def test_subcommands_render_dynamic_parameters():
+    """Subcommand arguments are declared per subcommand through DynamicParam."""
+    content = _render(_make_subcommand_parser())
+
+    assert "[CmdletBinding(PositionalBinding = $false)]" in content
+    assert (
+        '[Parameter(Position = 0)]\n'
+        '    [ValidateSet("train", "t", "eval", IgnoreCase = $false)]\n'
+        "    [string]$Command"
+    ) in content
+    assert "[switch]$Verbose" not in content
+    assert 'switch -CaseSensitive ($PSBoundParameters["Command"]) {' in content
+    assert '{ $_ -cin "train", "t" } {' in content
+    assert (
+        'Add-DynamicParameter "Data" ([string]) -SetName "train" -Position 1\n'
+    ) in content
+    assert (
+        'Add-DynamicParameter "Mode" ([string]) -SetName "train" '
+        "-ValidValues 'a', 'b'\n"
+    ) in content
+    assert 'Add-DynamicParameter "Out" ([string]) -SetName "eval"' in content
+    # Statements move into an end block, and there is no $args check
+    assert "\nend {\n    # Set script path" in content
+    assert "$args" not in content
+    assert "$Arguments += $Command" in content
+    assert (
+        'if ($PSBoundParameters.ContainsKey("Epochs")) '
+        '{ $Arguments += "--epochs", $PSBoundParameters["Epochs"] }'
+    ) in content
+    assert '(Resolve-Path $PSBoundParameters["Out"]).Path' in content
+    assert "if ($Command) { $HelpArgs += $Command }" in content
+
+
+def test_subcommands_are_case_sensitive():
+    """Mixed-case subcommands are matched exactly, as argparse does."""
+    parser = argparse.ArgumentParser(prog="tool")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("Build").add_argument("--target")
+    subparsers.add_parser("build-all")
+
+    content = _render(parser)
+
+    assert '[ValidateSet("Build", "build-all", IgnoreCase = $false)]' in content
+    assert 'switch -CaseSensitive ($PSBoundParameters["Command"]) {' in content
+    assert '        "Build" {\n' in content
+
+
+def test_subcommands_with_validation():
+    """Validation makes subcommand arguments mandatory and keeps sets shared."""
+    content = _render(_make_subcommand_parser(), validate_arguments=True)
+
+    assert (
+        'Add-DynamicParameter "Data" ([string]) -SetName "train" -Position 1 -Mandatory'
+    ) in content
+
+    parser = _make_subcommand_parser()
+    parser.add_argument("--name", required=True)
+    content = _render(parser, validate_arguments=True)
+
+    assert (
+        '[CmdletBinding(DefaultParameterSetName = "Run", PositionalBinding = $false)]'
+    ) in content
+    assert "-SetName" not in content
+
+
+def test_subcommand_argument_clash_is_rejected():
+    """Subcommand arguments may not reuse a top-level parameter name."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config")
+    subparsers = parser.add_subparsers()
+    subparsers.add_parser("run").add_argument("--config")
+
+    with pytest.raises(ValueError, match="-Config"):
+        _render(parser)
+
+
+def test_completion_hints():
+    """Declared hints become literal completion tables; paths complete by glob."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--region")
+    parser.add_argument("--data", type=Path)
+    parser.add_argument("--fast", action="store_true")
+
+    content = _render(
+        parser,
+        completion_hints={"region": ["eu-west", "us east"], "data": ["*.csv"]},
+    )
+
+    assert "[ArgumentCompleter({" in content
+    assert "@('eu-west', 'us east') |" in content
+    assert "$Patterns = @('*.csv')" in content
+    assert content.index("$Patterns") < content.index("[string]$Data")
+    assert "uv run" not in content.split("[switch]$Fast")[0].split("param(")[1]
+
+    with pytest.raises(ValueError, match="unknown argument"):
+        _render(parser, completion_hints={"regoin": ["x"]})
+
+
+def test_range_choices_complete_under_validation():
+    """ValidateRange choices keep tab completion through a completion table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--level", type=int, choices=range(1, 4))
+    parser.add_argument("--port", type=int, choices=range(1, 65536))
+
+    content = _render(parser, validate_arguments=True)
+
+    assert "[ValidateRange(1, 3)]\n    [ArgumentCompleter({" in content
+    assert "@('1', '2', '3') |" in content
+    assert "[ValidateRange(1, 65535)]\n    [int]$Port" in content
+
+
+def list_datasets(prefix: str) -> list[str]:
+    return [name for name in ("train", "test") if name.startswith(prefix)]
+
+
+def test_dynamic_completion_callable():
+    """Completion callables run through Python, behind an on-disk cache."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset").completer = list_datasets  # type: ignore
+    parser.add_argument("--env")
+
+    content = _render(parser, completion_ttl=60, completion_cache_size=10)
+
+    assert f"'{__name__}:list_datasets'" in content
+    assert "-m argparse_ps1.complete" in content
+    assert "--ttl 60 --max-entries 10" in content
+    assert ".TotalSeconds -lt 60)" in content
+    # Keyed on the callable too, and recomputed when its source changes
+    assert f"$Spec = '{__name__}:list_datasets'" in content
+    assert '+ "`0" + $Spec + "`0" + $Word)' in content
+    assert "$Source.LastWriteTimeUtc -ge $Cached.LastWriteTimeUtc" in content
+    assert content.count("[ArgumentCompleter({") == 1
+
+    hinted = _render(parser, completion_hints={"env": list_datasets})
+    assert "--parameter 'Env'" in hinted
+
+    with pytest.raises(ValueError, match="cannot be imported"):
+        _render(parser, completion_hints={"env": lambda _prefix: ["dev"]})
+
+
+def test_dynamic_completion_imports_modules_not_scripts():
+    """Completers defined in the script are rejected instead of running it."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset").completer = list_datasets  # type: ignore
+
+    content = _render(parser)
+    assert '"--prefix=$Word" --path (Split-Path -Parent $ScriptPath)' in content
+
+    def in_script(_prefix):
+        return ["dev"]
+
+    in_script.__module__ = "__main__"
+    in_script.__qualname__ = "in_script"
+    with pytest.raises(ValueError, match="defined in __main__"):
+        _render(parser, completion_hints={"dataset": in_script})
+
+
+def test_dynamic_completion_runs_in_the_script_environment():
+    """With uv, completers start Python the way `uv run <script>` does."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset").completer = list_datasets  # type: ignore
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script_path = Path(tmpdir) / "tool.py"
+        output_path = Path(tmpdir) / "Tool.ps1"
+        script_path.write_text(
+            '# /// script\n# dependencies = ["argparse-ps1"]\n# ///\n',
+            encoding="utf-8",
+        )
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        inline = output_path.read_text(encoding="utf-8-sig")
+
+        script_path.write_text("import argparse\n", encoding="utf-8")
+        generate_ps1_wrapper(parser, script_path=script_path, output_path=output_path)
+        plain = output_path.read_text(encoding="utf-8-sig")
+
+    assert (
+        '& "uv" run --with-requirements $ScriptPath python -m argparse_ps1.complete'
+        in inline
+    )
+    assert '& "uv" run python -m argparse_ps1.complete' in plain
+    assert "--with argparse-ps1" not in inline + plain
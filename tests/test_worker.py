@@ -0,0 +1,127 @@
+"""Tests for the persistent worker and its client."""
+
+import argparse
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import argparse_ps1.argparse_ps1 as core
+from argparse_ps1 import worker
+
+SCRIPT = """
+import argparse
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("name")
+parser.add_argument("--fail", type=int, default=0)
+args = parser.parse_args()
+print(f"Hello, {args.name}!")
+print("warning", file=sys.stderr)
+sys.exit(args.fail)
+"""
+
+
+def _start_worker(script_path: Path, state_file: Path) -> subprocess.Popen[bytes]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(core.__file__).resolve().parent.parent), env.get("PYTHONPATH", "")]
+    )
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "argparse_ps1.worker",
+            str(script_path),
+            "--state-file",
+            str(state_file),
+            "--idle-timeout",
+            "60",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while not state_file.exists():
+        assert process.poll() is None, "worker exited during startup"
+        assert time.monotonic() < deadline, "worker did not start"
+        time.sleep(0.05)
+    return process
+
+
+def test_worker_runs_commands_in_a_warm_process():
+    """Output and exit codes of several calls come back through the client."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        script_path = root / "hello.py"
+        script_path.write_text(textwrap.dedent(SCRIPT), encoding="utf-8")
+        state_file = root / ".Hello.worker.json"
+        process = _start_worker(script_path, state_file)
+        try:
+            for name in ("World", "Again"):
+                stdout, stderr = io.StringIO(), io.StringIO()
+                exit_code = worker.call(
+                    state_file, [name], stdout=stdout, stderr=stderr, timeout=30
+                )
+                assert exit_code == 0
+                assert stdout.getvalue() == f"Hello, {name}!\n"
+                assert stderr.getvalue() == "warning\n"
+
+            stdout, stderr = io.StringIO(), io.StringIO()
+            exit_code = worker.call(
+                state_file, ["X", "--fail", "3"], stdout=stdout, stderr=stderr
+            )
+            assert exit_code == 3
+
+            # argparse errors are reported like a normal run
+            stdout, stderr = io.StringIO(), io.StringIO()
+            exit_code = worker.call(state_file, [], stdout=stdout, stderr=stderr)
+            assert exit_code == 2
+            assert "required: name" in stderr.getvalue()
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def test_client_reports_missing_or_stale_worker():
+    """Without a listening worker the client returns None and nothing runs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        state_file = Path(tmpdir) / ".Tool.worker.json"
+        assert worker.call(state_file, ["x"]) is None
+
+        # A state file left behind by a worker that is gone
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        state_file.write_text(f'{{"port": {port}, "token": "x"}}', encoding="utf-8")
+        assert worker.call(state_file, ["x"]) is None
+
+
+def test_worker_mode_wrapper():
+    """Worker mode sends the converted arguments and falls back to a cold start."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int)
+
+    content = core._render_wrapper(
+        parser,
+        script_path=Path.cwd() / "tool.py",
+        output_path=Path.cwd() / "Tool.ps1",
+        skip_dests=None,
+        runner="uv",
+        command_name=None,
+        project_root=None,
+        worker=True,
+    )
+
+    assert "function Invoke-ArgparsePs1Worker {" in content
+    assert "$ArgumentOffset = $Arguments.Count\nif (" in content
+    assert '$WorkerState = Join-Path $ScriptDir ".Tool.worker.json"' in content
+    assert "@($Arguments | Select-Object -Skip $ArgumentOffset)" in content
+    assert content.index("if ($WorkerHandled) { exit $LASTEXITCODE }") < content.index(
+        '& "uv" @Arguments'
+    )